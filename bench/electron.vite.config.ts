@@ -0,0 +1,23 @@
+import { resolve } from "node:path"
+import { defineConfig, externalizeDepsPlugin } from "electron-vite"
+
+// Builds the bench harness like the main process, with the same aliases
+export default defineConfig({
+	main: {
+		plugins: [externalizeDepsPlugin()],
+		build: {
+			outDir: "out/bench",
+			minify: false,
+			rollupOptions: {
+				input: { index: resolve("bench/index.ts") },
+			},
+		},
+		resolve: {
+			alias: {
+				"@main": resolve("src/main"),
+				"@shared": resolve("src/shared"),
+				"@resources": resolve("resources"),
+			},
+		},
+	},
+})
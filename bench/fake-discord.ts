@@ -0,0 +1,205 @@
+import { mkdtempSync, rmSync } from "node:fs"
+import { type Server, type Socket, createServer } from "node:net"
+import { tmpdir } from "node:os"
+import { join } from "node:path"
+
+/** IPC opcodes, each message is the opcode and payload length as int32 LE, then JSON */
+const OP_HANDSHAKE = 0
+const OP_FRAME = 1
+const OP_CLOSE = 2
+const OP_PING = 3
+const OP_PONG = 4
+
+const BENCH_USER = {
+	id: "100000000000000001",
+	username: "bench",
+	discriminator: "0",
+	global_name: "Bench",
+	avatar: null,
+	bot: false,
+	flags: 0,
+	premium_type: 0,
+}
+
+/**
+ * Traffic seen by the fake Discord
+ */
+export interface FakeDiscordStats {
+	connections: number
+	commands: number
+	setActivity: number
+	clearActivity: number
+	bytesReceived: number
+}
+
+/**
+ * Stand-in for the Discord client's RPC socket
+ *
+ * Speaks enough of the IPC protocol for the RPC library: answers the
+ * handshake with a READY dispatch and acknowledges every command with its
+ * nonce, after an optional delay to mimic Discord. On Linux and macOS the
+ * socket lives in a private directory the library is pointed at through
+ * `XDG_RUNTIME_DIR`. Named pipes on Windows are global, so Discord has to be
+ * closed while the bench runs.
+ */
+export class FakeDiscordIpc {
+	private server: Server
+	private directory: string | null = null
+	private sockets: Set<Socket> = new Set()
+	private stats: FakeDiscordStats = {
+		connections: 0,
+		commands: 0,
+		setActivity: 0,
+		clearActivity: 0,
+		bytesReceived: 0,
+	}
+
+	/**
+	 * @param latencyMs - Delay before each command is acknowledged
+	 */
+	constructor(private readonly latencyMs: number) {
+		this.server = createServer((socket) => this.handleConnection(socket))
+	}
+
+	/**
+	 * Start listening where the RPC library looks for Discord first
+	 */
+	public listen(): Promise<void> {
+		let path: string
+		if (process.platform === "win32") {
+			path = "\\\\?\\pipe\\discord-ipc-0"
+		} else {
+			this.directory = mkdtempSync(join(tmpdir(), "vlc-rpc-bench-ipc-"))
+			process.env.XDG_RUNTIME_DIR = this.directory
+			path = join(this.directory, "discord-ipc-0")
+		}
+
+		return new Promise((resolve, reject) => {
+			this.server.once("error", (error: NodeJS.ErrnoException) => {
+				reject(
+					error.code === "EADDRINUSE"
+						? new Error("Discord is running, close it so the bench can take its IPC pipe")
+						: error,
+				)
+			})
+			this.server.listen(path, () => resolve())
+		})
+	}
+
+	public getStats(): FakeDiscordStats {
+		return { ...this.stats }
+	}
+
+	public close(): Promise<void> {
+		return new Promise((resolve) => {
+			for (const socket of this.sockets) {
+				socket.destroy()
+			}
+			this.server.close(() => {
+				if (this.directory) {
+					rmSync(this.directory, { recursive: true, force: true })
+				}
+				resolve()
+			})
+		})
+	}
+
+	private handleConnection(socket: Socket): void {
+		this.stats.connections++
+		this.sockets.add(socket)
+		let buffered = Buffer.alloc(0)
+
+		socket.on("data", (data: Buffer) => {
+			this.stats.bytesReceived += data.length
+			buffered = buffered.length > 0 ? Buffer.concat([buffered, data]) : data
+
+			while (buffered.length >= 8) {
+				const op = buffered.readInt32LE(0)
+				const length = buffered.readInt32LE(4)
+				if (buffered.length < 8 + length) {
+					break
+				}
+				const payload = buffered.subarray(8, 8 + length).toString("utf-8")
+				buffered = buffered.subarray(8 + length)
+				this.handleMessage(socket, op, payload)
+			}
+		})
+
+		socket.on("close", () => this.sockets.delete(socket))
+		socket.on("error", () => this.sockets.delete(socket))
+	}
+
+	private handleMessage(socket: Socket, op: number, payload: string): void {
+		if (op === OP_PING) {
+			this.send(socket, OP_PONG, payload)
+			return
+		}
+
+		if (op === OP_CLOSE) {
+			socket.end()
+			return
+		}
+
+		const message = JSON.parse(payload)
+
+		if (op === OP_HANDSHAKE) {
+			this.send(
+				socket,
+				OP_FRAME,
+				JSON.stringify({
+					cmd: "DISPATCH",
+					evt: "READY",
+					nonce: null,
+					data: {
+						v: 1,
+						config: {
+							cdn_host: "cdn.discordapp.com",
+							api_endpoint: "//discord.com/api",
+							environment: "production",
+						},
+						user: BENCH_USER,
+					},
+				}),
+			)
+			return
+		}
+
+		if (op !== OP_FRAME) {
+			return
+		}
+
+		this.stats.commands++
+		if (message.cmd === "SET_ACTIVITY") {
+			if (message.args?.activity) {
+				this.stats.setActivity++
+			} else {
+				this.stats.clearActivity++
+			}
+		}
+
+		const reply = JSON.stringify({
+			cmd: message.cmd,
+			evt: null,
+			nonce: message.nonce,
+			data: message.args?.activity ?? null,
+		})
+
+		if (this.latencyMs > 0) {
+			setTimeout(() => this.send(socket, OP_FRAME, reply), this.latencyMs)
+		} else {
+			this.send(socket, OP_FRAME, reply)
+		}
+	}
+
+	private send(socket: Socket, op: number, payload: string): void {
+		if (socket.destroyed) {
+			return
+		}
+
+		const body = Buffer.from(payload, "utf-8")
+		const header = Buffer.alloc(8)
+		header.writeInt32LE(op, 0)
+		header.writeInt32LE(body.length, 4)
+		socket.write(Buffer.concat([header, body]))
+	}
+}
@@ -0,0 +1,90 @@
+/** Size of the chunks the results page is streamed in */
+const CHUNK_SIZE = 16 * 1024
+
+/**
+ * Searches answered by the fake Google
+ */
+export interface FakeGoogleStats {
+	searches: number
+	bytesServed: number
+}
+
+/**
+ * Build a results page shaped like Google Images: a lot of markup and
+ * scripts before the data script with result URLs, and the thumbnails after
+ */
+function buildResultsPage(query: string): string {
+	const slug = query.toLowerCase().replace(/[^a-z0-9]+/g, "-")
+	const result = (index: number) =>
+		`<div class="islrc" data-ri="${index}"><a href="/imgres?i=${index}">${slug}</a></div>`
+	const results = (count: number) =>
+		Array.from({ length: count }, (_, index) => result(index)).join("")
+	const chrome = `<script>(function(){var w="${"x".repeat(4000)}";window.google=w})()</script>`
+	const data = `[null,[["https://images.example.com/posters/${slug}.jpg",1000,1500]]]`
+
+	return [
+		"<!doctype html><html><head><title>Google Images</title>",
+		chrome.repeat(20),
+		'</head><body><img src="https://www.google.com/images/branding/logo.png">',
+		results(1500),
+		`<script nonce="bench">AF_initDataCallback({key: 'ds:1', data:${data}});</script>`,
+		results(300),
+		`<img class="rg_i" src="https://encrypted-tbn0.gstatic.com/images?q=tbn:${slug}&amp;s=10">`,
+		results(2000),
+		"</body></html>",
+	].join("")
+}
+
+/**
+ * Answer Google Images searches in process
+ *
+ * Replaces `fetch` so web artwork lookups get a canned results page,
+ * streamed in chunks, instead of going out to the network. Everything else
+ * is passed through.
+ *
+ * @returns Stats and a function putting the real `fetch` back
+ */
+export function installFakeGoogle(): { stats: FakeGoogleStats; restore: () => void } {
+	const realFetch = globalThis.fetch
+	const pages = new Map<string, Uint8Array>()
+	const stats: FakeGoogleStats = { searches: 0, bytesServed: 0 }
+
+	globalThis.fetch = async (input, init) => {
+		const url = new URL(input instanceof Request ? input.url : String(input))
+		if (url.hostname !== "www.google.com" || url.pathname !== "/search") {
+			return realFetch(input, init)
+		}
+
+		stats.searches++
+		const query = url.searchParams.get("q") ?? ""
+		let page = pages.get(query)
+		if (!page) {
+			page = new TextEncoder().encode(buildResultsPage(query))
+			pages.set(query, page)
+		}
+
+		const body = page
+		let offset = 0
+		const stream = new ReadableStream<Uint8Array>({
+			pull(controller) {
+				if (init?.signal?.aborted || offset >= body.length) {
+					controller.close()
+					return
+				}
+				const chunk = body.subarray(offset, offset + CHUNK_SIZE)
+				offset += chunk.length
+				stats.bytesServed += chunk.length
+				controller.enqueue(chunk)
+			},
+		})
+
+		return new Response(stream, { status: 200, headers: { "Content-Type": "text/html" } })
+	}
+
+	return {
+		stats,
+		restore: () => {
+			globalThis.fetch = realFetch
+		},
+	}
+}
@@ -0,0 +1,172 @@
+import { type IncomingMessage, type Server, type ServerResponse, createServer } from "node:http"
+import type { AddressInfo } from "node:net"
+
+/** Image hosts the uploader knows, and the endpoint each one posts to */
+const HOST_ENDPOINTS: Record<string, string> = {
+	"x0.at": "https://x0.at/",
+	"catbox.moe": "https://catbox.moe/user/api.php",
+	"uguu.se": "https://uguu.se/upload",
+	"0x0.st": "https://0x0.st",
+	"tmpfiles.org": "https://tmpfiles.org/api/v1/upload",
+}
+
+/** Names of the hosts the fake plays */
+export const UPLOAD_HOSTS = Object.keys(HOST_ENDPOINTS)
+
+/**
+ * How a fake host answers an upload
+ *
+ * `ok` answers with a URL after `delayMs`, `fail` answers HTTP 500 after
+ * `delayMs`.
+ */
+export interface UploadHostBehavior {
+	mode: "ok" | "fail"
+	delayMs: number
+}
+
+/**
+ * Uploads seen by one fake host
+ */
+export interface FakeUploadHostStats {
+	requests: number
+	succeeded: number
+	failed: number
+	/** Requests the client gave up on before the answer was sent */
+	aborted: number
+}
+
+/**
+ * Stand-in for the image hosts the uploader races
+ *
+ * One local HTTP server plays every host, each with its own behavior that
+ * can be changed between uploads. `fetch` is replaced so requests to the
+ * real upload endpoints are sent here instead, which keeps aborts real: a
+ * cancelled upload closes its connection and shows up as `aborted`.
+ */
+export class FakeUploadHosts {
+	private server: Server
+	private port = 0
+	private behaviors: Map<string, UploadHostBehavior> = new Map()
+	private stats: Map<string, FakeUploadHostStats> = new Map()
+	private realFetch: typeof fetch | null = null
+	private uploads = 0
+
+	constructor() {
+		this.server = createServer((req, res) => this.handle(req, res))
+		for (const host of UPLOAD_HOSTS) {
+			this.behaviors.set(host, { mode: "ok", delayMs: 0 })
+			this.stats.set(host, { requests: 0, succeeded: 0, failed: 0, aborted: 0 })
+		}
+	}
+
+	/**
+	 * Start listening and route the upload endpoints here
+	 */
+	public listen(): Promise<void> {
+		return new Promise((resolve, reject) => {
+			this.server.once("error", reject)
+			this.server.listen(0, "127.0.0.1", () => {
+				this.port = (this.server.address() as AddressInfo).port
+				this.install()
+				resolve()
+			})
+		})
+	}
+
+	public setBehavior(host: string, behavior: UploadHostBehavior): void {
+		this.behaviors.set(host, behavior)
+	}
+
+	/**
+	 * Give every host the same behavior
+	 */
+	public setAll(behavior: UploadHostBehavior): void {
+		for (const host of UPLOAD_HOSTS) {
+			this.setBehavior(host, behavior)
+		}
+	}
+
+	public getStats(host: string): FakeUploadHostStats {
+		return { ...(this.stats.get(host) as FakeUploadHostStats) }
+	}
+
+	public close(): Promise<void> {
+		if (this.realFetch) {
+			globalThis.fetch = this.realFetch
+			this.realFetch = null
+		}
+		return new Promise((resolve) => {
+			this.server.closeAllConnections()
+			this.server.close(() => resolve())
+		})
+	}
+
+	private install(): void {
+		const realFetch = globalThis.fetch
+		const routes = new Map(
+			Object.entries(HOST_ENDPOINTS).map(([host, endpoint]) => [endpoint, host]),
+		)
+		this.realFetch = realFetch
+
+		globalThis.fetch = (input, init) => {
+			const url = input instanceof Request ? input.url : String(input)
+			const host = routes.get(url)
+			if (!host) {
+				return realFetch(input, init)
+			}
+			return realFetch(`http://127.0.0.1:${this.port}/${host}`, init)
+		}
+	}
+
+	private handle(req: IncomingMessage, res: ServerResponse): void {
+		const host = decodeURIComponent((req.url ?? "/").slice(1))
+		const behavior = this.behaviors.get(host)
+		const stats = this.stats.get(host)
+		if (!behavior || !stats) {
+			res.writeHead(404)
+			res.end()
+			return
+		}
+
+		stats.requests++
+		let answered = false
+
+		res.on("close", () => {
+			if (!answered) {
+				stats.aborted++
+			}
+		})
+
+		// Read the whole form before answering, like a real host
+		req.resume()
+		req.on("end", () => {
+			const timer = setTimeout(() => {
+				answered = true
+				if (behavior.mode === "fail") {
+					stats.failed++
+					res.writeHead(500)
+					res.end()
+					return
+				}
+				stats.succeeded++
+				res.writeHead(200)
+				res.end(this.answer(host, `https://${host}/bench/${++this.uploads}.jpg`))
+			}, behavior.delayMs)
+			res.on("close", () => clearTimeout(timer))
+		})
+	}
+
+	/**
+	 * Success body in the shape each host's parser expects
+	 */
+	private answer(host: string, url: string): string {
+		switch (host) {
+			case "uguu.se":
+				return JSON.stringify({ success: true, files: [{ url }] })
+			case "tmpfiles.org":
+				return JSON.stringify({ status: "success", data: { url: url.replace("https", "http") } })
+			default:
+				return url
+		}
+	}
+}
@@ -0,0 +1,104 @@
+import { type IncomingMessage, type Server, type ServerResponse, createServer } from "node:http"
+import type { AddressInfo } from "node:net"
+import type { Session, SessionFrame } from "./sessions"
+
+/**
+ * Requests served by the fake VLC
+ */
+export interface FakeVlcStats {
+	statusRequests: number
+	playlistRequests: number
+	unauthorized: number
+	bytesSent: number
+}
+
+/**
+ * Stand-in for VLC's HTTP interface
+ *
+ * Serves `/requests/status.json` and `/requests/playlist.json` from the
+ * frame the harness sets before each poll. Bodies are serialized when the
+ * frame is set, so the time spent answering is only the socket write.
+ */
+export class FakeVlcServer {
+	private server: Server
+	private authorization: string
+	private status = JSON.stringify({ state: "stopped" })
+	private playlist = JSON.stringify({ ro: "ro", type: "node", name: "", id: "0", children: [] })
+	private stats: FakeVlcStats = {
+		statusRequests: 0,
+		playlistRequests: 0,
+		unauthorized: 0,
+		bytesSent: 0,
+	}
+
+	constructor(password: string) {
+		this.authorization = `Basic ${Buffer.from(`:${password}`).toString("base64")}`
+		this.server = createServer((req, res) => this.handle(req, res))
+	}
+
+	/**
+	 * Start listening on a free port
+	 * @returns The port
+	 */
+	public listen(): Promise<number> {
+		return new Promise((resolve, reject) => {
+			this.server.once("error", reject)
+			// No host, so both `localhost` resolutions (::1 and 127.0.0.1) reach it
+			this.server.listen(0, () => resolve((this.server.address() as AddressInfo).port))
+		})
+	}
+
+	/**
+	 * Serve a session's playlist, the frames are set one by one
+	 */
+	public load(session: Session): void {
+		this.playlist = JSON.stringify(session.playlist)
+	}
+
+	public setFrame(frame: SessionFrame): void {
+		this.status = JSON.stringify(frame.status)
+		if (frame.playlist) {
+			this.playlist = JSON.stringify(frame.playlist)
+		}
+	}
+
+	public getStats(): FakeVlcStats {
+		return { ...this.stats }
+	}
+
+	public close(): Promise<void> {
+		return new Promise((resolve) => {
+			this.server.closeAllConnections()
+			this.server.close(() => resolve())
+		})
+	}
+
+	private handle(req: IncomingMessage, res: ServerResponse): void {
+		if (req.headers.authorization !== this.authorization) {
+			this.stats.unauthorized++
+			res.writeHead(401, { "WWW-Authenticate": 'Basic realm="VLC stream"' })
+			res.end()
+			return
+		}
+
+		let body: string
+		if (req.url === "/requests/status.json") {
+			this.stats.statusRequests++
+			body = this.status
+		} else if (req.url === "/requests/playlist.json") {
+			this.stats.playlistRequests++
+			body = this.playlist
+		} else {
+			res.writeHead(404)
+			res.end()
+			return
+		}
+
+		this.stats.bytesSent += Buffer.byteLength(body)
+		res.writeHead(200, {
+			"Content-Type": "application/json",
+			"Content-Length": Buffer.byteLength(body),
+		})
+		res.end(body)
+	}
+}
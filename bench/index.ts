@@ -0,0 +1,412 @@
+import { mkdtempSync, rmSync, writeFileSync } from "node:fs"
+import { cpus, tmpdir } from "node:os"
+import { basename, extname, join } from "node:path"
+import { performance } from "node:perf_hooks"
+import type { VlcConfig } from "@shared/types"
+import { app } from "electron"
+import { FakeDiscordIpc } from "./fake-discord"
+import { installFakeGoogle } from "./fake-google"
+import { FakeUploadHosts } from "./fake-upload-hosts"
+import { FakeVlcServer } from "./fake-vlc"
+import { MemoryProbe, StageRecorder } from "./measure"
+import {
+	type BenchResult,
+	type ScenarioResult,
+	defaultResultPath,
+	formatComparison,
+	formatResult,
+	getRevision,
+	loadResult,
+	saveResult,
+} from "./report"
+import {
+	type Session,
+	builtInSessions,
+	loadSession,
+	recordSession,
+	trackChangesSession,
+} from "./sessions"
+import { formatUploadChecks, runUploadChecks } from "./uploads"
+
+const VLC_PASSWORD = "bench"
+
+const USAGE = `Usage: npm run bench -- [options]
+
+  --scenario <name>         Only run this built-in session (repeatable)
+  --session <file>          Replay a recorded session, instead of the built-in
+                            ones unless --scenario is given (repeatable)
+  --repeat <n>              Passes over each session (default 3)
+  --discord-latency <ms>    Delay before the fake Discord answers (default 0)
+  --out <file>              Where to save the results (default bench/results/)
+  --baseline <file>         Compare the run with an earlier one
+  --compare <a> <b>         Compare two saved runs and exit
+  --uploads                 Check upload hedging and the circuit breaker
+                            against fake image hosts and exit
+  --record <file>           Record a session from a running VLC and exit
+    --vlc-port <port>       (default 8080)
+    --vlc-password <pass>
+    --frames <n>            Polls to record (default 300)
+    --interval <ms>         Time between polls (default 1000)`
+
+interface BenchOptions {
+	scenarios: string[]
+	sessions: string[]
+	repeat: number
+	discordLatency: number
+	out: string | null
+	baseline: string | null
+	compare: [string, string] | null
+	uploads: boolean
+	record: string | null
+	vlcPort: number
+	vlcPassword: string
+	frames: number
+	interval: number
+}
+
+function parseArgs(args: string[]): BenchOptions {
+	const options: BenchOptions = {
+		scenarios: [],
+		sessions: [],
+		repeat: 3,
+		discordLatency: 0,
+		out: null,
+		baseline: null,
+		compare: null,
+		uploads: false,
+		record: null,
+		vlcPort: 8080,
+		vlcPassword: "",
+		frames: 300,
+		interval: 1000,
+	}
+
+	const value = (index: number): string => {
+		const next = args[index + 1]
+		if (next === undefined) {
+			throw new Error(`${args[index]} needs a value\n\n${USAGE}`)
+		}
+		return next
+	}
+
+	for (let index = 0; index < args.length; index++) {
+		switch (args[index]) {
+			case "--scenario":
+				options.scenarios.push(value(index++))
+				break
+			case "--session":
+				options.sessions.push(value(index++))
+				break
+			case "--repeat":
+				options.repeat = Math.max(1, Number(value(index++)))
+				break
+			case "--discord-latency":
+				options.discordLatency = Number(value(index++))
+				break
+			case "--out":
+				options.out = value(index++)
+				break
+			case "--baseline":
+				options.baseline = value(index++)
+				break
+			case "--compare":
+				options.compare = [value(index), value(index + 1)]
+				index += 2
+				break
+			case "--uploads":
+				options.uploads = true
+				break
+			case "--record":
+				options.record = value(index++)
+				break
+			case "--vlc-port":
+				options.vlcPort = Number(value(index++))
+				break
+			case "--vlc-password":
+				options.vlcPassword = value(index++)
+				break
+			case "--frames":
+				options.frames = Number(value(index++))
+				break
+			case "--interval":
+				options.interval = Number(value(index++))
+				break
+			default:
+				throw new Error(`Unknown option ${args[index]}\n\n${USAGE}`)
+		}
+	}
+
+	return options
+}
+
+/**
+ * Loads the services once the isolated profile is in place
+ */
+async function loadServices() {
+	const { configService } = await import("@main/services/config")
+	const { metricsService } = await import("@main/services/metrics")
+	const { vlcStatusService } = await import("@main/services/vlc-status")
+	const { mediaStateService } = await import("@main/services/media-state")
+	const { discordRpcService } = await import("@main/services/discord-rpc")
+	return { configService, metricsService, vlcStatusService, mediaStateService, discordRpcService }
+}
+
+type Services = Awaited<ReturnType<typeof loadServices>>
+
+interface Fakes {
+	vlc: FakeVlcServer
+	discord: FakeDiscordIpc
+	google: ReturnType<typeof installFakeGoogle>
+}
+
+/**
+ * Difference of two counter snapshots
+ */
+function delta<T extends object>(after: T, before: T): T {
+	const result = { ...after } as Record<string, number>
+	for (const [key, value] of Object.entries(before)) {
+		result[key] -= value as number
+	}
+	return result as T
+}
+
+/**
+ * Replay a session through the same path a VLC poll takes in the app:
+ * status read, presence build, Discord update
+ *
+ * Every frame runs all three stages, unlike the app which skips building
+ * when neither the status nor the settings changed, so each stage is
+ * measured on every poll.
+ */
+async function runScenario(
+	session: Session,
+	repeat: number,
+	services: Services,
+	fakes: Fakes,
+): Promise<ScenarioResult> {
+	const { vlcStatusService, mediaStateService, discordRpcService } = services
+
+	fakes.vlc.load(session)
+	// Playlist ids from the previous session mean nothing in this one
+	vlcStatusService.updateConnectionInfo()
+
+	const stages = new StageRecorder()
+	const memory = new MemoryProbe()
+	const activityBefore = discordRpcService.getActivityStats()
+	const vlcBefore = fakes.vlc.getStats()
+	const discordBefore = fakes.discord.getStats()
+	const googleBefore = { ...fakes.google.stats }
+
+	memory.start()
+	const started = performance.now()
+	let frames = 0
+
+	for (let pass = 0; pass < repeat; pass++) {
+		for (const frame of session.frames) {
+			fakes.vlc.setFrame(frame)
+			const frameStart = performance.now()
+
+			const status = await stages.time("vlc.read_status", () => vlcStatusService.readStatus())
+			const presence = await stages.time("presence.build", () =>
+				mediaStateService.getDiscordPresence(status, vlcStatusService.getLastChange()),
+			)
+			await stages.time("discord.update", () =>
+				presence ? discordRpcService.update(presence) : discordRpcService.clear(),
+			)
+
+			stages.record("frame", performance.now() - frameStart)
+			memory.sample()
+			frames++
+		}
+	}
+
+	const durationMs = performance.now() - started
+
+	return {
+		name: session.name,
+		description: session.description,
+		frames,
+		durationMs: Math.round(durationMs * 1000) / 1000,
+		framesPerSecond: Math.round((frames / (durationMs / 1000)) * 10) / 10,
+		stages: stages.summarize(),
+		memory: memory.stop(),
+		activity: delta(discordRpcService.getActivityStats(), activityBefore),
+		vlc: delta(fakes.vlc.getStats(), vlcBefore),
+		discord: delta(fakes.discord.getStats(), discordBefore),
+		google: delta({ ...fakes.google.stats }, googleBefore),
+	}
+}
+
+function selectSessions(options: BenchOptions): Session[] {
+	const builtIn = builtInSessions()
+	for (const name of options.scenarios) {
+		if (!builtIn.some((session) => session.name === name)) {
+			const names = builtIn.map((session) => session.name).join(", ")
+			throw new Error(`Unknown scenario ${name}, the built-in ones are ${names}`)
+		}
+	}
+
+	const selected =
+		options.scenarios.length > 0
+			? builtIn.filter((session) => options.scenarios.includes(session.name))
+			: options.sessions.length > 0
+				? []
+				: builtIn
+	return [...selected, ...options.sessions.map(loadSession)]
+}
+
+/**
+ * Point the app at a throwaway profile, so a run starts from empty caches
+ * and leaves the real one alone
+ *
+ * @returns The profile directory, to remove once done
+ */
+function useThrowawayProfile(): string {
+	const profile = mkdtempSync(join(tmpdir(), "vlc-rpc-bench-"))
+	app.setPath("userData", profile)
+	process.env.VLC_RPC_LOG_LEVEL ??= "warn"
+	return profile
+}
+
+async function bench(options: BenchOptions): Promise<void> {
+	const sessions = selectSessions(options)
+	const profile = useThrowawayProfile()
+
+	const fakes: Fakes = {
+		vlc: new FakeVlcServer(VLC_PASSWORD),
+		discord: new FakeDiscordIpc(options.discordLatency),
+		google: installFakeGoogle(),
+	}
+
+	try {
+		const port = await fakes.vlc.listen()
+		await fakes.discord.listen()
+		await app.whenReady()
+
+		const services = await loadServices()
+		services.configService.set("vlc", {
+			...services.configService.get<VlcConfig>("vlc"),
+			httpPort: port,
+			httpPassword: VLC_PASSWORD,
+			httpEnabled: true,
+		})
+		services.vlcStatusService.updateConnectionInfo()
+
+		if (!(await services.discordRpcService.connect())) {
+			throw new Error("Could not connect to the fake Discord IPC socket")
+		}
+
+		// Warm up the JIT and lazy imports on an album none of the scenarios play
+		await runScenario(trackChangesSession("Warm Up"), 1, services, fakes)
+
+		const scenarios: ScenarioResult[] = []
+		for (const session of sessions) {
+			console.log(`Running ${session.name} (${session.frames.length} frames x ${options.repeat})`)
+			scenarios.push(await runScenario(session, options.repeat, services, fakes))
+		}
+
+		const result: BenchResult = {
+			version: 1,
+			takenAt: new Date().toISOString(),
+			...getRevision(),
+			environment: {
+				platform: `${process.platform}-${process.arch}`,
+				cpu: cpus()[0]?.model ?? "unknown",
+				electron: process.versions.electron ?? "unknown",
+				node: process.versions.node,
+				v8: process.versions.v8,
+			},
+			options: {
+				repeat: options.repeat,
+				discordLatency: options.discordLatency,
+				sessions: sessions.map((session) => session.name),
+			},
+			scenarios,
+			metrics: services.metricsService.snapshot(),
+		}
+
+		const out = options.out ?? defaultResultPath(result)
+		saveResult(result, out)
+		console.log(`\n${formatResult(result)}\n\nSaved to ${out}`)
+
+		if (options.baseline) {
+			console.log(`\n${formatComparison(loadResult(options.baseline), result)}`)
+		}
+
+		await services.discordRpcService.close()
+	} finally {
+		fakes.google.restore()
+		await fakes.discord.close()
+		await fakes.vlc.close()
+		rmSync(profile, { recursive: true, force: true })
+	}
+}
+
+/**
+ * Run the uploader against fake image hosts, failing when a check does
+ */
+async function checkUploads(): Promise<void> {
+	const profile = useThrowawayProfile()
+	const hosts = new FakeUploadHosts()
+
+	try {
+		await hosts.listen()
+		await app.whenReady()
+
+		const { configService } = await import("@main/services/config")
+		const { multiImageUploaderService } = await import("@main/services/multi-image-uploader")
+		const results = await runUploadChecks(hosts, multiImageUploaderService, configService)
+		console.log(formatUploadChecks(results))
+
+		const failed = results.filter((result) => result.failures.length > 0).length
+		if (failed > 0) {
+			throw new Error(`${failed} of ${results.length} upload checks failed`)
+		}
+	} finally {
+		await hosts.close()
+		rmSync(profile, { recursive: true, force: true })
+	}
+}
+
+async function main(): Promise<void> {
+	if (process.argv.includes("--help")) {
+		console.log(USAGE)
+		return
+	}
+
+	const options = parseArgs(process.argv.slice(2))
+
+	if (options.compare) {
+		const [baseline, current] = options.compare
+		console.log(formatComparison(loadResult(baseline), loadResult(current)))
+		return
+	}
+
+	if (options.uploads) {
+		await checkUploads()
+		return
+	}
+
+	if (options.record) {
+		console.log(`Recording ${options.frames} polls from VLC on port ${options.vlcPort}`)
+		const session = await recordSession(
+			basename(options.record, extname(options.record)),
+			options.vlcPort,
+			options.vlcPassword,
+			options.frames,
+			options.interval,
+		)
+		writeFileSync(options.record, JSON.stringify(session), "utf-8")
+		console.log(`Saved to ${options.record}`)
+		return
+	}
+
+	await bench(options)
+}
+
+main()
+	.then(() => app.exit(0))
+	.catch((error) => {
+		console.error(error instanceof Error ? error.message : error)
+		app.exit(1)
+	})
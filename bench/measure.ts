@@ -0,0 +1,152 @@
+import { type PerformanceEntry, PerformanceObserver, performance } from "node:perf_hooks"
+import { getHeapStatistics, setFlagsFromString } from "node:v8"
+import { runInNewContext } from "node:vm"
+
+/**
+ * Latency of one stage over a run, in ms
+ */
+export interface StageSummary {
+	count: number
+	mean: number
+	p50: number
+	p99: number
+	max: number
+}
+
+/**
+ * Heap and garbage collector activity over a run
+ */
+export interface MemorySummary {
+	/** Heap in use after a full collection, before and after the run */
+	heapBefore: number
+	heapAfter: number
+	heapGrowth: number
+	/** Sum of heap increases between frames, a lower bound on bytes allocated */
+	allocatedBytes: number
+	gcCount: number
+	gcPauseMs: number
+}
+
+function round(value: number): number {
+	return Math.round(value * 1000) / 1000
+}
+
+/**
+ * Nearest-rank percentile of sorted samples
+ */
+function percentile(sorted: number[], quantile: number): number {
+	if (sorted.length === 0) {
+		return 0
+	}
+	return sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * quantile) - 1)]
+}
+
+/**
+ * Keeps every sample per stage, so percentiles are exact rather than bucketed
+ */
+export class StageRecorder {
+	private samples: Map<string, number[]> = new Map()
+
+	public record(stage: string, ms: number): void {
+		let samples = this.samples.get(stage)
+		if (!samples) {
+			samples = []
+			this.samples.set(stage, samples)
+		}
+		samples.push(ms)
+	}
+
+	public async time<T>(stage: string, step: () => Promise<T>): Promise<T> {
+		const start = performance.now()
+		try {
+			return await step()
+		} finally {
+			this.record(stage, performance.now() - start)
+		}
+	}
+
+	public summarize(): Record<string, StageSummary> {
+		const summary: Record<string, StageSummary> = {}
+		for (const [stage, samples] of this.samples) {
+			const sorted = [...samples].sort((a, b) => a - b)
+			const total = sorted.reduce((sum, sample) => sum + sample, 0)
+			summary[stage] = {
+				count: sorted.length,
+				mean: round(total / sorted.length),
+				p50: round(percentile(sorted, 0.5)),
+				p99: round(percentile(sorted, 0.99)),
+				max: round(sorted[sorted.length - 1]),
+			}
+		}
+		return summary
+	}
+}
+
+let collect: (() => void) | null = null
+
+/**
+ * Run a full garbage collection, exposing `gc` on first use
+ */
+export function collectGarbage(): void {
+	if (!collect) {
+		setFlagsFromString("--expose-gc")
+		collect = runInNewContext("gc") as () => void
+	}
+	collect()
+}
+
+/**
+ * Tracks heap growth and collector activity between `start` and `stop`
+ *
+ * V8 has no running count of allocated bytes, so allocations are estimated
+ * from the heap increases seen between samples, taken once per frame. Bytes
+ * allocated and collected between two samples are missed.
+ */
+export class MemoryProbe {
+	private observer: PerformanceObserver
+	private heapBefore = 0
+	private lastHeapUsed = 0
+	private allocatedBytes = 0
+	private gcCount = 0
+	private gcPauseMs = 0
+
+	constructor() {
+		this.observer = new PerformanceObserver((list) => {
+			for (const entry of list.getEntries() as PerformanceEntry[]) {
+				this.gcCount++
+				this.gcPauseMs += entry.duration
+			}
+		})
+	}
+
+	public start(): void {
+		collectGarbage()
+		this.heapBefore = getHeapStatistics().used_heap_size
+		this.lastHeapUsed = this.heapBefore
+		this.observer.observe({ entryTypes: ["gc"] })
+	}
+
+	public sample(): void {
+		const used = getHeapStatistics().used_heap_size
+		if (used > this.lastHeapUsed) {
+			this.allocatedBytes += used - this.lastHeapUsed
+		}
+		this.lastHeapUsed = used
+	}
+
+	public stop(): MemorySummary {
+		this.sample()
+		this.observer.disconnect()
+		collectGarbage()
+		const heapAfter = getHeapStatistics().used_heap_size
+
+		return {
+			heapBefore: this.heapBefore,
+			heapAfter,
+			heapGrowth: heapAfter - this.heapBefore,
+			allocatedBytes: this.allocatedBytes,
+			gcCount: this.gcCount,
+			gcPauseMs: round(this.gcPauseMs),
+		}
+	}
+}
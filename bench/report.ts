@@ -0,0 +1,190 @@
+import { execFileSync } from "node:child_process"
+import { mkdirSync, readFileSync, writeFileSync } from "node:fs"
+import { dirname, join } from "node:path"
+import type { MetricsSnapshot } from "@shared/types"
+import type { ActivityUpdateStats } from "@shared/types/media"
+import type { FakeDiscordStats } from "./fake-discord"
+import type { FakeGoogleStats } from "./fake-google"
+import type { FakeVlcStats } from "./fake-vlc"
+import type { MemorySummary, StageSummary } from "./measure"
+
+/**
+ * Everything measured while replaying one session
+ */
+export interface ScenarioResult {
+	name: string
+	description: string
+	frames: number
+	durationMs: number
+	framesPerSecond: number
+	/** `frame` is the whole poll, the others are its parts */
+	stages: Record<string, StageSummary>
+	memory: MemorySummary
+	activity: ActivityUpdateStats
+	vlc: FakeVlcStats
+	discord: FakeDiscordStats
+	google: FakeGoogleStats
+}
+
+/**
+ * A bench run, saved as JSON
+ */
+export interface BenchResult {
+	version: 1
+	takenAt: string
+	commit: string | null
+	dirty: boolean
+	environment: {
+		platform: string
+		cpu: string
+		electron: string
+		node: string
+		v8: string
+	}
+	options: Record<string, unknown>
+	scenarios: ScenarioResult[]
+	/** The app's own metrics registry after all scenarios */
+	metrics: MetricsSnapshot
+}
+
+function git(...args: string[]): string | null {
+	try {
+		return execFileSync("git", args, { encoding: "utf-8", stdio: ["ignore", "pipe", "ignore"] })
+	} catch {
+		return null
+	}
+}
+
+/**
+ * Commit the bench ran on, and whether the tree had uncommitted changes
+ */
+export function getRevision(): { commit: string | null; dirty: boolean } {
+	const commit = git("rev-parse", "--short", "HEAD")?.trim() || null
+	const status = git("status", "--porcelain", "--untracked-files=no")
+	return { commit, dirty: Boolean(status?.trim()) }
+}
+
+/**
+ * Default location for a run's results, named so runs sort by time
+ */
+export function defaultResultPath(result: BenchResult): string {
+	const stamp = result.takenAt.replace(/[:.]/g, "-")
+	const revision = `${result.commit ?? "unknown"}${result.dirty ? "-dirty" : ""}`
+	return join("bench", "results", `${stamp}-${revision}.json`)
+}
+
+export function saveResult(result: BenchResult, path: string): void {
+	mkdirSync(dirname(path), { recursive: true })
+	writeFileSync(path, JSON.stringify(result, null, "\t"), "utf-8")
+}
+
+export function loadResult(path: string): BenchResult {
+	const result = JSON.parse(readFileSync(path, "utf-8")) as BenchResult
+	if (result.version !== 1 || !Array.isArray(result.scenarios)) {
+		throw new Error(`${path} is not a bench result`)
+	}
+	return result
+}
+
+function formatBytes(bytes: number): string {
+	const sign = bytes < 0 ? "-" : ""
+	const size = Math.abs(bytes)
+	if (size >= 1024 * 1024) return `${sign}${(size / 1024 / 1024).toFixed(2)} MB`
+	if (size >= 1024) return `${sign}${(size / 1024).toFixed(1)} KB`
+	return `${sign}${size} B`
+}
+
+function table(rows: string[][]): string {
+	const widths = rows[0].map((_, column) => Math.max(...rows.map((row) => row[column].length)))
+	const pad = (cell: string, column: number) =>
+		column === 0 ? cell.padEnd(widths[column]) : cell.padStart(widths[column])
+	return rows.map((row) => row.map(pad).join("  ")).join("\n")
+}
+
+/**
+ * Human readable summary of a run
+ */
+export function formatResult(result: BenchResult): string {
+	const lines = [
+		`Commit ${result.commit ?? "unknown"}${result.dirty ? " (dirty)" : ""}, ` +
+			`Electron ${result.environment.electron} on ${result.environment.platform}`,
+	]
+
+	for (const scenario of result.scenarios) {
+		const { memory } = scenario
+		const allocatedPerFrame = Math.round(memory.allocatedBytes / scenario.frames)
+		lines.push(
+			"",
+			`${scenario.name}: ${scenario.description}`,
+			`  ${scenario.frames} frames, ${scenario.framesPerSecond.toFixed(1)} frames/s, ` +
+				`heap ${formatBytes(memory.heapGrowth)} after GC, ` +
+				`~${formatBytes(allocatedPerFrame)} allocated per frame, ` +
+				`${memory.gcCount} GCs (${memory.gcPauseMs.toFixed(1)} ms)`,
+			`  Discord: ${scenario.activity.sent} sent, ${scenario.activity.skipped} skipped, ` +
+				`${scenario.activity.throttled} throttled; ` +
+				`VLC: ${scenario.vlc.statusRequests} status, ${scenario.vlc.playlistRequests} playlist`,
+		)
+
+		const rows = [["  stage", "count", "mean", "p50", "p99", "max"]]
+		for (const [stage, stats] of Object.entries(scenario.stages)) {
+			rows.push([
+				`  ${stage}`,
+				String(stats.count),
+				stats.mean.toFixed(3),
+				stats.p50.toFixed(3),
+				stats.p99.toFixed(3),
+				stats.max.toFixed(3),
+			])
+		}
+		lines.push(table(rows))
+	}
+
+	return lines.join("\n")
+}
+
+function change(baseline: number, current: number): string {
+	if (baseline === 0) {
+		return current === 0 ? "0%" : "new"
+	}
+	const percent = ((current - baseline) / Math.abs(baseline)) * 100
+	return `${percent >= 0 ? "+" : ""}${percent.toFixed(1)}%`
+}
+
+/**
+ * Side by side comparison of two runs, for the scenarios both have
+ */
+export function formatComparison(baseline: BenchResult, current: BenchResult): string {
+	const rows = [["scenario / metric", "baseline", "current", "change"]]
+	const number = (value: number) => value.toFixed(3)
+
+	for (const scenario of current.scenarios) {
+		const before = baseline.scenarios.find((candidate) => candidate.name === scenario.name)
+		if (!before) {
+			continue
+		}
+
+		const metric = (name: string, a: number, b: number, format = number) => {
+			rows.push([`${scenario.name} / ${name}`, format(a), format(b), change(a, b)])
+		}
+
+		metric("frames/s", before.framesPerSecond, scenario.framesPerSecond, (v) => v.toFixed(1))
+		for (const [stage, stats] of Object.entries(scenario.stages)) {
+			const previous = before.stages[stage]
+			if (previous) {
+				metric(`${stage} p50 ms`, previous.p50, stats.p50)
+				metric(`${stage} p99 ms`, previous.p99, stats.p99)
+			}
+		}
+		metric("heap growth", before.memory.heapGrowth, scenario.memory.heapGrowth, formatBytes)
+		metric(
+			"allocated/frame",
+			before.memory.allocatedBytes / before.frames,
+			scenario.memory.allocatedBytes / scenario.frames,
+			(v) => formatBytes(Math.round(v)),
+		)
+	}
+
+	const label = (result: BenchResult) =>
+		`${result.commit ?? "unknown"}${result.dirty ? " (dirty)" : ""} at ${result.takenAt}`
+	return [`Baseline ${label(baseline)}`, `Current  ${label(current)}`, "", table(rows)].join("\n")
+}
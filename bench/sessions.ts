@@ -0,0 +1,407 @@
+import { readFileSync } from "node:fs"
+import { request } from "node:http"
+import { basename, extname } from "node:path"
+import type {
+	VlcMetadata,
+	VlcPlaylistItem,
+	VlcPlaylistResponse,
+	VlcRawStatus,
+	VlcStreamInfo,
+} from "@shared/types/vlc"
+
+/**
+ * What VLC answers to one poll
+ */
+export interface SessionFrame {
+	status: VlcRawStatus
+	/** Replaces the session playlist from this frame on */
+	playlist?: VlcPlaylistResponse
+}
+
+/**
+ * A sequence of VLC states, replayed one frame per poll
+ */
+export interface Session {
+	name: string
+	description: string
+	playlist: VlcPlaylistResponse
+	frames: SessionFrame[]
+}
+
+interface Track {
+	id: number
+	length: number
+	meta: VlcMetadata
+	streams: Record<string, VlcStreamInfo>
+}
+
+const AUDIO_STREAM: VlcStreamInfo = {
+	Type: "Audio",
+	Codec: "MPEG Audio layer 1/2/3 (mpga)",
+	Channels: "Stereo",
+	Sample_rate: "44100 Hz",
+	Bitrate: "320 kb/s",
+}
+
+/**
+ * Small deterministic generator, so every run replays the same session
+ */
+function createRandom(seed: number): () => number {
+	let state = seed
+	return () => {
+		state = (state * 1664525 + 1013904223) % 4294967296
+		return state / 4294967296
+	}
+}
+
+/**
+ * @param directory - Already URI encoded
+ */
+function playlistItem(track: Track, directory: string): VlcPlaylistItem {
+	return {
+		ro: "rw",
+		type: "leaf",
+		name: track.meta.title || track.meta.filename || "",
+		id: String(track.id),
+		duration: track.length,
+		uri: `file://${directory}/${encodeURIComponent(track.meta.filename || "")}`,
+	}
+}
+
+function playlistRoot(items: VlcPlaylistItem[]): VlcPlaylistResponse {
+	return {
+		ro: "ro",
+		type: "node",
+		name: "",
+		id: "0",
+		children: [
+			{ ro: "ro", type: "node", name: "Playlist", id: "1", children: items },
+			{ ro: "ro", type: "node", name: "Media Library", id: "2", children: [] },
+		],
+	}
+}
+
+function frame(state: string, track: Track, time: number): SessionFrame {
+	return {
+		status: {
+			state,
+			time,
+			length: track.length,
+			position: track.length > 0 ? time / track.length : 0,
+			currentplid: track.id,
+			rate: 1,
+			volume: 256,
+			version: "3.0.21 Vetinari",
+			apiversion: 3,
+			information: {
+				category: { meta: track.meta, ...track.streams },
+			},
+		},
+	}
+}
+
+function stoppedFrame(): SessionFrame {
+	return { status: { state: "stopped", time: 0, length: 0, position: 0, currentplid: -1 } }
+}
+
+function albumTracks(album: string, artist: string, count: number, firstId: number): Track[] {
+	return Array.from({ length: count }, (_, index) => {
+		const number = String(index + 1).padStart(2, "0")
+		const title = `${album} Track ${number}`
+		return {
+			id: firstId + index,
+			length: 180 + ((index * 37) % 120),
+			meta: {
+				title,
+				artist,
+				album,
+				track_number: String(index + 1),
+				track_total: String(count),
+				date: "2019",
+				genre: "Electronic",
+				filename: `${number} - ${title}.mp3`,
+			},
+			streams: { "Stream 0": AUDIO_STREAM },
+		}
+	})
+}
+
+/**
+ * An album played through, with a pause in the middle
+ */
+export function trackChangesSession(album = "Night Drive"): Session {
+	const tracks = albumTracks(album, "Bench Ensemble", 12, 100)
+	const frames: SessionFrame[] = []
+
+	for (const [index, track] of tracks.entries()) {
+		for (let time = 0; time < 8; time++) {
+			frames.push(frame("playing", track, time))
+		}
+		if (index === 5) {
+			for (let poll = 0; poll < 4; poll++) {
+				frames.push(frame("paused", track, 8))
+			}
+			frames.push(frame("playing", track, 9))
+		}
+	}
+	frames.push(stoppedFrame())
+
+	return {
+		name: "track-changes",
+		description: "12 track album, 8 polls per track, one pause",
+		playlist: playlistRoot(
+			tracks.map((track) => playlistItem(track, `/music/${encodeURIComponent(album)}`)),
+		),
+		frames,
+	}
+}
+
+/**
+ * One long track with the position jumping around
+ */
+export function seeksSession(): Session {
+	const [track] = albumTracks("Live Set", "Bench Ensemble", 1, 200)
+	track.length = 3600
+	const random = createRandom(7)
+	const frames: SessionFrame[] = []
+
+	let time = 0
+	for (let poll = 0; poll < 120; poll++) {
+		time = poll % 6 === 5 ? Math.floor(random() * track.length) : time + 1
+		frames.push(frame("playing", track, time))
+	}
+
+	return {
+		name: "seeks",
+		description: "One hour long track, a seek every 6 polls",
+		playlist: playlistRoot([playlistItem(track, "/music/Live%20Set")]),
+		frames,
+	}
+}
+
+/**
+ * A 20,000 item library in nested folders, hopping between items and
+ * growing halfway through
+ */
+export function hugePlaylistSession(): Session {
+	const FOLDERS = 40
+	const PER_FOLDER = 500
+	const random = createRandom(42)
+	const tracks: Track[] = []
+
+	const folder = (index: number, items: Track[]): VlcPlaylistItem => ({
+		ro: "rw",
+		type: "node",
+		name: `Folder ${index}`,
+		id: String(1_000_000 + index),
+		children: items.map((track) => playlistItem(track, `/library/Folder%20${index}`)),
+	})
+
+	const folders: VlcPlaylistItem[] = []
+	for (let index = 0; index < FOLDERS; index++) {
+		const firstId = 10_000 + index * PER_FOLDER
+		const items = albumTracks(`Album ${index}`, `Artist ${index % 25}`, PER_FOLDER, firstId)
+		tracks.push(...items)
+		folders.push(folder(index, items))
+	}
+
+	const frames: SessionFrame[] = []
+	const play = (track: Track) => {
+		for (let time = 0; time < 3; time++) {
+			frames.push(frame("playing", track, time))
+		}
+	}
+
+	for (let hop = 0; hop < 30; hop++) {
+		play(tracks[Math.floor(random() * tracks.length)])
+	}
+
+	// Items added while playing, the first one has an id the index hasn't seen
+	const added = albumTracks("Added Later", "Artist 0", PER_FOLDER, 10_000 + FOLDERS * PER_FOLDER)
+	const grown = playlistRoot([...folders, folder(FOLDERS, added)])
+	frames.push({ ...frame("playing", added[0], 0), playlist: grown })
+	play(added[0])
+
+	for (let hop = 0; hop < 30; hop++) {
+		play(tracks[Math.floor(random() * tracks.length)])
+	}
+
+	return {
+		name: "huge-playlist",
+		description: `${FOLDERS * PER_FOLDER} items in ${FOLDERS} folders, 60 hops, grows halfway`,
+		playlist: playlistRoot(folders),
+		frames,
+	}
+}
+
+function episode(id: number, number: number): Track {
+	const streams: Record<string, VlcStreamInfo> = {
+		"Stream 0": {
+			Type: "Video",
+			Codec: "H264 - MPEG-4 AVC (part 10) (h264)",
+			Video_resolution: "1920x1080",
+			Buffer_dimensions: "1920x1088",
+			Frame_rate: "23.976024",
+			Decoded_format: "Planar 4:2:0 YUV",
+			Orientation: "Top left",
+			Chroma_location: "Left",
+		},
+	}
+
+	const languages = ["English", "Japanese", "Spanish", "French", "German", "Italian", "Korean"]
+	for (let index = 0; index < 8; index++) {
+		streams[`Stream ${index + 1}`] = {
+			Type: "Audio",
+			Codec: "A52 Audio (aka AC3) (a52 )",
+			Language: languages[index % languages.length],
+			Channels: "3F2R/LFE",
+			Sample_rate: "48000 Hz",
+			Bits_per_sample: "32",
+		}
+	}
+	for (let index = 0; index < 40; index++) {
+		streams[`Stream ${index + 9}`] = {
+			Type: "Subtitle",
+			Codec: "Text subtitles with various tags (subt)",
+			Language: `${languages[index % languages.length]} ${index}`,
+			Description: index % 3 === 0 ? "Signs & Songs" : "Full",
+		}
+	}
+
+	const code = `S02E${String(number).padStart(2, "0")}`
+	return {
+		id,
+		length: 1440,
+		meta: { filename: `Bench.Show.${code}.1080p.WEB-DL.DDP5.1.H.264-GRP.mkv` },
+		streams,
+	}
+}
+
+/**
+ * Two episodes of a show with 48 audio and subtitle tracks, paused, seeked
+ * and stopped along the way
+ */
+export function videoManyStreamsSession(): Session {
+	const first = episode(300, 5)
+	const second = episode(301, 6)
+	const frames: SessionFrame[] = []
+
+	const play = (track: Track, state: string, from: number, polls: number) => {
+		for (let poll = 0; poll < polls; poll++) {
+			frames.push(frame(state, track, state === "playing" ? from + poll : from))
+		}
+	}
+
+	play(first, "playing", 0, 20)
+	play(first, "paused", 20, 10)
+	play(first, "playing", 20, 10)
+	play(first, "playing", 900, 10)
+	play(second, "playing", 0, 20)
+	for (let poll = 0; poll < 5; poll++) {
+		frames.push(stoppedFrame())
+	}
+
+	return {
+		name: "video-many-streams",
+		description: "Two episodes with 1 video, 8 audio and 40 subtitle streams",
+		playlist: playlistRoot([
+			playlistItem(first, "/videos/Bench%20Show"),
+			playlistItem(second, "/videos/Bench%20Show"),
+		]),
+		frames,
+	}
+}
+
+/**
+ * The sessions built into the harness
+ */
+export function builtInSessions(): Session[] {
+	return [trackChangesSession(), seeksSession(), hugePlaylistSession(), videoManyStreamsSession()]
+}
+
+/**
+ * Load a session recorded with `--record`
+ */
+export function loadSession(path: string): Session {
+	const session = JSON.parse(readFileSync(path, "utf-8")) as Partial<Session>
+	if (!Array.isArray(session.frames) || session.frames.length === 0) {
+		throw new Error(`${path} has no frames`)
+	}
+
+	return {
+		name: session.name || basename(path, extname(path)),
+		description: session.description || `Recorded session from ${basename(path)}`,
+		playlist: session.playlist ?? playlistRoot([]),
+		frames: session.frames,
+	}
+}
+
+function getVlcJson<T>(port: number, password: string, path: string): Promise<T> {
+	return new Promise((resolve, reject) => {
+		const req = request(
+			{
+				host: "localhost",
+				port,
+				path: `/requests/${path}`,
+				auth: `:${password}`,
+			},
+			(res) => {
+				const chunks: Buffer[] = []
+				res.on("data", (chunk: Buffer) => chunks.push(chunk))
+				res.on("end", () => {
+					if (res.statusCode !== 200) {
+						reject(new Error(`VLC answered HTTP ${res.statusCode} for ${path}`))
+						return
+					}
+					try {
+						resolve(JSON.parse(Buffer.concat(chunks).toString("utf-8")))
+					} catch (error) {
+						reject(error)
+					}
+				})
+			},
+		)
+		req.on("error", reject)
+		req.end()
+	})
+}
+
+/**
+ * Record a session from a running VLC
+ *
+ * Polls the status at a fixed interval and fetches the playlist whenever the
+ * current item is one it hasn't seen, the same way the app would.
+ */
+export async function recordSession(
+	name: string,
+	port: number,
+	password: string,
+	frameCount: number,
+	intervalMs: number,
+): Promise<Session> {
+	const initialPlaylist = await getVlcJson<VlcPlaylistResponse>(port, password, "playlist.json")
+	const seen = new Set<number>()
+	const frames: SessionFrame[] = []
+
+	for (let poll = 0; poll < frameCount; poll++) {
+		const status = await getVlcJson<VlcRawStatus>(port, password, "status.json")
+		const next: SessionFrame = { status }
+
+		if (status.currentplid !== undefined && status.currentplid >= 0) {
+			if (!seen.has(status.currentplid) && poll > 0) {
+				next.playlist = await getVlcJson<VlcPlaylistResponse>(port, password, "playlist.json")
+			}
+			seen.add(status.currentplid)
+		}
+
+		frames.push(next)
+		await new Promise((resolve) => setTimeout(resolve, intervalMs))
+	}
+
+	return {
+		name,
+		description: `Recorded from VLC, ${frameCount} polls every ${intervalMs} ms`,
+		playlist: initialPlaylist,
+		frames,
+	}
+}
@@ -0,0 +1,196 @@
+import type { configService } from "@main/services/config"
+import type { MultiImageUploaderService } from "@main/services/multi-image-uploader"
+import type { UploadHostHealth } from "@shared/types"
+import type { FakeUploadHosts } from "./fake-upload-hosts"
+
+/** Not an image the optimizer can decode, so it is uploaded as is */
+const IMAGE = Buffer.from("bench artwork")
+
+/** Longer than the uploader's circuit cooldown */
+const PAST_COOLDOWN = 11 * 60 * 1000
+
+/**
+ * Outcome of one upload check
+ */
+export interface UploadCheckResult {
+	name: string
+	description: string
+	/** Failed expectations, empty when the check passed */
+	failures: string[]
+	durationMs: number
+}
+
+interface UploadCheckContext {
+	hosts: FakeUploadHosts
+	uploader: MultiImageUploaderService
+	configService: typeof configService
+	expect: (condition: boolean, message: string) => void
+}
+
+interface UploadCheck {
+	name: string
+	description: string
+	run: (context: UploadCheckContext) => Promise<void>
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+/**
+ * Wait for a condition the server side reaches shortly after the upload resolves
+ */
+async function waitFor(condition: () => boolean, timeoutMs = 1000): Promise<boolean> {
+	const deadline = Date.now() + timeoutMs
+	while (!condition()) {
+		if (Date.now() > deadline) {
+			return false
+		}
+		await sleep(10)
+	}
+	return true
+}
+
+function health(uploader: MultiImageUploaderService, host: string): UploadHostHealth | undefined {
+	return uploader.getHostHealth()[host]
+}
+
+/**
+ * The checks share the uploader, so each one starts from the host health
+ * the previous one left behind and they have to run in this order
+ */
+const CHECKS: UploadCheck[] = [
+	{
+		name: "slow-host",
+		description: "A slow leader is hedged, the hedge wins and the leader is aborted",
+		run: async ({ hosts, uploader, expect }) => {
+			hosts.setAll({ mode: "ok", delayMs: 0 })
+			hosts.setBehavior("x0.at", { mode: "ok", delayMs: 6000 })
+
+			const started = Date.now()
+			const url = await uploader.uploadImage(IMAGE, "cover.jpg")
+			const elapsed = Date.now() - started
+
+			expect(url?.startsWith("https://catbox.moe/") ?? false, `hedge won, got ${url}`)
+			expect(elapsed < 6000, `resolved before the slow host answered, took ${elapsed}ms`)
+			expect(
+				await waitFor(() => hosts.getStats("x0.at").aborted === 1),
+				`slow host aborted, stats ${JSON.stringify(hosts.getStats("x0.at"))}`,
+			)
+			expect(
+				(health(uploader, "x0.at")?.consecutiveFailures ?? 0) === 0,
+				"a cancelled upload is not counted as a failure",
+			)
+		},
+	},
+	{
+		name: "failing-host",
+		description: "A failing host hands over at once, trips its circuit and is then skipped",
+		run: async ({ hosts, uploader, expect }) => {
+			hosts.setAll({ mode: "ok", delayMs: 200 })
+			hosts.setBehavior("catbox.moe", { mode: "fail", delayMs: 0 })
+
+			// The fastest host so far keeps being tried first until its circuit opens
+			for (let attempt = 1; attempt <= 3; attempt++) {
+				const started = Date.now()
+				const url = await uploader.uploadImage(IMAGE, "cover.jpg")
+				const elapsed = Date.now() - started
+				expect(url !== null && !url.includes("catbox.moe"), `upload ${attempt} got ${url}`)
+				expect(elapsed < 1000, `upload ${attempt} handed over without a hedge, ${elapsed}ms`)
+			}
+
+			const tripped = health(uploader, "catbox.moe")
+			expect(hosts.getStats("catbox.moe").failed === 3, "failing host was tried three times")
+			expect(
+				(tripped?.circuitOpenUntil ?? 0) > Date.now(),
+				`circuit opened, health ${JSON.stringify(tripped)}`,
+			)
+
+			const requestsBefore = hosts.getStats("catbox.moe").requests
+			const url = await uploader.uploadImage(IMAGE, "cover.jpg")
+			expect(url !== null, "upload with the circuit open succeeded")
+			expect(
+				hosts.getStats("catbox.moe").requests === requestsBefore,
+				"host with an open circuit was skipped",
+			)
+		},
+	},
+	{
+		name: "recovery",
+		description: "Once the cooldown passes the host is tried again and its health recovers",
+		run: async ({ hosts, uploader, configService, expect }) => {
+			hosts.setBehavior("catbox.moe", { mode: "ok", delayMs: 0 })
+
+			// Jump past the cooldown instead of waiting it out
+			const realNow = Date.now
+			Date.now = () => realNow() + PAST_COOLDOWN
+			try {
+				const url = await uploader.uploadImage(IMAGE, "cover.jpg")
+				expect(url?.startsWith("https://catbox.moe/") ?? false, `recovered host won, got ${url}`)
+			} finally {
+				Date.now = realNow
+			}
+
+			const recovered = health(uploader, "catbox.moe")
+			expect(
+				recovered?.consecutiveFailures === 0 && recovered.circuitOpenUntil === 0,
+				`circuit closed, health ${JSON.stringify(recovered)}`,
+			)
+
+			const saved = configService.get<Record<string, UploadHostHealth>>("uploadHostHealth")
+			expect(
+				saved["catbox.moe"]?.circuitOpenUntil === 0,
+				`recovered health saved, saved ${JSON.stringify(saved["catbox.moe"])}`,
+			)
+		},
+	},
+]
+
+/**
+ * Run the uploader's hedging and circuit breaker against the fake hosts
+ *
+ * Expects a fresh profile, so no host has any recorded health yet.
+ */
+export async function runUploadChecks(
+	hosts: FakeUploadHosts,
+	uploader: MultiImageUploaderService,
+	config: typeof configService,
+): Promise<UploadCheckResult[]> {
+	const results: UploadCheckResult[] = []
+
+	for (const check of CHECKS) {
+		const failures: string[] = []
+		const expect = (condition: boolean, message: string) => {
+			if (!condition) {
+				failures.push(message)
+			}
+		}
+
+		const started = Date.now()
+		try {
+			await check.run({ hosts, uploader, configService: config, expect })
+		} catch (error) {
+			failures.push(`threw ${error instanceof Error ? error.message : error}`)
+		}
+
+		results.push({
+			name: check.name,
+			description: check.description,
+			failures,
+			durationMs: Date.now() - started,
+		})
+	}
+
+	return results
+}
+
+/**
+ * Human readable summary of the upload checks
+ */
+export function formatUploadChecks(results: UploadCheckResult[]): string {
+	return results
+		.flatMap((result) => [
+			`${result.failures.length === 0 ? "PASS" : "FAIL"} ${result.name} ` +
+				`(${result.durationMs} ms): ${result.description}`,
+			...result.failures.map((failure) => `  expected ${failure}`),
+		])
+		.join("\n")
+}
@@ -1,6 +1,8 @@
 import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
 import { startupService } from "@main/services/startup"
-import { ipcMain } from "electron"
+import { startupTimelineService } from "@main/services/startup-timeline"
+import type { StartupTimelineEntry } from "@shared/types"
 
 /**
  * Handler for app info requests
@@ -15,7 +17,10 @@ export class AppInfoHandler {
 	 * Initialize IPC handlers for app info
 	 */
 	private initializeHandlers(): void {
-		ipcMain.handle("app:isPortable", this.handleIsPortable.bind(this))
+		metricsService.handle("app:isPortable", this.handleIsPortable.bind(this))
+		metricsService.handle("app:startupTimeline", (): StartupTimelineEntry[] =>
+			startupTimelineService.getTimeline(),
+		)
 	}
 
 	/**
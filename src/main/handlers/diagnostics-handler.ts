@@ -0,0 +1,88 @@
+import { promises as fs } from "node:fs"
+import { join } from "node:path"
+import { configService } from "@main/services/config"
+import { coverArtService } from "@main/services/cover-art"
+import { discordRpcService } from "@main/services/discord-rpc"
+import { imageProxyService } from "@main/services/image-proxy"
+import { logger } from "@main/services/logger"
+import { metadataWriterService } from "@main/services/metadata-writer"
+import { metricsService } from "@main/services/metrics"
+import { multiImageUploaderService } from "@main/services/multi-image-uploader"
+import { startupTimelineService } from "@main/services/startup-timeline"
+import { videoAnalyzerService } from "@main/services/video-analyzer"
+import { vlcPollerService } from "@main/services/vlc-poller"
+import { vlcStatusService } from "@main/services/vlc-status"
+import { type DiagnosticsSnapshot, IpcChannels, IpcEvents } from "@shared/types"
+import { BrowserWindow, app, dialog } from "electron"
+
+/**
+ * Handler for the diagnostics panel, collects metrics and service stats
+ */
+export class DiagnosticsHandler {
+	constructor() {
+		this.registerHandlers()
+		logger.info("Diagnostics handler initialized")
+	}
+
+	/**
+	 * Register IPC handlers for diagnostics
+	 */
+	private registerHandlers(): void {
+		metricsService.handle(`${IpcChannels.DIAGNOSTICS}:${IpcEvents.DIAGNOSTICS_SNAPSHOT}`, () => {
+			return this.getSnapshot()
+		})
+
+		metricsService.handle(`${IpcChannels.DIAGNOSTICS}:${IpcEvents.DIAGNOSTICS_EXPORT}`, (event) => {
+			return this.exportSnapshot(BrowserWindow.fromWebContents(event.sender))
+		})
+	}
+
+	private async getSnapshot(): Promise<DiagnosticsSnapshot> {
+		return {
+			version: app.getVersion(),
+			platform: `${process.platform}-${process.arch}`,
+			metrics: metricsService.snapshot(),
+			vlcHttp: vlcStatusService.getHttpStats(),
+			pollCadence: vlcPollerService.getCadence(),
+			activity: discordRpcService.getActivityStats(),
+			uploads: multiImageUploaderService.getUploadStats(),
+			uploadHosts: multiImageUploaderService.getHostHealth(),
+			imageCache: imageProxyService.getCacheStats(),
+			artworkProviders: coverArtService.getProviderStats(),
+			videoAnalysisCache: videoAnalyzerService.getCacheStats(),
+			configWrites: configService.getWriteStats(),
+			metadata: await metadataWriterService.getMetadataStats(),
+			startup: startupTimelineService.getTimeline(),
+		}
+	}
+
+	/**
+	 * Save a snapshot as JSON where the user picks
+	 * @returns The saved file path, null if cancelled or failed
+	 */
+	private async exportSnapshot(window: BrowserWindow | null): Promise<string | null> {
+		const stamp = new Date().toISOString().replace(/[:.]/g, "-")
+		const options = {
+			title: "Export diagnostics",
+			defaultPath: join(app.getPath("downloads"), `vlc-rpc-diagnostics-${stamp}.json`),
+			filters: [{ name: "JSON", extensions: ["json"] }],
+		}
+
+		try {
+			const result = window
+				? await dialog.showSaveDialog(window, options)
+				: await dialog.showSaveDialog(options)
+			if (result.canceled || !result.filePath) {
+				return null
+			}
+
+			const snapshot = await this.getSnapshot()
+			await fs.writeFile(result.filePath, JSON.stringify(snapshot, null, "\t"), "utf-8")
+			logger.info(`Exported diagnostics to ${result.filePath}`)
+			return result.filePath
+		} catch (error) {
+			logger.error(`Error exporting diagnostics: ${error}`)
+			return null
+		}
+	}
+}
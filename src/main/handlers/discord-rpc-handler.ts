@@ -1,18 +1,22 @@
 import { discordRpcService } from "@main/services/discord-rpc"
 import { logger } from "@main/services/logger"
-import { mediaStateService } from "@main/services/media-state"
-import { vlcStatusService } from "@main/services/vlc-status"
+import { getPresenceConfigKey, mediaStateService } from "@main/services/media-state"
+import { metricsService } from "@main/services/metrics"
+import { vlcPollerService } from "@main/services/vlc-poller"
 import { IpcChannels, IpcEvents } from "@shared/types"
-import { ipcMain } from "electron"
+import type { VlcStatus, VlcStatusChange } from "@shared/types/vlc"
 
 /**
  * Handler for Discord RPC operations
  */
 export class DiscordRpcHandler {
-	private updateIntervalId: NodeJS.Timeout | null = null
-	private fastCheckIntervalId: NodeJS.Timeout | null = null
-	private fastCheckCount = 0
-	private maxFastChecks = 5
+	private unsubscribeStatus: (() => void) | null = null
+	private presenceUpdateInProgress = false
+	private pendingStatus: VlcStatus | null | undefined = undefined
+	private pendingChange: VlcStatusChange = "none"
+	// Whether the presence must be rebuilt on the next status
+	private presenceStale = true
+	private lastPresenceConfigKey = ""
 
 	constructor() {
 		this.registerIpcHandlers()
@@ -22,49 +26,55 @@ export class DiscordRpcHandler {
 	 * Register IPC handlers for Discord RPC
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle(`${IpcChannels.DISCORD}:connect`, async () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:connect`, async () => {
 			return await discordRpcService.connect()
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:disconnect`, async () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:disconnect`, async () => {
 			await discordRpcService.close()
 			return true
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:status`, () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:status`, () => {
 			return discordRpcService.isConnected()
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:update`, async () => {
-			return await this.updatePresence(true)
+		metricsService.handle(`${IpcChannels.DISCORD}:activity-stats`, () => {
+			return discordRpcService.getActivityStats()
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:start-loop`, async () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:update`, async () => {
+			const vlcStatus = await vlcPollerService.getLatestStatus()
+			// Serialized with the poller's updates so the two never race
+			return await this.handleStatus(vlcStatus, "semantic")
+		})
+
+		metricsService.handle(`${IpcChannels.DISCORD}:start-loop`, async () => {
 			return this.startUpdateLoop()
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:stop-loop`, () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:stop-loop`, () => {
 			this.stopUpdateLoop()
 			return true
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:reconnect`, async () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:reconnect`, async () => {
 			logger.info("Forcing Discord reconnection")
 			return await discordRpcService.forceReconnect()
 		})
 
 		// New RPC control handlers
-		ipcMain.handle(`${IpcChannels.DISCORD}:${IpcEvents.RPC_ENABLE}`, () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:${IpcEvents.RPC_ENABLE}`, () => {
 			discordRpcService.enableRpc()
 			return true
 		})
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:${IpcEvents.RPC_DISABLE}`, () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:${IpcEvents.RPC_DISABLE}`, () => {
 			discordRpcService.disableRpc()
 			return true
 		})
 
-		ipcMain.handle(
+		metricsService.handle(
 			`${IpcChannels.DISCORD}:${IpcEvents.RPC_DISABLE_TEMPORARY}`,
 			(_, minutes: number) => {
 				discordRpcService.disableRpcTemporary(minutes)
@@ -72,7 +82,7 @@ export class DiscordRpcHandler {
 			},
 		)
 
-		ipcMain.handle(`${IpcChannels.DISCORD}:${IpcEvents.RPC_STATUS}`, () => {
+		metricsService.handle(`${IpcChannels.DISCORD}:${IpcEvents.RPC_STATUS}`, () => {
 			return discordRpcService.isRpcEnabled()
 		})
 	}
@@ -81,27 +91,35 @@ export class DiscordRpcHandler {
 	 * Start the update loop for Discord presence
 	 */
 	public startUpdateLoop(): boolean {
-		if (this.updateIntervalId !== null) {
+		if (this.unsubscribeStatus !== null) {
 			return true // Already running
 		}
 
 		try {
 			discordRpcService
 				.connect()
-				.then((connected) => {
+				.then(() => {
 					// Even if initial connection fails, we still set up the loop
 					// as reconnection logic will handle retries
-					logger.info("Starting Discord presence update loop")
+					if (this.unsubscribeStatus !== null) {
+						return
+					}
 
-					this.updatePresence(connected)
-
-					this.startFastCheckInterval()
+					logger.info("Starting Discord presence update loop")
 
-					const updateInterval =
-						Math.max(1, Math.min(15, Number(process.env.UPDATE_INTERVAL) || 10)) * 1000
-					this.updateIntervalId = setInterval(() => {
-						this.updatePresence(false)
-					}, updateInterval)
+					// The shared poller owns the VLC fetch cadence, we only react to its updates
+					const pollerWasRunning = vlcPollerService.isRunning()
+					this.presenceStale = true
+					this.unsubscribeStatus = vlcPollerService.subscribe((status, change) =>
+						this.handleStatus(status, change),
+					)
+
+					// A poller that was already running may not tick again for a while
+					if (pollerWasRunning) {
+						vlcPollerService
+							.getLatestStatus()
+							.then((status) => this.handleStatus(status, "semantic"))
+					}
 				})
 				.catch((error) => {
 					logger.error(`Initial Discord connection failed: ${error}`)
@@ -114,44 +132,15 @@ export class DiscordRpcHandler {
 		}
 	}
 
-	/**
-	 * Start a fast check interval for initial updates
-	 */
-	private startFastCheckInterval(): void {
-		if (this.fastCheckIntervalId !== null) {
-			clearInterval(this.fastCheckIntervalId)
-		}
-
-		this.fastCheckCount = 0
-		const fastCheckInterval = 1000 // 1 second
-
-		this.fastCheckIntervalId = setInterval(() => {
-			this.fastCheckCount++
-			this.updatePresence(false)
-
-			if (this.fastCheckCount >= this.maxFastChecks) {
-				if (this.fastCheckIntervalId !== null) {
-					clearInterval(this.fastCheckIntervalId)
-					this.fastCheckIntervalId = null
-				}
-			}
-		}, fastCheckInterval)
-	}
-
 	/**
 	 * Stop the update loop
 	 */
 	public stopUpdateLoop(): void {
 		logger.info("Stopping Discord presence update loop")
 
-		if (this.updateIntervalId !== null) {
-			clearInterval(this.updateIntervalId)
-			this.updateIntervalId = null
-		}
-
-		if (this.fastCheckIntervalId !== null) {
-			clearInterval(this.fastCheckIntervalId)
-			this.fastCheckIntervalId = null
+		if (this.unsubscribeStatus !== null) {
+			this.unsubscribeStatus()
+			this.unsubscribeStatus = null
 		}
 
 		discordRpcService.clear().catch((error) => {
@@ -160,25 +149,89 @@ export class DiscordRpcHandler {
 	}
 
 	/**
-	 * Update Discord presence based on current VLC status
+	 * Handle a status published by the poller, making sure presence updates
+	 * never overlap. Statuses arriving mid-update collapse into the newest one.
+	 *
+	 * @returns Whether the last update made succeeded, true when the status was
+	 * left to the update in progress
 	 */
-	private async updatePresence(forceUpdate = false): Promise<boolean> {
+	private async handleStatus(
+		vlcStatus: VlcStatus | null,
+		change: VlcStatusChange,
+	): Promise<boolean> {
+		// Marked before queueing so a collapsed status never loses a pending rebuild
+		if (change !== "none") {
+			this.presenceStale = true
+		}
+
+		if (this.presenceUpdateInProgress) {
+			this.pendingStatus = vlcStatus
+			// Keep the strongest change, a seek in a collapsed status still counts
+			if (change === "semantic" || this.pendingChange === "none") {
+				this.pendingChange = change
+			}
+			return true
+		}
+
+		this.presenceUpdateInProgress = true
 		try {
-			const vlcStatus = await vlcStatusService.readStatus(forceUpdate)
+			let updated = await this.updatePresence(vlcStatus, change)
+
+			while (this.pendingStatus !== undefined) {
+				const next = this.pendingStatus
+				const nextChange = this.pendingChange
+				this.pendingStatus = undefined
+				this.pendingChange = "none"
+				updated = await this.updatePresence(next, nextChange)
+			}
+			return updated
+		} finally {
+			this.presenceUpdateInProgress = false
+		}
+	}
 
+	/**
+	 * Update Discord presence based on the given VLC status
+	 */
+	private async updatePresence(
+		vlcStatus: VlcStatus | null,
+		change: VlcStatusChange,
+	): Promise<boolean> {
+		try {
 			if (!vlcStatus) {
+				this.presenceStale = true
 				return await discordRpcService.clear()
 			}
 
-			const presenceData = await mediaStateService.getDiscordPresence(vlcStatus)
+			// While disconnected nothing reaches Discord, so rebuild once it's back
+			if (!discordRpcService.isConnected()) {
+				this.presenceStale = true
+			}
+
+			// Discord advances the timestamps on its own, so the presence only needs
+			// rebuilding when the media, the state or the presence settings changed
+			const configKey = getPresenceConfigKey()
+			if (!this.presenceStale && configKey === this.lastPresenceConfigKey) {
+				return true
+			}
+
+			this.presenceStale = false
+			this.lastPresenceConfigKey = configKey
+
+			const presenceData = await mediaStateService.getDiscordPresence(vlcStatus, change)
 
 			if (!presenceData) {
 				return await discordRpcService.clear()
 			}
 
-			return await discordRpcService.update(presenceData)
+			const updated = await discordRpcService.update(presenceData)
+			if (!updated) {
+				this.presenceStale = true
+			}
+			return updated
 		} catch (error) {
 			logger.error(`Error updating Discord presence: ${error}`)
+			this.presenceStale = true
 			return false
 		}
 	}
@@ -1,11 +1,14 @@
 import { AppInfoHandler } from "@main/handlers/app-info-handler"
+import { DiagnosticsHandler } from "@main/handlers/diagnostics-handler"
 import { DiscordRpcHandler } from "@main/handlers/discord-rpc-handler"
 import { MediaInfoHandler } from "@main/handlers/media-info-handler"
 import { MetadataHandler } from "@main/handlers/metadata-handler"
+import { StatusStreamHandler } from "@main/handlers/status-stream-handler"
 import { UpdateHandler } from "@main/handlers/update-handler"
 import { VlcConfigHandler } from "@main/handlers/vlc-config-handler"
 import { VlcStatusHandler } from "@main/handlers/vlc-status-handler"
 import { logger } from "@main/services/logger"
+import { startupTimelineService } from "@main/services/startup-timeline"
 
 /**
  * Main handlers registry
@@ -22,17 +25,25 @@ export class MainHandlers {
 	public mediaInfoHandler: MediaInfoHandler
 	public metadataHandler: MetadataHandler
 	public updateHandler: UpdateHandler
+	public statusStreamHandler: StatusStreamHandler
+	public diagnosticsHandler: DiagnosticsHandler
 
 	private constructor() {
 		logger.info("Initializing main process handlers")
 
-		this.appInfoHandler = new AppInfoHandler()
-		this.vlcConfigHandler = new VlcConfigHandler()
-		this.vlcStatusHandler = new VlcStatusHandler()
-		this.discordRpcHandler = new DiscordRpcHandler()
-		this.mediaInfoHandler = new MediaInfoHandler()
-		this.metadataHandler = new MetadataHandler()
-		this.updateHandler = new UpdateHandler()
+		const timeline = startupTimelineService
+		this.appInfoHandler = timeline.measure("init:app-info", () => new AppInfoHandler())
+		this.vlcConfigHandler = timeline.measure("init:vlc-config", () => new VlcConfigHandler())
+		this.vlcStatusHandler = timeline.measure("init:vlc-status", () => new VlcStatusHandler())
+		this.discordRpcHandler = timeline.measure("init:discord-rpc", () => new DiscordRpcHandler())
+		this.mediaInfoHandler = timeline.measure("init:media-info", () => new MediaInfoHandler())
+		this.metadataHandler = timeline.measure("init:metadata", () => new MetadataHandler())
+		this.updateHandler = timeline.measure("init:update", () => new UpdateHandler())
+		this.statusStreamHandler = timeline.measure(
+			"init:status-stream",
+			() => new StatusStreamHandler(this.mediaInfoHandler),
+		)
+		this.diagnosticsHandler = timeline.measure("init:diagnostics", () => new DiagnosticsHandler())
 
 		logger.info("Main process handlers initialized")
 	}
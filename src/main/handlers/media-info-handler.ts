@@ -1,11 +1,11 @@
 import { IpcChannels, IpcEvents } from "@shared/types"
 import type { DetectedMediaInfo } from "@shared/types/media"
 import type { VlcStatus } from "@shared/types/vlc"
-import { ipcMain } from "electron"
 import { coverArtService } from "../services/cover-art"
 import { imageProxyService } from "../services/image-proxy"
 import { logger } from "../services/logger"
-import { vlcStatusService } from "../services/vlc-status"
+import { metricsService } from "../services/metrics"
+import { vlcPollerService } from "../services/vlc-poller"
 
 /**
  * Handler for accessing media information
@@ -22,9 +22,9 @@ export class MediaInfoHandler {
 	 * Register IPC handlers for media information
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle(`${IpcChannels.MEDIA}:get-media-info`, async () => {
+		metricsService.handle(`${IpcChannels.MEDIA}:get-media-info`, async () => {
 			try {
-				const currentStatus = await vlcStatusService.readStatus(false)
+				const currentStatus = await vlcPollerService.getLatestStatus()
 
 				if (!currentStatus || !currentStatus.active) {
 					return null
@@ -37,8 +37,12 @@ export class MediaInfoHandler {
 			}
 		})
 
-		ipcMain.handle(`${IpcChannels.IMAGE}:${IpcEvents.IMAGE_PROXY}`, async (_, url: string) => {
-			return await imageProxyService.getImageAsDataUrl(url)
+		metricsService.handle(`${IpcChannels.IMAGE}:${IpcEvents.IMAGE_PROXY}`, (_, url: string) => {
+			return imageProxyService.getArtworkUrl(url)
+		})
+
+		metricsService.handle(`${IpcChannels.IMAGE}:${IpcEvents.IMAGE_CACHE_STATS}`, () => {
+			return imageProxyService.getCacheStats()
 		})
 	}
 
@@ -54,8 +58,11 @@ export class MediaInfoHandler {
 
 		try {
 			// Use the media info directly since VLC status service already provides reliable type detection
-			const mediaInfo: VlcStatus & DetectedMediaInfo = { ...vlcStatus } as VlcStatus &
-				DetectedMediaInfo
+			// Copy media too, the status object is shared with other consumers
+			const mediaInfo: VlcStatus & DetectedMediaInfo = {
+				...vlcStatus,
+				media: { ...vlcStatus.media },
+			} as VlcStatus & DetectedMediaInfo
 
 			// For audio content, try to get cover art
 			if (vlcStatus.mediaType === "audio") {
@@ -65,18 +72,15 @@ export class MediaInfoHandler {
 				}
 			}
 
+			// Hand the renderer protocol URLs, the bytes are served from the image cache
 			if (mediaInfo.media?.artworkUrl) {
-				const dataUrl = await imageProxyService.getImageAsDataUrl(mediaInfo.media.artworkUrl)
-				if (dataUrl) {
-					mediaInfo.media.artworkUrl = dataUrl
-				}
+				mediaInfo.media.artworkUrl =
+					imageProxyService.getArtworkUrl(mediaInfo.media.artworkUrl) ?? undefined
 			}
 
 			if (mediaInfo.content_image_url) {
-				const dataUrl = await imageProxyService.getImageAsDataUrl(mediaInfo.content_image_url)
-				if (dataUrl) {
-					mediaInfo.content_image_url = dataUrl
-				}
+				mediaInfo.content_image_url =
+					imageProxyService.getArtworkUrl(mediaInfo.content_image_url) ?? undefined
 			}
 
 			// Cache the media info for future use
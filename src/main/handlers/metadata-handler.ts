@@ -1,8 +1,9 @@
+import { artworkCacheService } from "@main/services/artwork-cache"
 import { configService } from "@main/services/config"
 import { logger } from "@main/services/logger"
 import { metadataWriterService } from "@main/services/metadata-writer"
+import { metricsService } from "@main/services/metrics"
 import { IpcChannels, IpcEvents } from "@shared/types"
-import { ipcMain } from "electron"
 
 /**
  * Metadata handler for IPC communication
@@ -18,12 +19,15 @@ export class MetadataHandler {
 	 */
 	private registerHandlers(): void {
 		// Clear all metadata cache
-		ipcMain.handle(`${IpcChannels.METADATA}:${IpcEvents.METADATA_CLEAR_CACHE}`, async () => {
+		metricsService.handle(`${IpcChannels.METADATA}:${IpcEvents.METADATA_CLEAR_CACHE}`, async () => {
 			try {
-				const stats = metadataWriterService.getMetadataStats()
+				const stats = await metadataWriterService.getMetadataStats()
 
-				// Clear all metadata from config
-				configService.set("fileMetadata", {})
+				// Clear all metadata and the uploads shared between files
+				await metadataWriterService.clearAllMetadata()
+				configService.set("artworkUploads", {})
+				// Cached lookups would keep pointing at the cleared uploads
+				await artworkCacheService.clear()
 
 				logger.info(`Cleared metadata cache: ${stats.totalFiles} files removed`)
 				return {
@@ -42,13 +46,9 @@ export class MetadataHandler {
 		})
 
 		// Get metadata statistics
-		ipcMain.handle(`${IpcChannels.METADATA}:${IpcEvents.METADATA_GET_STATS}`, async () => {
+		metricsService.handle(`${IpcChannels.METADATA}:${IpcEvents.METADATA_GET_STATS}`, async () => {
 			try {
-				const stats = metadataWriterService.getMetadataStats()
-				const allMetadata = metadataWriterService.getAllMetadata()
-
-				// Calculate cache size estimate (rough)
-				const cacheSize = JSON.stringify(allMetadata).length
+				const { sizeBytes: cacheSize, ...stats } = await metadataWriterService.getMetadataStats()
 				const cacheSizeKB = Math.round(cacheSize / 1024)
 
 				logger.info(
@@ -77,24 +77,27 @@ export class MetadataHandler {
 		})
 
 		// Clean up expired metadata only
-		ipcMain.handle(`${IpcChannels.MEDIA}:${IpcEvents.METADATA_CLEANUP_EXPIRED}`, async () => {
-			try {
-				const cleanedCount = await metadataWriterService.cleanupExpiredMetadata()
+		metricsService.handle(
+			`${IpcChannels.MEDIA}:${IpcEvents.METADATA_CLEANUP_EXPIRED}`,
+			async () => {
+				try {
+					const cleanedCount = await metadataWriterService.cleanupExpiredMetadata()
 
-				logger.info(`Cleaned up ${cleanedCount} expired metadata entries`)
-				return {
-					success: true,
-					message: `Cleaned up ${cleanedCount} expired entries`,
-					filesRemoved: cleanedCount,
+					logger.info(`Cleaned up ${cleanedCount} expired metadata entries`)
+					return {
+						success: true,
+						message: `Cleaned up ${cleanedCount} expired entries`,
+						filesRemoved: cleanedCount,
+					}
+				} catch (error) {
+					logger.error(`Error cleaning up expired metadata: ${error}`)
+					return {
+						success: false,
+						message: `Error cleaning up expired entries: ${error}`,
+						filesRemoved: 0,
+					}
 				}
-			} catch (error) {
-				logger.error(`Error cleaning up expired metadata: ${error}`)
-				return {
-					success: false,
-					message: `Error cleaning up expired entries: ${error}`,
-					filesRemoved: 0,
-				}
-			}
-		})
+			},
+		)
 	}
 }
@@ -0,0 +1,147 @@
+import type { MediaInfoHandler } from "@main/handlers/media-info-handler"
+import { discordRpcService } from "@main/services/discord-rpc"
+import { logger } from "@main/services/logger"
+import { vlcPollerService } from "@main/services/vlc-poller"
+import { IpcChannels, IpcEvents } from "@shared/types"
+import type { VlcStatus } from "@shared/types/vlc"
+import type { BrowserWindow } from "electron"
+
+/**
+ * Handler that pushes VLC status, media info and Discord status to the renderer
+ *
+ * Values are only sent when they change, and the stream is paused entirely
+ * while the main window is hidden to the tray.
+ */
+export class StatusStreamHandler {
+	private mainWindow: BrowserWindow | null = null
+	private unsubscribeStatus: (() => void) | null = null
+	private lastStatusKey: string | null = null
+	private lastMediaKey: string | null = null
+	private lastDiscordConnected: boolean | null = null
+
+	constructor(private readonly mediaInfoHandler: MediaInfoHandler) {}
+
+	/**
+	 * Attach the main window the stream should publish to
+	 */
+	public attachWindow(window: BrowserWindow): void {
+		this.mainWindow = window
+
+		window.on("show", () => this.resume())
+		window.on("hide", () => this.pause())
+		window.on("closed", () => {
+			this.pause()
+			this.mainWindow = null
+		})
+
+		// A reload wipes the renderer state, so resend everything on the next tick
+		window.webContents.on("did-finish-load", () => this.resetLastSent())
+
+		if (window.isVisible()) {
+			this.resume()
+		}
+
+		logger.info("Status stream attached to main window")
+	}
+
+	/**
+	 * Start streaming updates to the renderer
+	 */
+	private resume(): void {
+		if (this.unsubscribeStatus !== null) {
+			return
+		}
+
+		this.resetLastSent()
+		this.unsubscribeStatus = vlcPollerService.subscribe((status) => this.publish(status))
+		vlcPollerService.getLatestStatus().then((status) => this.publish(status))
+		logger.info("Status stream resumed")
+	}
+
+	/**
+	 * Stop streaming updates while the window is not visible
+	 */
+	private pause(): void {
+		if (this.unsubscribeStatus === null) {
+			return
+		}
+
+		this.unsubscribeStatus()
+		this.unsubscribeStatus = null
+		logger.info("Status stream paused")
+	}
+
+	/**
+	 * Forget what was last sent so the next publish emits every channel
+	 */
+	private resetLastSent(): void {
+		this.lastStatusKey = null
+		this.lastMediaKey = null
+		this.lastDiscordConnected = null
+	}
+
+	/**
+	 * Publish a status to the renderer, skipping channels whose value is unchanged
+	 */
+	private async publish(status: VlcStatus | null): Promise<void> {
+		if (this.unsubscribeStatus === null) {
+			return
+		}
+
+		// The timestamp moves every read, so it must not count as a change
+		const statusKey = status ? JSON.stringify({ ...status, timestamp: 0 }) : "null"
+		if (statusKey !== this.lastStatusKey) {
+			this.lastStatusKey = statusKey
+			this.send(`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_UPDATE}`, status)
+		}
+
+		const discordConnected = discordRpcService.isConnected()
+		if (discordConnected !== this.lastDiscordConnected) {
+			this.lastDiscordConnected = discordConnected
+			this.send(`${IpcChannels.DISCORD}:${IpcEvents.DISCORD_STATUS_UPDATE}`, discordConnected)
+		}
+
+		// Media info involves cover art and image work, so only rebuild it when the media changes
+		const mediaKey = this.getMediaKey(status)
+		if (mediaKey !== this.lastMediaKey) {
+			this.lastMediaKey = mediaKey
+			try {
+				const mediaInfo =
+					status?.active === true ? await this.mediaInfoHandler.getMediaInfo(status) : null
+				// A newer track may have been published while this one was looked up
+				if (mediaKey === this.lastMediaKey) {
+					this.send(`${IpcChannels.MEDIA}:${IpcEvents.MEDIA_INFO_UPDATE}`, mediaInfo)
+				}
+			} catch (error) {
+				logger.error(`Error publishing media info: ${error}`)
+				// Let the next status try this media again
+				if (mediaKey === this.lastMediaKey) {
+					this.lastMediaKey = null
+				}
+			}
+		}
+	}
+
+	/**
+	 * Build a key identifying the media shown in the renderer
+	 */
+	private getMediaKey(status: VlcStatus | null): string {
+		if (!status || !status.active) {
+			return "inactive"
+		}
+
+		const { media, mediaType } = status
+		return JSON.stringify([mediaType, media.title, media.artist, media.album, media.artworkUrl])
+	}
+
+	/**
+	 * Send a message to the renderer if the window is still alive
+	 */
+	private send(channel: string, payload: unknown): void {
+		if (!this.mainWindow || this.mainWindow.isDestroyed()) {
+			return
+		}
+
+		this.mainWindow.webContents.send(channel, payload)
+	}
+}
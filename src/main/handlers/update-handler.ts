@@ -1,51 +1,87 @@
-import { autoUpdaterService } from "@main/services/auto-updater"
+import type { AutoUpdaterService } from "@main/services/auto-updater"
 import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
+import { startupTimelineService } from "@main/services/startup-timeline"
 import { IpcChannels } from "@shared/types"
-import { ipcMain } from "electron"
+import type { BrowserWindow } from "electron"
 
 /**
  * Handler for application update operations
+ *
+ * The auto-updater service is only loaded on the first update action, so
+ * it stays off the path to the first window.
  */
 export class UpdateHandler {
+	private autoUpdater: Promise<AutoUpdaterService> | null = null
+
 	constructor() {
 		this.registerIpcHandlers()
 	}
 
+	/**
+	 * Give the auto-updater the window its notifications go to
+	 */
+	public attachWindow(window: BrowserWindow): void {
+		this.getAutoUpdater().then((autoUpdater) => autoUpdater.setMainWindow(window))
+	}
+
+	/**
+	 * Check for updates, loading the auto-updater if it isn't yet
+	 */
+	public async checkForUpdates(silent: boolean): Promise<void> {
+		const autoUpdater = await this.getAutoUpdater()
+		await autoUpdater.checkForUpdates(silent)
+	}
+
+	private getAutoUpdater(): Promise<AutoUpdaterService> {
+		if (!this.autoUpdater) {
+			this.autoUpdater = startupTimelineService
+				.measureAsync("import:auto-updater", () => import("@main/services/auto-updater"))
+				.then(({ autoUpdaterService }) => autoUpdaterService)
+		}
+		return this.autoUpdater
+	}
+
 	/**
 	 * Register IPC handlers for update operations
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle(`${IpcChannels.UPDATE}:check`, async (_, silent = true) => {
+		metricsService.handle(`${IpcChannels.UPDATE}:check`, async (_, silent = true) => {
 			logger.info(`Requested update check (silent: ${silent})`)
-			await autoUpdaterService.checkForUpdates(silent)
+			await this.checkForUpdates(silent)
 			return true
 		})
 
-		ipcMain.handle(`${IpcChannels.UPDATE}:download`, async () => {
+		metricsService.handle(`${IpcChannels.UPDATE}:download`, async () => {
 			logger.info("Requested update download")
-			autoUpdaterService.downloadUpdate()
+			const autoUpdater = await this.getAutoUpdater()
+			autoUpdater.downloadUpdate()
 			return true
 		})
 
-		ipcMain.handle(`${IpcChannels.UPDATE}:force-check`, async () => {
+		metricsService.handle(`${IpcChannels.UPDATE}:force-check`, async () => {
 			logger.info("Requested force update check")
-			await autoUpdaterService.forceCheckForUpdates()
+			const autoUpdater = await this.getAutoUpdater()
+			await autoUpdater.forceCheckForUpdates()
 			return true
 		})
 
-		ipcMain.handle(`${IpcChannels.UPDATE}:status`, async () => {
+		metricsService.handle(`${IpcChannels.UPDATE}:status`, async () => {
 			logger.info("Requested update status")
-			return autoUpdaterService.getUpdateStatus()
+			const autoUpdater = await this.getAutoUpdater()
+			return autoUpdater.getUpdateStatus()
 		})
 
-		ipcMain.handle(`${IpcChannels.UPDATE}:installation-type`, async () => {
+		metricsService.handle(`${IpcChannels.UPDATE}:installation-type`, async () => {
 			logger.info("Requested installation type")
-			return autoUpdaterService.getInstallationType()
+			const autoUpdater = await this.getAutoUpdater()
+			return autoUpdater.getInstallationType()
 		})
 
-		ipcMain.handle(`${IpcChannels.UPDATE}:open-cache-folder`, async () => {
+		metricsService.handle(`${IpcChannels.UPDATE}:open-cache-folder`, async () => {
 			logger.info("Requested to open update cache folder")
-			await autoUpdaterService.openCacheFolder()
+			const autoUpdater = await this.getAutoUpdater()
+			await autoUpdater.openCacheFolder()
 			return true
 		})
 	}
@@ -3,10 +3,10 @@ import * as os from "node:os"
 import * as path from "node:path"
 import { configService } from "@main/services/config"
 import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
 import { vlcStatusService } from "@main/services/vlc-status"
 import { VLC_CONFIG_PATHS } from "@shared/constants"
 import { IpcChannels, IpcEvents, type VlcConfig } from "@shared/types"
-import { ipcMain } from "electron"
 
 /**
  * Handler for VLC configuration operations
@@ -46,11 +46,11 @@ export class VlcConfigHandler {
 	 * Register IPC handlers for VLC config operations
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle(`${IpcChannels.VLC}:${IpcEvents.VLC_CONFIG_GET}`, async () => {
+		metricsService.handle(`${IpcChannels.VLC}:${IpcEvents.VLC_CONFIG_GET}`, async () => {
 			return await this.getVlcConfig()
 		})
 
-		ipcMain.handle(
+		metricsService.handle(
 			`${IpcChannels.VLC}:${IpcEvents.VLC_CONFIG_SET}`,
 			async (_, config: VlcConfig) => {
 				return await this.setupVlcConfig(config)
@@ -1,7 +1,8 @@
 import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
+import { vlcPollerService } from "@main/services/vlc-poller"
 import { vlcStatusService } from "@main/services/vlc-status"
 import { IpcChannels, IpcEvents } from "@shared/types"
-import { ipcMain } from "electron"
 
 /**
  * Handler for VLC status operations
@@ -15,18 +16,27 @@ export class VlcStatusHandler {
 	 * Register IPC handlers for VLC status operations
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle(
+		metricsService.handle(
 			`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_GET}`,
 			async (_, forceUpdate = false) => {
-				logger.info(`Reading VLC status (forceUpdate: ${forceUpdate})`) // Changed to debug
-				return await vlcStatusService.readStatus(forceUpdate)
+				logger.debug(() => `Reading VLC status (forceUpdate: ${forceUpdate})`)
+				// Served from the shared poller so renderer requests don't add VLC traffic
+				return await vlcPollerService.getLatestStatus()
 			},
 		)
 
-		ipcMain.handle(`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_CHECK}`, async () => {
-			logger.info("Checking VLC connection status") // Changed to debug
+		metricsService.handle(`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_CHECK}`, async () => {
+			logger.debug("Checking VLC connection status")
 			return await vlcStatusService.checkVlcStatus()
 		})
+
+		metricsService.handle(`${IpcChannels.VLC}:${IpcEvents.VLC_POLL_CADENCE}`, () => {
+			return vlcPollerService.getCadence()
+		})
+
+		metricsService.handle(`${IpcChannels.VLC}:${IpcEvents.VLC_HTTP_STATS}`, () => {
+			return vlcStatusService.getHttpStats()
+		})
 	}
 
 	/**
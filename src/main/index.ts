@@ -1,13 +1,20 @@
 import { electronApp, optimizer } from "@electron-toolkit/utils"
 import { app } from "electron"
 import { mainHandlers } from "./handlers"
-import { autoUpdaterService } from "./services/auto-updater"
 import { configService } from "./services/config"
+import { ImageProxyService, imageProxyService } from "./services/image-proxy"
 import { logger } from "./services/logger"
 import { startupService } from "./services/startup"
+import { startupTimelineService } from "./services/startup-timeline"
 import { trayService } from "./services/tray"
+import { videoAnalyzerService } from "./services/video-analyzer"
 import { windowService } from "./services/window"
 
+/** Delay after the first page load before warming up heavy modules */
+const WARM_UP_DELAY = 1000
+
+startupTimelineService.mark("main-module-loaded")
+
 // Add isQuitting property and wasLaunchedAtStartup property to app
 declare global {
 	namespace Electron {
@@ -35,6 +42,9 @@ if (!gotTheLock) {
 		launchArgs.includes("--launch-at-login") ||
 		launchArgs.includes("--autorun")
 
+	// Custom schemes have to be declared before the app is ready
+	ImageProxyService.registerScheme()
+
 	app.on("second-instance", () => {
 		logger.info("Another instance tried to launch, focusing our window instead")
 		windowService.showWindow()
@@ -48,6 +58,7 @@ if (!gotTheLock) {
 	})
 
 	app.whenReady().then(() => {
+		startupTimelineService.mark("app-ready")
 		logger.info("Application starting", {
 			version: app.getVersion(),
 			platform: process.platform,
@@ -67,16 +78,34 @@ if (!gotTheLock) {
 		logger.info(`Set app version in config: ${app.getVersion()}`)
 
 		mainHandlers
+		imageProxyService.registerProtocol()
+		startupTimelineService.mark("handlers-ready")
 
 		// Initialize tray service before window service
-		trayService
+		trayService.whenReady().then(() => startupTimelineService.mark("tray-ready"))
 
 		// Initialize window service
 		const mainWindowPromise = windowService.createWindow()
 
-		// Initialize auto-updater service after window is created
+		// Hook up the auto-updater after window is created, loading it then
 		mainWindowPromise.then((mainWindow) => {
-			autoUpdaterService.setMainWindow(mainWindow)
+			startupTimelineService.mark("window-created")
+			mainHandlers.updateHandler.attachWindow(mainWindow)
+			mainHandlers.statusStreamHandler.attachWindow(mainWindow)
+
+			// Warm up heavy modules once the first paint is out of the way
+			const warmUp = () => {
+				startupTimelineService.mark("first-load")
+				startupTimelineService.report()
+				setTimeout(() => {
+					videoAnalyzerService.init()
+				}, WARM_UP_DELAY)
+			}
+			if (mainWindow.webContents.isLoading()) {
+				mainWindow.webContents.once("did-finish-load", warmUp)
+			} else {
+				warmUp()
+			}
 		})
 
 		const startWithSystem = configService.get<boolean>("startWithSystem")
@@ -85,7 +114,9 @@ if (!gotTheLock) {
 		mainHandlers.discordRpcHandler.startUpdateLoop()
 
 		setTimeout(() => {
-			autoUpdaterService.checkForUpdates(true)
+			mainHandlers.updateHandler.checkForUpdates(true).catch((error) => {
+				logger.error(`Startup update check failed: ${error}`)
+			})
 		}, 3000)
 
 		app.on("activate", () => {
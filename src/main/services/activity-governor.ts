@@ -0,0 +1,157 @@
+import type { ActivityUpdateStats } from "@shared/types/media"
+import type { SetActivity } from "@xhayper/discord-rpc"
+import { logger } from "./logger"
+
+/** Updates Discord accepts per window */
+const RATE_LIMIT_CAPACITY = 5
+/** Discord's SET_ACTIVITY rate limit window */
+const RATE_LIMIT_WINDOW = 20000
+/** Timestamp drift below this is rounding noise from the VLC time, not a seek */
+const TIMESTAMP_TOLERANCE = 2000
+
+/**
+ * Outcome of submitting an activity to the governor
+ */
+export type ActivitySubmitResult = "sent" | "skipped" | "throttled"
+
+/**
+ * Sits between presence updates and `setActivity`
+ *
+ * Identical activities are skipped, and bursts are coalesced with a token
+ * bucket matching Discord's limit (5 updates per 20s). When throttled, the
+ * newest activity is kept and sent as soon as a token is available.
+ */
+export class ActivityGovernor {
+	private tokens: number
+	private lastRefill = Date.now()
+	private lastSent: SetActivity | null = null
+	private pending: SetActivity | null = null
+	private flushTimer: NodeJS.Timeout | null = null
+	private stats: ActivityUpdateStats = { sent: 0, skipped: 0, throttled: 0 }
+
+	constructor(
+		private readonly send: (activity: SetActivity) => Promise<void>,
+		private readonly capacity = RATE_LIMIT_CAPACITY,
+		private readonly windowMs = RATE_LIMIT_WINDOW,
+	) {
+		this.tokens = capacity
+	}
+
+	/**
+	 * Submit an activity, sending it now, skipping it or deferring it
+	 */
+	public async submit(activity: SetActivity): Promise<ActivitySubmitResult> {
+		if (this.lastSent && this.isSameActivity(activity, this.lastSent)) {
+			// A newer identical state supersedes anything still queued
+			this.pending = null
+			this.stats.skipped++
+			return "skipped"
+		}
+
+		this.refill()
+
+		if (this.tokens < 1 || this.flushTimer !== null) {
+			this.pending = activity
+			this.stats.throttled++
+			this.scheduleFlush()
+			return "throttled"
+		}
+
+		await this.dispatch(activity)
+		return "sent"
+	}
+
+	/**
+	 * Forget the last sent activity and drop anything queued, e.g. after
+	 * the presence was cleared or the connection was lost
+	 */
+	public reset(): void {
+		this.lastSent = null
+		this.pending = null
+		if (this.flushTimer !== null) {
+			clearTimeout(this.flushTimer)
+			this.flushTimer = null
+		}
+	}
+
+	/**
+	 * Get update counters
+	 */
+	public getStats(): ActivityUpdateStats {
+		return { ...this.stats }
+	}
+
+	/**
+	 * Send an activity, consuming a token
+	 */
+	private async dispatch(activity: SetActivity): Promise<void> {
+		this.tokens--
+		await this.send(activity)
+		this.lastSent = activity
+		this.stats.sent++
+	}
+
+	/**
+	 * Add the tokens earned since the last refill
+	 */
+	private refill(): void {
+		const now = Date.now()
+		const earned = ((now - this.lastRefill) / this.windowMs) * this.capacity
+		this.tokens = Math.min(this.capacity, this.tokens + earned)
+		this.lastRefill = now
+	}
+
+	/**
+	 * Send the newest queued activity once a token is available
+	 */
+	private scheduleFlush(): void {
+		if (this.flushTimer !== null) {
+			return
+		}
+
+		const msPerToken = this.windowMs / this.capacity
+		const delay = Math.max(0, Math.ceil((1 - this.tokens) * msPerToken))
+
+		this.flushTimer = setTimeout(async () => {
+			this.flushTimer = null
+			const activity = this.pending
+			this.pending = null
+
+			if (!activity || (this.lastSent && this.isSameActivity(activity, this.lastSent))) {
+				return
+			}
+
+			this.refill()
+			try {
+				await this.dispatch(activity)
+				logger.debug("Sent throttled Discord activity update")
+			} catch (error) {
+				logger.error(`Error sending throttled Discord activity: ${error}`)
+			}
+		}, delay)
+	}
+
+	/**
+	 * Compare two activities, tolerating small timestamp drift
+	 */
+	private isSameActivity(a: SetActivity, b: SetActivity): boolean {
+		const { startTimestamp: aStart, endTimestamp: aEnd, ...aRest } = a
+		const { startTimestamp: bStart, endTimestamp: bEnd, ...bRest } = b
+
+		return (
+			this.isSameTimestamp(aStart, bStart) &&
+			this.isSameTimestamp(aEnd, bEnd) &&
+			JSON.stringify(aRest) === JSON.stringify(bRest)
+		)
+	}
+
+	private isSameTimestamp(
+		a: SetActivity["startTimestamp"],
+		b: SetActivity["startTimestamp"],
+	): boolean {
+		if (a === undefined || b === undefined) {
+			return a === b
+		}
+		return Math.abs(Number(a) - Number(b)) < TIMESTAMP_TOLERANCE
+	}
+}
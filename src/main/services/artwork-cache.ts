@@ -0,0 +1,196 @@
+import { promises as fs } from "node:fs"
+import { join } from "node:path"
+import { configService } from "@main/services/config"
+import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
+import { DEFAULT_CONFIG } from "@shared/constants"
+import type { ArtworkCacheConfig } from "@shared/types"
+import { app } from "electron"
+
+/** Delay before cache changes are written to disk */
+const PERSIST_DELAY = 2000
+
+/**
+ * Outcome of an artwork lookup
+ */
+export interface ArtworkResolution {
+	url: string | null
+	/** The lookup failed for a reason that may pass (an upload error), so it isn't cached */
+	transient?: boolean
+}
+
+interface ArtworkCacheEntry {
+	/** Resolved artwork URL, null when nothing was found */
+	url: string | null
+	expiresAt: number
+}
+
+/**
+ * Cache of resolved cover art URLs keyed by media identity
+ *
+ * Keeps an LRU-bounded in-memory map that is mirrored to a JSON file under
+ * `userData`, so artwork survives restarts. "Nothing found" results are
+ * cached for a shorter time, transient failures not at all, and concurrent
+ * lookups for the same media share a single resolution.
+ */
+export class ArtworkCacheService {
+	private static instance: ArtworkCacheService | null = null
+	// Map iteration order doubles as the LRU order, oldest first
+	private entries: Map<string, ArtworkCacheEntry> = new Map()
+	private inFlight: Map<string, Promise<string | null>> = new Map()
+	private loadPromise: Promise<void> | null = null
+	private persistTimer: NodeJS.Timeout | null = null
+	private readonly filePath: string
+
+	private constructor() {
+		this.filePath = join(app.getPath("userData"), "artwork-cache.json")
+		logger.info("Artwork cache service initialized")
+	}
+
+	/**
+	 * Get the singleton instance of the artwork cache service
+	 */
+	public static getInstance(): ArtworkCacheService {
+		if (!ArtworkCacheService.instance) {
+			ArtworkCacheService.instance = new ArtworkCacheService()
+		}
+		return ArtworkCacheService.instance
+	}
+
+	/**
+	 * Return the cached artwork for a media key, resolving and caching it on a miss
+	 *
+	 * @param key - Stable media identity (file URI, tags or parsed title)
+	 * @param resolve - Lookup to run when nothing valid is cached
+	 */
+	public async getOrResolve(
+		key: string,
+		resolve: () => Promise<ArtworkResolution>,
+	): Promise<string | null> {
+		await this.load()
+
+		const cached = this.entries.get(key)
+		if (cached && cached.expiresAt > Date.now()) {
+			// Refresh the LRU position
+			this.entries.delete(key)
+			this.entries.set(key, cached)
+			metricsService.increment("artwork_cache.hits")
+			return cached.url
+		}
+
+		metricsService.increment("artwork_cache.misses")
+
+		const pending = this.inFlight.get(key)
+		if (pending) {
+			return pending
+		}
+
+		const lookup = resolve()
+			.then(({ url, transient }) => {
+				if (!transient) {
+					this.set(key, url)
+				}
+				return url
+			})
+			.finally(() => {
+				this.inFlight.delete(key)
+			})
+
+		this.inFlight.set(key, lookup)
+		return lookup
+	}
+
+	/**
+	 * Drop every cached lookup
+	 */
+	public async clear(): Promise<void> {
+		// A load finishing later would bring the entries back
+		await this.load()
+		this.entries.clear()
+		this.schedulePersist()
+		logger.info("Artwork cache cleared")
+	}
+
+	/**
+	 * Store a lookup result with the TTL matching its outcome
+	 */
+	private set(key: string, url: string | null): void {
+		const config = this.getConfig()
+		const ttl = url ? config.ttlHours * 3600 * 1000 : config.negativeTtlMinutes * 60 * 1000
+
+		this.entries.delete(key)
+		this.entries.set(key, { url, expiresAt: Date.now() + ttl })
+
+		while (this.entries.size > config.maxEntries) {
+			const oldest = this.entries.keys().next().value
+			if (oldest === undefined) break
+			this.entries.delete(oldest)
+		}
+
+		this.schedulePersist()
+	}
+
+	private getConfig(): ArtworkCacheConfig {
+		return {
+			...DEFAULT_CONFIG.artworkCache,
+			...configService.get<ArtworkCacheConfig>("artworkCache"),
+		}
+	}
+
+	/**
+	 * Load the on-disk cache once, skipping expired entries
+	 */
+	private load(): Promise<void> {
+		if (!this.loadPromise) {
+			this.loadPromise = (async () => {
+				try {
+					const content = await fs.readFile(this.filePath, "utf-8")
+					const stored: Array<[string, ArtworkCacheEntry]> = JSON.parse(content)
+					const now = Date.now()
+
+					for (const [key, entry] of stored) {
+						if (entry.expiresAt > now && !this.entries.has(key)) {
+							this.entries.set(key, entry)
+						}
+					}
+
+					logger.info(`Loaded ${this.entries.size} cached artwork lookups`)
+				} catch (error) {
+					const err = error as { code?: string }
+					if (err.code !== "ENOENT") {
+						logger.warn(`Could not load artwork cache: ${error}`)
+					}
+				}
+			})()
+		}
+
+		return this.loadPromise
+	}
+
+	/**
+	 * Write the cache to disk shortly after the last change
+	 */
+	private schedulePersist(): void {
+		if (this.persistTimer) {
+			return
+		}
+
+		this.persistTimer = setTimeout(() => {
+			this.persistTimer = null
+			this.persist().catch((error) => {
+				logger.warn(`Could not save artwork cache: ${error}`)
+			})
+		}, PERSIST_DELAY)
+	}
+
+	/**
+	 * Atomically replace the on-disk cache
+	 */
+	private async persist(): Promise<void> {
+		const tempPath = `${this.filePath}.tmp`
+		await fs.writeFile(tempPath, JSON.stringify([...this.entries]), "utf-8")
+		await fs.rename(tempPath, this.filePath)
+	}
+}
+
+export const artworkCacheService = ArtworkCacheService.getInstance()
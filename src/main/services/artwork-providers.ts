@@ -0,0 +1,276 @@
+import { promises as fs } from "node:fs"
+import { basename, dirname, extname, join } from "node:path"
+import { GoogleImageExtractor } from "@main/services/google-image-extractor"
+import { logger } from "@main/services/logger"
+import { metadataWriterService } from "@main/services/metadata-writer"
+import { multiImageUploaderService } from "@main/services/multi-image-uploader"
+import { nativeImage } from "electron"
+
+/** Media data structure for cover art searching */
+export interface MediaData {
+	title?: string
+	artist?: string
+	album?: string
+	artworkUrl?: string
+	date?: string
+	year?: string
+	[key: string]: string | undefined
+}
+
+/**
+ * What a lookup knows about the playing media
+ */
+export interface ArtworkLookup {
+	mediaType: "audio" | "video"
+	media: MediaData
+	filePath: string | null
+	/** Web search query, null when the media shouldn't be searched for */
+	searchTerm: string | null
+}
+
+/**
+ * Artwork offered by a provider
+ *
+ * Remote candidates carry a URL Discord can show as is, local ones carry
+ * the image bytes, which are only uploaded if the candidate is picked.
+ */
+export interface ArtworkCandidate {
+	provider: string
+	/** How much the source is trusted to have the right image, 0 to 1 */
+	trust: number
+	url?: string
+	image?: Buffer
+	/** Pixel size, unknown for remote images */
+	width?: number
+	height?: number
+	/** When an uploaded image stops being served, if known */
+	expiresAt?: number
+}
+
+/**
+ * A source of artwork for the playing media
+ */
+export interface ArtworkProvider {
+	readonly name: string
+	supports(lookup: ArtworkLookup): boolean
+	/**
+	 * @param signal - Aborted when the lookup deadline passes
+	 */
+	find(lookup: ArtworkLookup, signal: AbortSignal): Promise<ArtworkCandidate | null>
+}
+
+/** Images this size or larger get the full resolution score */
+const FULL_RESOLUTION = 512
+
+/**
+ * Score a candidate between 0 and 1 by source trust, resolution, and how
+ * close it is to the expected shape, square covers for audio and portrait
+ * posters for video. Unknown sizes score halfway.
+ */
+export function scoreCandidate(candidate: ArtworkCandidate, lookup: ArtworkLookup): number {
+	const { width, height } = candidate
+	let resolution = 0.5
+	let aspect = 0.5
+
+	if (width && height) {
+		resolution = Math.min(1, Math.min(width, height) / FULL_RESOLUTION)
+		const target = lookup.mediaType === "audio" ? 1 : 2 / 3
+		aspect = Math.max(0, 1 - Math.abs(Math.log(width / height / target)) / Math.LN2)
+	}
+
+	return candidate.trust * 0.6 + resolution * 0.25 + aspect * 0.15
+}
+
+/**
+ * Build a local candidate, dropping bytes that aren't a decodable image
+ */
+function localCandidate(provider: string, trust: number, image: Buffer): ArtworkCandidate | null {
+	const { width, height } = nativeImage.createFromBuffer(image).getSize()
+	if (width === 0 || height === 0) {
+		return null
+	}
+	return { provider, trust, image, width, height }
+}
+
+/**
+ * Artwork VLC extracted from the file, or found next to it
+ */
+export class EmbeddedArtworkProvider implements ArtworkProvider {
+	public readonly name = "embedded"
+
+	public supports(lookup: ArtworkLookup): boolean {
+		return lookup.media.artworkUrl?.startsWith("file://") ?? false
+	}
+
+	public async find(lookup: ArtworkLookup): Promise<ArtworkCandidate | null> {
+		const decodedPath = decodeURIComponent((lookup.media.artworkUrl ?? "").replace("file://", ""))
+
+		// Handle Windows paths
+		const fixedPath =
+			process.platform === "win32" && decodedPath.startsWith("/")
+				? decodedPath.substring(1)
+				: decodedPath
+
+		return localCandidate(this.name, 1, await fs.readFile(fixedPath))
+	}
+}
+
+/**
+ * Cover images saved alongside the media file, like `folder.jpg`
+ */
+export class SidecarArtworkProvider implements ArtworkProvider {
+	public readonly name = "sidecar"
+	private static readonly AUDIO_NAMES = ["cover", "folder", "front", "album", "albumart"]
+	private static readonly VIDEO_NAMES = ["poster", "folder", "cover"]
+	private static readonly EXTENSIONS = [".jpg", ".jpeg", ".png"]
+
+	public supports(lookup: ArtworkLookup): boolean {
+		return lookup.filePath !== null
+	}
+
+	public async find(lookup: ArtworkLookup): Promise<ArtworkCandidate | null> {
+		const filePath = lookup.filePath as string
+		const directory = dirname(filePath)
+		const stem = basename(filePath, extname(filePath)).toLowerCase()
+
+		// Image named after the file first, then the usual folder-wide names
+		const names =
+			lookup.mediaType === "audio"
+				? SidecarArtworkProvider.AUDIO_NAMES
+				: [`${stem}-poster`, stem, ...SidecarArtworkProvider.VIDEO_NAMES]
+
+		// One directory listing instead of a stat per name, and case-insensitive
+		const images = new Map<string, string>()
+		for (const entry of await fs.readdir(directory)) {
+			const extension = extname(entry).toLowerCase()
+			if (SidecarArtworkProvider.EXTENSIONS.includes(extension)) {
+				const name = basename(entry, extname(entry)).toLowerCase()
+				if (!images.has(name)) {
+					images.set(name, entry)
+				}
+			}
+		}
+
+		for (const name of names) {
+			const entry = images.get(name)
+			if (entry) {
+				const candidate = localCandidate(
+					this.name,
+					0.9,
+					await fs.readFile(join(directory, entry)),
+				)
+				if (candidate) {
+					return candidate
+				}
+			}
+		}
+		return null
+	}
+}
+
+/**
+ * Artwork uploaded for the file earlier and recorded in its metadata
+ */
+export class StoredUploadProvider implements ArtworkProvider {
+	public readonly name = "stored"
+
+	public supports(lookup: ArtworkLookup): boolean {
+		return lookup.filePath !== null
+	}
+
+	public async find(lookup: ArtworkLookup): Promise<ArtworkCandidate | null> {
+		const customMetadata = await metadataWriterService.readMetadataTags(
+			lookup.filePath as string,
+		)
+		if (!customMetadata) {
+			return null
+		}
+
+		const parsed = multiImageUploaderService.parseMetadataTags(customMetadata)
+		if (!parsed.imageUrl || parsed.isExpired) {
+			if (parsed.isExpired) {
+				logger.info("Existing uploaded cover image has expired")
+			}
+			return null
+		}
+
+		return {
+			provider: this.name,
+			trust: 0.8,
+			url: parsed.imageUrl,
+			expiresAt: parsed.expiresAt ?? undefined,
+		}
+	}
+}
+
+/**
+ * First usable result of a Google Images search
+ */
+export class WebSearchProvider implements ArtworkProvider {
+	public readonly name = "web"
+
+	public supports(lookup: ArtworkLookup): boolean {
+		return lookup.searchTerm !== null
+	}
+
+	public async find(lookup: ArtworkLookup, signal: AbortSignal): Promise<ArtworkCandidate | null> {
+		const url = await this.fetchImageFromGoogle(lookup.searchTerm as string, signal)
+		return url ? { provider: this.name, trust: 0.4, url } : null
+	}
+
+	/**
+	 * Fetch image from Google Images based on search term
+	 *
+	 * The results page is scanned as it downloads and the download is
+	 * cancelled as soon as a usable image shows up.
+	 */
+	private async fetchImageFromGoogle(
+		searchTerm: string,
+		signal: AbortSignal,
+	): Promise<string | null> {
+		logger.info(`Searching for image: ${searchTerm}`)
+		const encodedQuery = encodeURIComponent(searchTerm)
+		const searchUrl = `https://www.google.com/search?q=${encodedQuery}&tbm=isch`
+
+		const response = await fetch(searchUrl, {
+			headers: {
+				"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+				Accept: "text/html,application/xhtml+xml",
+			},
+			signal,
+		})
+
+		if (!response.ok || !response.body) {
+			logger.warn(`Google search failed with status: ${response.status}`)
+			return null
+		}
+
+		const extractor = new GoogleImageExtractor()
+		const decoder = new TextDecoder()
+		const reader = response.body.getReader()
+		let bytesRead = 0
+
+		try {
+			while (!extractor.done) {
+				const { done, value } = await reader.read()
+				if (done) {
+					extractor.feed(decoder.decode())
+					break
+				}
+				bytesRead += value.byteLength
+				extractor.feed(decoder.decode(value, { stream: true }))
+			}
+		} finally {
+			// Drop the rest of the page, a no-op once it has been read in full
+			reader.cancel().catch(() => {})
+		}
+
+		const imageUrl = extractor.result()
+		if (imageUrl) {
+			logger.info(`Found image after ${bytesRead} bytes: ${imageUrl}`)
+		} else {
+			logger.warn(`No suitable image found for: ${searchTerm}`)
+		}
+		return imageUrl
+	}
+}
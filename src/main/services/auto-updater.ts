@@ -3,8 +3,9 @@ import { join } from "node:path"
 import { is } from "@electron-toolkit/utils"
 import { IpcChannels } from "@shared/types"
 import { type BrowserWindow, app, dialog, shell } from "electron"
-import { type UpdateInfo, autoUpdater } from "electron-updater"
+import type { AppUpdater, UpdateInfo } from "electron-updater"
 import { logger } from "./logger"
+import { startupTimelineService } from "./startup-timeline"
 
 /**
  * Service for automatic application updates
@@ -17,11 +18,10 @@ export class AutoUpdaterService {
 	private retryCount = 0
 	private maxRetries = 3
 	private retryDelay = 5000 // 5 seconds
+	private updater: Promise<AppUpdater> | null = null
 
 	private constructor() {
 		this.detectPortableMode()
-		this.configureUpdater()
-		this.registerAutoUpdateEvents()
 
 		logger.info("Auto updater service initialized", {
 			isPortable: this.isPortable,
@@ -90,10 +90,30 @@ export class AutoUpdaterService {
 		}
 	}
 
+	/**
+	 * Load electron-updater on first use, it's heavy and never needed at startup
+	 */
+	private getUpdater(): Promise<AppUpdater> {
+		if (!this.updater) {
+			this.updater = startupTimelineService
+				.measureAsync("import:electron-updater", () => import("electron-updater"))
+				.then(({ autoUpdater }) => {
+					this.configureUpdater(autoUpdater)
+					this.registerAutoUpdateEvents(autoUpdater)
+					return autoUpdater
+				})
+			this.updater.catch(() => {
+				// Let the next call retry the import
+				this.updater = null
+			})
+		}
+		return this.updater
+	}
+
 	/**
 	 * Configure auto updater based on installation type
 	 */
-	private configureUpdater(): void {
+	private configureUpdater(autoUpdater: AppUpdater): void {
 		autoUpdater.logger = logger
 		autoUpdater.autoDownload = false
 		autoUpdater.autoInstallOnAppQuit = !this.isPortable // Only auto-install for setup versions
@@ -115,7 +135,7 @@ export class AutoUpdaterService {
 	/**
 	 * Register auto-updater event handlers
 	 */
-	private registerAutoUpdateEvents(): void {
+	private registerAutoUpdateEvents(autoUpdater: AppUpdater): void {
 		autoUpdater.on("checking-for-update", () => {
 			logger.info("Checking for updates...")
 			this.updateCheckInProgress = true
@@ -199,9 +219,7 @@ export class AutoUpdaterService {
 			})
 			.then(({ response }) => {
 				if (response === 0) {
-					autoUpdater.downloadUpdate().catch((error) => {
-						logger.error("Error initiating download:", error)
-					})
+					this.downloadUpdate()
 				}
 			})
 			.catch((error) => {
@@ -256,7 +274,8 @@ export class AutoUpdaterService {
 				})
 				.then(({ response }) => {
 					if (response === 0) {
-						setImmediate(() => {
+						setImmediate(async () => {
+							const autoUpdater = await this.getUpdater()
 							autoUpdater.quitAndInstall(true, true)
 						})
 					}
@@ -322,6 +341,7 @@ export class AutoUpdaterService {
 			})
 
 			this.updateCheckInProgress = true
+			const autoUpdater = await this.getUpdater()
 			const result = await autoUpdater.checkForUpdates()
 
 			if (result) {
@@ -356,9 +376,11 @@ export class AutoUpdaterService {
 	 */
 	public downloadUpdate(): void {
 		logger.info("Manually triggering update download")
-		autoUpdater.downloadUpdate().catch((error) => {
-			logger.error("Error downloading update:", error)
-		})
+		this.getUpdater()
+			.then((autoUpdater) => autoUpdater.downloadUpdate())
+			.catch((error) => {
+				logger.error("Error downloading update:", error)
+			})
 	}
 
 	/**
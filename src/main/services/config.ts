@@ -1,26 +1,49 @@
+import { promises as fs, renameSync, writeFileSync } from "node:fs"
 import { CONFIG_NAME, DEFAULT_CONFIG } from "@shared/constants"
-import { type AppConfig, IpcChannels, IpcEvents } from "@shared/types"
-import { ipcMain } from "electron"
+import { type AppConfig, type ConfigWriteStats, IpcChannels, IpcEvents } from "@shared/types"
+import { app } from "electron"
 import { Conf } from "electron-conf/main"
 import { logger } from "./logger"
+import { metricsService } from "./metrics"
+
+/** Changes made within this window are written together */
+const WRITE_DELAY = 500
+/** Upper bound on how long a change can wait while changes keep coming */
+const MAX_WRITE_DELAY = 2000
+
+type ConfigRecord = Record<string, unknown>
 
 /**
  * Configuration service for the application
+ *
+ * electron-conf loads the file and applies defaults, after that reads are
+ * served from an in-memory view. Changes are coalesced and written behind
+ * in a single atomic write (temp file and rename), and flushed before quit.
  */
 class ConfigService {
 	private static instance: ConfigService | null = null
 	private conf: Conf<AppConfig>
+	private view: ConfigRecord
+	private writeTimer: NodeJS.Timeout | null = null
+	private firstPendingChange = 0
+	private writing: Promise<void> = Promise.resolve()
+	// Changes already on disk, counted like `stats.changes`
+	private writtenChanges = 0
+	private stats: ConfigWriteStats = { writes: 0, bytesWritten: 0, changes: 0, failures: 0 }
 
 	private constructor() {
 		this.conf = new Conf<AppConfig>({
 			name: CONFIG_NAME,
 			defaults: DEFAULT_CONFIG,
 		})
+		this.view = { ...structuredClone(DEFAULT_CONFIG), ...structuredClone(this.conf.store) }
 
 		logger.info("Configuration loaded", { path: this.conf.fileName })
 
 		this.registerIpcHandlers()
 		this.conf.registerRendererListener()
+
+		app.on("before-quit", () => this.flushSync())
 	}
 
 	/**
@@ -37,19 +60,14 @@ class ConfigService {
 	 * Register IPC handlers for config operations
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle(`${IpcChannels.CONFIG}:${IpcEvents.CONFIG_GET}`, (_, key?: string) => {
-			if (key) {
-				return this.conf.get(key)
-			}
-			// When no key is provided, return the full config using the store property
-			return this.conf.store
+		metricsService.handle(`${IpcChannels.CONFIG}:${IpcEvents.CONFIG_GET}`, (_, key?: string) => {
+			return this.get(key)
 		})
 
-		ipcMain.handle(
+		metricsService.handle(
 			`${IpcChannels.CONFIG}:${IpcEvents.CONFIG_SET}`,
 			(_, key: string, value: unknown) => {
-				this.conf.set(key, value)
-				logger.info(`Config updated: ${key}`, { value })
+				this.set(key, value)
 				return true
 			},
 		)
@@ -59,26 +77,38 @@ class ConfigService {
 	 * Get a configuration value
 	 */
 	public get<T>(key?: string): T {
+		// Copies keep callers from mutating the view behind the write-behind
 		if (key) {
-			return this.conf.get(key) as T
+			return structuredClone(this.getPath(key)) as T
 		}
-		// When no key is provided, return the full config using the store property
-		return this.conf.store as T
+		// When no key is provided, return the full config
+		return structuredClone(this.view) as T
+	}
+
+	/**
+	 * Serialize some configuration values, to tell when they change
+	 *
+	 * Reads the view directly, so unlike `get` nothing is copied.
+	 */
+	public fingerprint(keys: readonly string[]): string {
+		return JSON.stringify(keys.map((key) => this.getPath(key)))
 	}
 
 	/**
 	 * Set a configuration value
 	 */
 	public set(key: string, value: unknown): void {
-		this.conf.set(key, value)
-		logger.info(`Config updated: ${key}`, { value })
+		this.setPath(key, structuredClone(value))
+		this.scheduleWrite()
+		logger.info(`Config updated: ${key}`, { bytes: this.measure(value) })
 	}
 
 	/**
 	 * Delete a configuration value
 	 */
 	public delete(key: string): void {
-		this.conf.delete(key)
+		this.deletePath(key)
+		this.scheduleWrite()
 		logger.info(`Config deleted: ${key}`)
 	}
 
@@ -86,9 +116,157 @@ class ConfigService {
 	 * Reset configuration to defaults
 	 */
 	public reset(): void {
-		this.conf.clear()
+		this.view = structuredClone(DEFAULT_CONFIG) as unknown as ConfigRecord
+		this.scheduleWrite()
 		logger.info("Config reset to defaults")
 	}
+
+	/**
+	 * Write pending changes now
+	 */
+	public flush(): Promise<void> {
+		if (this.writeTimer !== null) {
+			clearTimeout(this.writeTimer)
+			this.writeTimer = null
+			this.writing = this.writing.then(() => this.write())
+		}
+		return this.writing
+	}
+
+	/**
+	 * Get write counters
+	 */
+	public getWriteStats(): ConfigWriteStats {
+		return { ...this.stats }
+	}
+
+	/**
+	 * Debounce writes, without letting a steady stream of changes starve them
+	 */
+	private scheduleWrite(): void {
+		this.stats.changes++
+		const now = Date.now()
+
+		if (this.writeTimer === null) {
+			this.firstPendingChange = now
+		} else {
+			clearTimeout(this.writeTimer)
+		}
+
+		const delay = Math.min(WRITE_DELAY, this.firstPendingChange + MAX_WRITE_DELAY - now)
+		this.writeTimer = setTimeout(() => {
+			this.writeTimer = null
+			this.writing = this.writing.then(() => this.write())
+		}, Math.max(0, delay))
+	}
+
+	/**
+	 * Atomically replace the config file with the current view
+	 */
+	private async write(): Promise<void> {
+		const content = JSON.stringify(this.view, null, "\t")
+		const changes = this.stats.changes
+		const tempPath = `${this.conf.fileName}.tmp`
+		const startedAt = Date.now()
+
+		try {
+			await fs.writeFile(tempPath, content, "utf-8")
+			if (changes < this.writtenChanges) {
+				// The quit flush wrote newer content meanwhile
+				await fs.rm(tempPath, { force: true })
+				return
+			}
+			await fs.rename(tempPath, this.conf.fileName)
+			this.writtenChanges = changes
+			metricsService.observe("config.write_ms", Date.now() - startedAt)
+			this.recordWrite(content)
+		} catch (error) {
+			this.stats.failures++
+			logger.error(`Error writing config: ${error}`)
+		}
+	}
+
+	/**
+	 * Write pending changes synchronously, the process is about to exit
+	 */
+	private flushSync(): void {
+		if (this.writeTimer === null) {
+			return
+		}
+
+		clearTimeout(this.writeTimer)
+		this.writeTimer = null
+
+		const content = JSON.stringify(this.view, null, "\t")
+		// Its own temp file, an async write may be halfway through the other one
+		const tempPath = `${this.conf.fileName}.tmp-sync`
+
+		try {
+			writeFileSync(tempPath, content, "utf-8")
+			renameSync(tempPath, this.conf.fileName)
+			this.writtenChanges = this.stats.changes
+			this.recordWrite(content)
+			logger.info("Flushed config before quit")
+		} catch (error) {
+			this.stats.failures++
+			logger.error(`Error flushing config before quit: ${error}`)
+		}
+	}
+
+	private recordWrite(content: string): void {
+		const bytes = Buffer.byteLength(content)
+		this.stats.writes++
+		this.stats.bytesWritten += bytes
+		logger.info(`Config written (${bytes} bytes)`)
+	}
+
+	/**
+	 * Serialized size of a value, for logging instead of the value itself
+	 */
+	private measure(value: unknown): number {
+		try {
+			return JSON.stringify(value)?.length ?? 0
+		} catch {
+			return 0
+		}
+	}
+
+	/**
+	 * Resolve a dot-notation key, as supported by electron-conf
+	 */
+	private getPath(key: string): unknown {
+		let current: unknown = this.view
+		for (const part of key.split(".")) {
+			if (current === null || typeof current !== "object") {
+				return undefined
+			}
+			current = (current as ConfigRecord)[part]
+		}
+		return current
+	}
+
+	private setPath(key: string, value: unknown): void {
+		const parts = key.split(".")
+		const last = parts.pop() as string
+		let current = this.view
+		for (const part of parts) {
+			const next = current[part]
+			if (next === null || typeof next !== "object") {
+				current[part] = {}
+			}
+			current = current[part] as ConfigRecord
+		}
+		current[last] = value
+	}
+
+	private deletePath(key: string): void {
+		const parts = key.split(".")
+		const last = parts.pop() as string
+		const parent = parts.length > 0 ? this.getPath(parts.join(".")) : this.view
+		if (parent !== null && typeof parent === "object") {
+			delete (parent as ConfigRecord)[last]
+		}
+	}
 }
 
 export const configService = ConfigService.getInstance()
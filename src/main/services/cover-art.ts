@@ -1,26 +1,57 @@
-import { promises as fs } from "node:fs"
+import { createHash } from "node:crypto"
+import { type ArtworkResolution, artworkCacheService } from "@main/services/artwork-cache"
+import {
+	type ArtworkCandidate,
+	type ArtworkLookup,
+	type ArtworkProvider,
+	EmbeddedArtworkProvider,
+	type MediaData,
+	SidecarArtworkProvider,
+	StoredUploadProvider,
+	WebSearchProvider,
+	scoreCandidate,
+} from "@main/services/artwork-providers"
 import { multiImageUploaderService } from "@main/services/multi-image-uploader"
 import { metadataWriterService } from "@main/services/metadata-writer"
+import { metricsService } from "@main/services/metrics"
 import { VideoAnalyzerService } from "@main/services/video-analyzer"
 import { vlcStatusService } from "@main/services/vlc-status"
+import type { ArtworkProviderStats } from "@shared/types/media"
 import type { VlcStatus } from "@shared/types/vlc"
-import * as cheerio from "cheerio"
 import { logger } from "./logger"
 
-/** Media data structure for cover art searching */
-interface MediaData {
-	title?: string
-	artist?: string
-	album?: string
-	artworkUrl?: string
-	date?: string
-	year?: string
-	[key: string]: string | undefined
+/** Providers still running after this are left out of the lookup */
+const LOOKUP_DEADLINE = 3000
+
+/** Re-upload artwork of the playing file this long before its upload expires */
+const REFRESH_BEFORE_EXPIRY = 12 * 60 * 60 * 1000
+
+/** Artwork uploaded to an image host */
+interface UploadedArtwork {
+	url: string
+	expiryDate: Date
 }
 
-/** Service to fetch album cover art for audio files */
+/**
+ * Service to fetch cover art for the playing media
+ *
+ * Every applicable provider (embedded art, sidecar images, an earlier upload,
+ * web search) is asked at once under a shared deadline, and the candidates
+ * that arrive in time are ranked by `scoreCandidate`. Local images are only
+ * uploaded once picked, and not at all while the file's earlier upload is
+ * still valid.
+ */
 export class CoverArtService {
 	private static instance: CoverArtService | null = null
+	private providers: ArtworkProvider[] = [
+		new EmbeddedArtworkProvider(),
+		new SidecarArtworkProvider(),
+		new StoredUploadProvider(),
+		new WebSearchProvider(),
+	]
+	private providerStats: Map<string, ArtworkProviderStats> = new Map()
+	private pendingUploads: Map<string, Promise<UploadedArtwork | null>> = new Map()
+	private refreshingFiles: Set<string> = new Set()
 
 	private constructor() {
 		logger.info("Cover art service initialized")
@@ -37,192 +68,294 @@ export class CoverArtService {
 	/** Fetch cover art URL using all available media information */
 	public async fetch(mediaInfo: VlcStatus | null): Promise<string | null> {
 		const media = this.extractMediaData(mediaInfo)
-		if (!media) {
+		if (!mediaInfo || !media) {
 			return null
 		}
 
-		// Step 1: Check if media already has an uploaded image URL in its metadata
-		const fileUri = await vlcStatusService.getCurrentFileUri()
-		if (fileUri && media.artworkUrl) {
-			const filePath = metadataWriterService.vlcUriToFilePath(fileUri)
-			if (filePath) {
-				const customMetadata = await metadataWriterService.readMetadataTags(filePath)
-				if (customMetadata) {
-					const parsed = multiImageUploaderService.parseMetadataTags(customMetadata)
-					if (parsed.imageUrl && !parsed.isExpired) {
-						logger.info(`Using existing uploaded cover image: ${parsed.imageUrl}`)
-						return parsed.imageUrl
-					}
+		try {
+			const fileUri = await vlcStatusService.getCurrentFileUri()
+			const filePath = fileUri ? metadataWriterService.vlcUriToFilePath(fileUri) : null
+			const lookup: ArtworkLookup = {
+				mediaType: mediaInfo.mediaType,
+				media,
+				filePath,
+				// Audio is never searched for online, only videos are
+				searchTerm: mediaInfo.mediaType === "video" ? this.getVideoSearchTerm(mediaInfo) : null,
+			}
 
-					if (parsed.isExpired) {
-						logger.info("Existing uploaded cover image has expired, will re-upload")
-					}
-				}
+			// VLC fills in the artwork URL lazily, so it is part of the identity
+			const identity = fileUri || [media.title, media.artist, media.album].join("|")
+			const key = `${lookup.mediaType}:${identity}|${media.artworkUrl || ""}`
+
+			return await artworkCacheService.getOrResolve(key, () => this.resolveArtwork(lookup))
+		} catch (error) {
+			logger.error(`Error fetching cover art: ${error}`)
+			return null
+		}
+	}
+
+	/**
+	 * Lookup counters per provider
+	 */
+	public getProviderStats(): Record<string, ArtworkProviderStats> {
+		return Object.fromEntries(
+			[...this.providerStats].map(([name, stats]) => [name, { ...stats }]),
+		)
+	}
+
+	/** Pick the best artwork the providers offer, uploading it if it's local */
+	private async resolveArtwork(lookup: ArtworkLookup): Promise<ArtworkResolution> {
+		const candidates = await metricsService.timeAsync("artwork.lookup_ms", () =>
+			this.collectCandidates(lookup),
+		)
+		const ranked = candidates
+			.map((candidate) => ({ candidate, score: scoreCandidate(candidate, lookup) }))
+			.sort((a, b) => b.score - a.score)
+
+		// The file's earlier upload was made from its local artwork, so it stands in
+		// for those bytes instead of hashing and uploading them again
+		const stored = candidates.find(
+			(candidate) =>
+				candidate.provider === "stored" &&
+				(candidate.expiresAt ?? Number.POSITIVE_INFINITY) - Date.now() >= REFRESH_BEFORE_EXPIRY,
+		)
+
+		// Fall back to the next candidate when an upload fails
+		for (const { candidate, score } of ranked) {
+			const url =
+				candidate.image && stored?.url
+					? stored.url
+					: await this.materialize(candidate, lookup, candidates)
+			if (url) {
+				logger.info(`Using ${candidate.provider} artwork (score ${score.toFixed(2)}): ${url}`)
+				this.statsFor(candidate.provider).wins++
+				return { url }
 			}
 		}
 
-		// Step 2: Prioritize local artwork from the file
-		if (media.artworkUrl?.startsWith("file://")) {
-			try {
-				// Upload the local artwork to 0x0.st for Discord compatibility
-				const localPath = media.artworkUrl.replace("file://", "")
-				const decodedPath = decodeURIComponent(localPath)
+		if (ranked.length > 0) {
+			// Artwork exists but couldn't be uploaded, so try again on the next lookup
+			logger.info("Could not use any of the artwork found for the current media")
+			return { url: null, transient: true }
+		}
 
-				// Handle Windows paths
-				const fixedPath =
-					process.platform === "win32" && decodedPath.startsWith("/")
-						? decodedPath.substring(1)
-						: decodedPath
+		logger.info("No artwork found for the current media")
+		return { url: null }
+	}
+
+	/**
+	 * Ask every applicable provider at once, keeping what arrives by the deadline
+	 */
+	private async collectCandidates(lookup: ArtworkLookup): Promise<ArtworkCandidate[]> {
+		const controller = new AbortController()
+		const candidates: ArtworkCandidate[] = []
+		const pending = new Set<string>()
+		let timer: NodeJS.Timeout | undefined
+
+		const lookups = this.providers
+			.filter((provider) => provider.supports(lookup))
+			.map(async (provider) => {
+				const stats = this.statsFor(provider.name)
+				const start = Date.now()
+				stats.lookups++
+				pending.add(provider.name)
 
 				try {
-					const imageBuffer = await fs.readFile(fixedPath)
-					const filename = `cover_${Date.now()}.jpg`
-					const uploadedUrl = await multiImageUploaderService.uploadImage(imageBuffer, filename, 24 * 7) // 7 days
-
-					if (uploadedUrl && fileUri) {
-						// Store the uploaded URL in metadata for future use
-						const filePath = metadataWriterService.vlcUriToFilePath(fileUri)
-						if (filePath) {
-							const expiryDate = new Date()
-							expiryDate.setDate(expiryDate.getDate() + 7) // 7 days from now
-
-							const tags = multiImageUploaderService.generateMetadataTags(uploadedUrl, expiryDate)
-							await metadataWriterService.writeMetadataTags(filePath, tags)
-
-							logger.info(`Uploaded local artwork and saved metadata: ${uploadedUrl}`)
-						}
-						return uploadedUrl
+					const candidate = await provider.find(lookup, controller.signal)
+					if (!pending.has(provider.name)) {
+						// Arrived after the deadline
+						return
+					}
+					if (candidate) {
+						stats.hits++
+						candidates.push(candidate)
 					}
 				} catch (error) {
-					logger.warn(`Could not upload local artwork: ${error}`)
+					if (!pending.has(provider.name)) {
+						return
+					}
+					stats.errors++
+					logger.warn(`Artwork provider ${provider.name} failed: ${error}`)
+				} finally {
+					if (pending.delete(provider.name)) {
+						stats.totalLatencyMs += Date.now() - start
+						metricsService.observe(`artwork.provider.${provider.name}_ms`, Date.now() - start)
+					}
 				}
-			} catch (error) {
-				logger.warn(`Error processing local artwork: ${error}`)
-			}
+			})
+
+		const deadline = new Promise<void>((resolve) => {
+			timer = setTimeout(resolve, LOOKUP_DEADLINE)
+		})
+		await Promise.race([Promise.all(lookups), deadline])
+		clearTimeout(timer)
+
+		for (const name of pending) {
+			const stats = this.statsFor(name)
+			stats.timeouts++
+			stats.totalLatencyMs += LOOKUP_DEADLINE
+			logger.warn(`Artwork provider ${name} missed the ${LOOKUP_DEADLINE}ms deadline`)
 		}
+		pending.clear()
+		controller.abort()
 
-		// No cover art available - no more online search
-		logger.info("No local artwork available and online search disabled")
-		return null
+		return candidates
 	}
 
 	/**
-	 * Fetch cover art for video content using Google Images
-	 * Only works for videos, not audio
+	 * Turn a candidate into a URL Discord can show, uploading local images
+	 *
+	 * @param candidates - Every candidate of the lookup, to spot an upload already on record
 	 */
-	public async fetchVideoImageFromGoogle(mediaInfo: VlcStatus | null): Promise<string | null> {
-		if (!mediaInfo || mediaInfo.mediaType !== "video") {
-			return null
+	private async materialize(
+		candidate: ArtworkCandidate,
+		lookup: ArtworkLookup,
+		candidates: ArtworkCandidate[],
+	): Promise<string | null> {
+		if (!candidate.image) {
+			return candidate.url ?? null
 		}
 
 		try {
-			const videoAnalyzer = VideoAnalyzerService.getInstance()
-			const videoAnalysis = videoAnalyzer.analyzeVideo(mediaInfo)
-
-			let searchTerm = ""
-
-			if (videoAnalysis.isTvShow) {
-				// For TV shows, search for the show poster
-				searchTerm = `${videoAnalysis.title} tv show poster`
-			} else if (videoAnalysis.isMovie) {
-				// For movies, include year if available
-				if (videoAnalysis.year) {
-					searchTerm = `${videoAnalysis.title} ${videoAnalysis.year} movie poster`
-				} else {
-					searchTerm = `${videoAnalysis.title} movie poster`
+			const upload = await this.uploadArtwork(candidate.image)
+			if (!upload) {
+				return null
+			}
+
+			if (lookup.filePath) {
+				if (!candidates.some((c) => c.url === upload.url)) {
+					// Store the uploaded URL in metadata for future use
+					const tags = multiImageUploaderService.generateMetadataTags(
+						upload.url,
+						upload.expiryDate,
+					)
+					await metadataWriterService.writeMetadataTags(lookup.filePath, tags)
+					logger.info(`Saved artwork metadata: ${upload.url}`)
+				}
+
+				if (upload.expiryDate.getTime() - Date.now() < REFRESH_BEFORE_EXPIRY) {
+					this.refreshInBackground(candidate.image, lookup.filePath)
 				}
-			} else {
-				// Generic video search
-				searchTerm = `${videoAnalysis.title} cover`
 			}
 
-			logger.info(`Searching for video cover: ${searchTerm}`)
-			return await this.fetchImageFromGoogle(searchTerm)
+			return upload.url
 		} catch (error) {
-			logger.error(`Error fetching video cover art: ${error}`)
+			logger.warn(`Could not upload ${candidate.provider} artwork: ${error}`)
 			return null
 		}
 	}
 
 	/**
-	 * Fetch image from Google Images based on search term
+	 * Re-upload the artwork of the playing file before its upload expires,
+	 * so the presence never loses its image mid-track
 	 */
-	private async fetchImageFromGoogle(searchTerm: string): Promise<string | null> {
-		try {
-			logger.info(`Searching for image: ${searchTerm}`)
-			const encodedQuery = encodeURIComponent(searchTerm)
-			const searchUrl = `https://www.google.com/search?q=${encodedQuery}&tbm=isch`
-
-			const response = await fetch(searchUrl, {
-				headers: {
-					"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-					Accept: "text/html,application/xhtml+xml",
-				},
-			})
-
-			if (!response.ok) {
-				logger.warn(`Google search failed with status: ${response.status}`)
-				return null
-			}
-
-			const html = await response.text()
-			const $ = cheerio.load(html)
-
-			let imageUrl: string | null = null
+	private refreshInBackground(image: Buffer, filePath: string): void {
+		if (this.refreshingFiles.has(filePath)) {
+			return
+		}
 
-			// First, try to find gstatic images (Google's cached images)
-			$("img").each((_, img) => {
-				const src = $(img).attr("src")
-				if (src?.startsWith("http") && !src.endsWith(".gif")) {
-					if (src.includes("gstatic.com")) {
-						imageUrl = src
-						return false // Break the loop
-					}
+		logger.info("Uploaded cover image expires soon, refreshing it in the background")
+		this.refreshingFiles.add(filePath)
+		this.uploadArtwork(image, Date.now() + REFRESH_BEFORE_EXPIRY)
+			.then(async (upload) => {
+				if (upload) {
+					const tags = multiImageUploaderService.generateMetadataTags(
+						upload.url,
+						upload.expiryDate,
+					)
+					await metadataWriterService.writeMetadataTags(filePath, tags)
 				}
-				return true
 			})
+			.catch((error) => {
+				logger.warn(`Could not refresh artwork upload: ${error}`)
+			})
+			.finally(() => {
+				this.refreshingFiles.delete(filePath)
+			})
+	}
 
-			if (imageUrl) {
-				logger.info(`Found gstatic image: ${imageUrl}`)
-				return imageUrl
-			}
+	private statsFor(provider: string): ArtworkProviderStats {
+		let stats = this.providerStats.get(provider)
+		if (!stats) {
+			stats = { lookups: 0, hits: 0, wins: 0, timeouts: 0, errors: 0, totalLatencyMs: 0 }
+			this.providerStats.set(provider, stats)
+		}
+		return stats
+	}
 
-			// If no gstatic image found, try to extract from JavaScript
-			const imgRegex = /https?:\/\/\S+?\.(?:jpg|jpeg|png)/g
-			$("script").each((_, script) => {
-				const content = $(script).html()
-				if (content?.includes("AF_initDataCallback")) {
-					const matches = content.match(imgRegex)
-					if (matches) {
-						for (const url of matches) {
-							// Skip common non-content images
-							if (!/icon|emoji|favicon|logo|button/i.test(url)) {
-								imageUrl = url
-								logger.info(`Found image from script: ${imageUrl}`)
-								return false // Break the loop
-							}
-						}
-					}
-				}
-				return true
+	/**
+	 * Upload artwork bytes, reusing an earlier upload of the same image
+	 *
+	 * Tracks of an album usually share one cover file, so uploads are indexed
+	 * by the SHA-256 of the bytes rather than by media file.
+	 */
+	private async uploadArtwork(
+		imageBuffer: Buffer,
+		minValidUntil = Date.now(),
+	): Promise<UploadedArtwork | null> {
+		const hash = createHash("sha256").update(imageBuffer).digest("hex")
+
+		const existing = metadataWriterService.getArtworkUpload(hash, minValidUntil)
+		if (existing) {
+			logger.info(`Reusing upload of identical artwork: ${existing.url}`)
+			return { url: existing.url, expiryDate: new Date(existing.expiresAt) }
+		}
+
+		// Tracks sharing a cover may ask for it at the same time
+		let pending = this.pendingUploads.get(hash)
+		if (!pending) {
+			pending = this.uploadNewArtwork(hash, imageBuffer).finally(() => {
+				this.pendingUploads.delete(hash)
 			})
+			this.pendingUploads.set(hash, pending)
+		}
 
-			if (imageUrl) {
-				return imageUrl
-			}
+		return pending
+	}
 
-			logger.warn(`No suitable image found for: ${searchTerm}`)
-			return null
-		} catch (error) {
-			logger.error(`Error fetching image from Google: ${error}`)
+	/** Upload artwork that hasn't been uploaded yet and index it by hash */
+	private async uploadNewArtwork(
+		hash: string,
+		imageBuffer: Buffer,
+	): Promise<UploadedArtwork | null> {
+		const filename = `cover_${Date.now()}.jpg`
+		const url = await multiImageUploaderService.uploadImage(imageBuffer, filename, 24 * 7) // 7 days
+		if (!url) {
 			return null
 		}
+
+		const expiryDate = new Date()
+		expiryDate.setDate(expiryDate.getDate() + 7) // 7 days from now
+
+		metadataWriterService.storeArtworkUpload(hash, url, expiryDate)
+		logger.info(`Uploaded local artwork: ${url}`)
+		return { url, expiryDate }
+	}
+
+	/**
+	 * Web search query for a video, poster for movies and shows
+	 */
+	private getVideoSearchTerm(mediaInfo: VlcStatus): string {
+		const videoAnalysis = VideoAnalyzerService.getInstance().analyzeVideo(mediaInfo)
+
+		if (videoAnalysis.isTvShow) {
+			// For TV shows, search for the show poster
+			return `${videoAnalysis.title} tv show poster`
+		}
+		if (videoAnalysis.isMovie) {
+			// For movies, include year if available
+			return videoAnalysis.year
+				? `${videoAnalysis.title} ${videoAnalysis.year} movie poster`
+				: `${videoAnalysis.title} movie poster`
+		}
+		// Generic video search
+		return `${videoAnalysis.title} cover`
 	}
 
 	/** Extract media data from the input */
 	private extractMediaData(mediaInfo: VlcStatus | null): MediaData | null {
 		if (!mediaInfo || typeof mediaInfo !== "object") {
-			logger.info("No valid media info provided for cover art")
+			logger.debug("No valid media info provided for cover art")
 			return null
 		}
 
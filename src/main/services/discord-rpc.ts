@@ -1,8 +1,13 @@
 import type { AppConfig } from "@shared/types"
-import type { DiscordPresenceData } from "@shared/types/media"
-import { Client, type SetActivity, StatusDisplayType } from "@xhayper/discord-rpc"
+import type { ActivityUpdateStats, DiscordPresenceData } from "@shared/types/media"
+import type { Client, SetActivity } from "@xhayper/discord-rpc"
+import { ActivityGovernor } from "./activity-governor"
 import { configService } from "./config"
 import { logger } from "./logger"
+import { metricsService } from "./metrics"
+import { startupTimelineService } from "./startup-timeline"
+
+type DiscordRpcModule = typeof import("@xhayper/discord-rpc")
 
 /**
  * Service for Discord Rich Presence integration
@@ -18,8 +23,12 @@ export class DiscordRpcService {
 	private maxReconnectAttempts = 10
 	private reconnectDelay = 5000 // 5 seconds
 	private rpcCheckTimer: NodeJS.Timeout | null = null
+	private activityGovernor: ActivityGovernor
+	private presenceCleared = false
+	private rpcModule: Promise<DiscordRpcModule> | null = null
 
 	private constructor() {
+		this.activityGovernor = new ActivityGovernor((activity) => this.sendActivity(activity))
 		logger.info("Discord RPC service initialized")
 		this.startRpcCheckTimer()
 	}
@@ -94,6 +103,13 @@ export class DiscordRpcService {
 		return this.connected
 	}
 
+	/**
+	 * Get counters for sent, skipped and throttled activity updates
+	 */
+	public getActivityStats(): ActivityUpdateStats {
+		return this.activityGovernor.getStats()
+	}
+
 	/**
 	 * Connect to Discord RPC
 	 */
@@ -110,6 +126,7 @@ export class DiscordRpcService {
 		this.stopReconnectTimer()
 
 		try {
+			const { Client } = await this.loadRpcModule()
 			this.rpc = new Client({
 				clientId: this.clientId,
 			})
@@ -118,6 +135,9 @@ export class DiscordRpcService {
 				logger.info("Connected to Discord")
 				this.connected = true
 				this.reconnectAttempts = 0
+				// A fresh connection has no activity, so the next update must go through
+				this.activityGovernor.reset()
+				this.presenceCleared = true
 			})
 
 			this.rpc.on("disconnected", () => {
@@ -183,6 +203,22 @@ export class DiscordRpcService {
 		}
 	}
 
+	/**
+	 * Import the Discord client on the first connection attempt instead of at startup
+	 */
+	private loadRpcModule(): Promise<DiscordRpcModule> {
+		if (!this.rpcModule) {
+			this.rpcModule = startupTimelineService.measureAsync(
+				"import:@xhayper/discord-rpc",
+				() => import("@xhayper/discord-rpc"),
+			)
+			this.rpcModule.catch(() => {
+				this.rpcModule = null
+			})
+		}
+		return this.rpcModule
+	}
+
 	/**
 	 * Force a reconnection attempt
 	 */
@@ -207,7 +243,7 @@ export class DiscordRpcService {
 	public async update(presenceData: DiscordPresenceData): Promise<boolean> {
 		// Check if RPC is enabled before updating
 		if (!this.isRpcEnabled()) {
-			logger.info("RPC is disabled, skipping presence update")
+			logger.debug("RPC is disabled, skipping presence update")
 			return false
 		}
 
@@ -221,9 +257,10 @@ export class DiscordRpcService {
 
 		try {
 			const config = configService.get<AppConfig>()
+			const { StatusDisplayType } = await this.loadRpcModule()
 
 			// Log the presence data for debugging
-			logger.info("Updating Discord Rich Presence with data:", presenceData)
+			logger.trace("Updating Discord Rich Presence with data:", presenceData)
 
 			const activity: SetActivity = {
 				details: presenceData.details,
@@ -274,19 +311,38 @@ export class DiscordRpcService {
 				activity.type = 0
 			}
 
-			// Log the final activity object for debugging
-			logger.info("Final activity object sent to Discord:", activity)
-
-			await this.rpc.user.setActivity(activity)
-			logger.info("Updated Discord Rich Presence")
+			const result = await this.activityGovernor.submit(activity)
+			this.presenceCleared = false
+			if (result === "sent") {
+				logger.debug("Updated Discord Rich Presence")
+			}
 			return true
 		} catch (error) {
 			logger.error(`Error updating Discord presence: ${error}`)
-			this.connected = false
 			return false
 		}
 	}
 
+	/**
+	 * Send an activity to Discord, called by the activity governor
+	 */
+	private async sendActivity(activity: SetActivity): Promise<void> {
+		if (!this.rpc || !this.rpc.user) {
+			throw new Error("Discord client is not ready")
+		}
+
+		try {
+			// Log the final activity object for debugging
+			logger.trace("Final activity object sent to Discord:", activity)
+			const user = this.rpc.user
+			await metricsService.timeAsync("discord.set_activity_ms", () => user.setActivity(activity))
+		} catch (error) {
+			metricsService.increment("discord.set_activity_errors")
+			this.connected = false
+			throw error
+		}
+	}
+
 	/**
 	 * Clear Discord Rich Presence
 	 */
@@ -299,8 +355,15 @@ export class DiscordRpcService {
 			return false
 		}
 
+		// Nothing playing is reported on every poll, only clear once
+		if (this.presenceCleared) {
+			return true
+		}
+
 		try {
+			this.activityGovernor.reset()
 			await this.rpc.user.clearActivity()
+			this.presenceCleared = true
 			logger.info("Cleared Discord Rich Presence")
 			return true
 		} catch (error) {
@@ -0,0 +1,154 @@
+interface HeapItem {
+	key: string
+	expiresAt: number
+}
+
+/**
+ * Index of keys by expiry time
+ *
+ * A binary min-heap ordered by expiry, with lazy invalidation: updating or
+ * removing a key leaves its old heap item behind, and stale items are
+ * dropped when they reach the top. Keys whose expiry has passed move to a
+ * due set, so counting expired keys is O(1) amortized.
+ */
+export class ExpiryIndex {
+	private heap: HeapItem[] = []
+	private expiries: Map<string, number> = new Map()
+	private due: Set<string> = new Set()
+
+	/**
+	 * Track a key, replacing its previous expiry.
+	 * An unparseable expiry counts as already expired.
+	 */
+	public set(key: string, expiresAt: number): void {
+		const at = Number.isNaN(expiresAt) ? 0 : expiresAt
+		this.due.delete(key)
+		this.expiries.set(key, at)
+		this.push({ key, expiresAt: at })
+
+		// Rebuild once superseded items outnumber live ones
+		if (this.heap.length > this.expiries.size * 2 + 64) {
+			this.rebuild()
+		}
+	}
+
+	public delete(key: string): void {
+		this.expiries.delete(key)
+		this.due.delete(key)
+	}
+
+	public clear(): void {
+		this.heap = []
+		this.expiries.clear()
+		this.due.clear()
+	}
+
+	/**
+	 * Number of keys expired at `now`
+	 */
+	public countExpired(now = Date.now()): number {
+		this.advance(now)
+		return this.due.size
+	}
+
+	/**
+	 * Up to `limit` keys expired at `now`
+	 */
+	public getExpired(limit: number, now = Date.now()): string[] {
+		this.advance(now)
+		const keys: string[] = []
+		for (const key of this.due) {
+			if (keys.length >= limit) {
+				break
+			}
+			keys.push(key)
+		}
+		return keys
+	}
+
+	/**
+	 * Earliest expiry among keys that haven't expired yet, null if none
+	 */
+	public nextExpiry(): number | null {
+		this.dropStale()
+		return this.heap.length > 0 ? this.heap[0].expiresAt : null
+	}
+
+	/**
+	 * Move every key expired at `now` to the due set
+	 */
+	private advance(now: number): void {
+		this.dropStale()
+		while (this.heap.length > 0 && this.heap[0].expiresAt <= now) {
+			const item = this.pop()
+			if (this.expiries.get(item.key) === item.expiresAt) {
+				this.due.add(item.key)
+			}
+			this.dropStale()
+		}
+	}
+
+	/**
+	 * Pop items at the top that no longer match their key's expiry
+	 */
+	private dropStale(): void {
+		while (this.heap.length > 0) {
+			const top = this.heap[0]
+			if (this.expiries.get(top.key) === top.expiresAt && !this.due.has(top.key)) {
+				return
+			}
+			this.pop()
+		}
+	}
+
+	private rebuild(): void {
+		this.heap = []
+		for (const [key, expiresAt] of this.expiries) {
+			if (!this.due.has(key)) {
+				this.push({ key, expiresAt })
+			}
+		}
+	}
+
+	private push(item: HeapItem): void {
+		const heap = this.heap
+		heap.push(item)
+		let index = heap.length - 1
+		while (index > 0) {
+			const parent = (index - 1) >> 1
+			if (heap[parent].expiresAt <= item.expiresAt) {
+				break
+			}
+			heap[index] = heap[parent]
+			index = parent
+		}
+		heap[index] = item
+	}
+
+	private pop(): HeapItem {
+		const heap = this.heap
+		const top = heap[0]
+		const last = heap.pop() as HeapItem
+		if (heap.length === 0) {
+			return top
+		}
+
+		let index = 0
+		while (true) {
+			const left = index * 2 + 1
+			if (left >= heap.length) {
+				break
+			}
+			const right = left + 1
+			const child =
+				right < heap.length && heap[right].expiresAt < heap[left].expiresAt ? right : left
+			if (heap[child].expiresAt >= last.expiresAt) {
+				break
+			}
+			heap[index] = heap[child]
+			index = child
+		}
+		heap[index] = last
+		return top
+	}
+}
@@ -0,0 +1,188 @@
+/** Content image URLs in the results' data scripts */
+const SCRIPT_IMAGE_PATTERN = /https?:\/\/\S+?\.(?:jpg|jpeg|png)/g
+/** Script URLs that are page chrome rather than results */
+const NON_CONTENT_PATTERN = /icon|emoji|favicon|logo|button/i
+/** Marker of the scripts that carry result data */
+const DATA_SCRIPT_MARKER = "AF_initDataCallback"
+const TAG_PATTERN = /<(img|script)\b/gi
+const SRC_PATTERN = /\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))/i
+const SCRIPT_END = "</script"
+
+/** Longest unfinished tag or URL carried over to the next chunk */
+const MAX_CARRY = 8 * 1024
+/** How much more of the page to read for a gstatic image once a script image was found */
+const SCRIPT_MATCH_LOOKAHEAD = 64 * 1024
+
+/**
+ * Incremental scanner for the first usable image on a Google Images results page
+ *
+ * Fed the page text chunk by chunk as it downloads, it looks for `<img>` tags
+ * pointing at gstatic thumbnails, and for image URLs inside the
+ * `AF_initDataCallback` data scripts. A gstatic thumbnail ends the scan at
+ * once. A script image is kept as a fallback while a little more of the page
+ * is read, since thumbnails are preferred. Only unfinished tags and URLs are
+ * kept between chunks, the page itself is never held in memory.
+ */
+export class GoogleImageExtractor {
+	private carry = ""
+	private inScript = false
+	private inDataScript = false
+	private gstaticUrl: string | null = null
+	private scriptUrl: string | null = null
+	private scannedSinceScriptUrl = 0
+
+	/**
+	 * Whether enough has been seen, the rest of the page can be dropped
+	 */
+	public get done(): boolean {
+		return (
+			this.gstaticUrl !== null ||
+			(this.scriptUrl !== null && this.scannedSinceScriptUrl >= SCRIPT_MATCH_LOOKAHEAD)
+		)
+	}
+
+	/**
+	 * Scan the next chunk of page text
+	 */
+	public feed(chunk: string): void {
+		if (this.done) {
+			return
+		}
+
+		if (this.scriptUrl !== null) {
+			this.scannedSinceScriptUrl += chunk.length
+		}
+
+		let text = this.carry + chunk
+		this.carry = ""
+
+		while (text.length > 0 && !this.done) {
+			text = this.inScript ? this.scanScript(text) : this.scanMarkup(text)
+			if (this.carry) {
+				break
+			}
+		}
+
+		if (this.carry.length > MAX_CARRY) {
+			this.carry = this.carry.slice(-MAX_CARRY)
+		}
+	}
+
+	/**
+	 * Best image found so far, gstatic thumbnails first
+	 */
+	public result(): string | null {
+		return this.gstaticUrl ?? this.scriptUrl
+	}
+
+	/**
+	 * Scan markup up to the start of the next script body, returns what's left
+	 */
+	private scanMarkup(text: string): string {
+		TAG_PATTERN.lastIndex = 0
+		for (let match = TAG_PATTERN.exec(text); match; match = TAG_PATTERN.exec(text)) {
+			const tagEnd = text.indexOf(">", match.index)
+			if (tagEnd === -1) {
+				// The tag continues in the next chunk
+				this.carry = text.slice(match.index)
+				return ""
+			}
+
+			if (match[1].toLowerCase() === "script") {
+				this.inScript = true
+				this.inDataScript = false
+				return text.slice(tagEnd + 1)
+			}
+
+			this.checkImgTag(text.slice(match.index, tagEnd))
+			if (this.done) {
+				return ""
+			}
+			TAG_PATTERN.lastIndex = tagEnd + 1
+		}
+
+		// Keep a tail that could be the start of a split tag name
+		this.carry = text.slice(-"<script".length + 1)
+		return ""
+	}
+
+	/**
+	 * Scan a script body up to its closing tag, returns what's left
+	 */
+	private scanScript(text: string): string {
+		const end = text.toLowerCase().indexOf(SCRIPT_END)
+		const body = end === -1 ? text : text.slice(0, end)
+
+		if (!this.inDataScript) {
+			const marker = body.indexOf(DATA_SCRIPT_MARKER)
+			if (marker === -1) {
+				if (end === -1) {
+					// Keep enough to spot a split marker or closing tag
+					this.carry = text.slice(-DATA_SCRIPT_MARKER.length)
+					return ""
+				}
+				this.inScript = false
+				return text.slice(end)
+			}
+			this.inDataScript = true
+		}
+
+		const pending = this.checkScriptBody(body, end === -1)
+		if (end === -1) {
+			// Also keep enough to spot a split closing tag
+			this.carry = text.slice(-Math.max(pending.length, SCRIPT_END.length))
+			return ""
+		}
+
+		this.inScript = false
+		this.inDataScript = false
+		return text.slice(end)
+	}
+
+	private checkImgTag(tag: string): void {
+		const match = SRC_PATTERN.exec(tag)
+		const src = match ? decodeEntities(match[1] ?? match[2] ?? match[3]) : null
+		if (src?.startsWith("http") && !src.endsWith(".gif") && src.includes("gstatic.com")) {
+			this.gstaticUrl = src
+		}
+	}
+
+	/**
+	 * Look for a content image in part of a data script, returns the text that
+	 * may still hold an unfinished URL when the script continues
+	 */
+	private checkScriptBody(body: string, continues: boolean): string {
+		let resumeAt = 0
+		SCRIPT_IMAGE_PATTERN.lastIndex = 0
+		for (
+			let match = SCRIPT_IMAGE_PATTERN.exec(body);
+			match;
+			match = SCRIPT_IMAGE_PATTERN.exec(body)
+		) {
+			resumeAt = match.index + match[0].length
+			if (this.scriptUrl === null && !NON_CONTENT_PATTERN.test(match[0])) {
+				this.scriptUrl = match[0]
+			}
+		}
+
+		if (!continues || this.scriptUrl !== null) {
+			return ""
+		}
+
+		// A URL can't span whitespace, so only the text after the last one can still match
+		const lastSpace = body.search(/\s\S*$/)
+		return body.slice(Math.max(resumeAt, lastSpace + 1))
+	}
+}
+
+/**
+ * Decode the entities that show up in attribute values
+ */
+function decodeEntities(value: string): string {
+	return value
+		.replace(/&quot;/g, '"')
+		.replace(/&#39;/g, "'")
+		.replace(/&lt;/g, "<")
+		.replace(/&gt;/g, ">")
+		.replace(/&amp;/g, "&")
+}
@@ -0,0 +1,118 @@
+import { configService } from "@main/services/config"
+import { logger } from "@main/services/logger"
+import { DEFAULT_CONFIG } from "@shared/constants"
+import type { ArtworkUploadConfig } from "@shared/types"
+import { type NativeImage, nativeImage } from "electron"
+
+/**
+ * Image prepared for upload
+ */
+export interface OptimizedImage {
+	buffer: Buffer
+	filename: string
+	/** Whether the image was re-encoded */
+	reencoded: boolean
+}
+
+/**
+ * Shrinks artwork before it is uploaded
+ *
+ * Embedded artwork is often a multi-megabyte PNG far larger than anything
+ * Discord displays. Images are scaled down to the configured size and
+ * re-encoded with Electron's built-in image codecs, as JPEG unless they
+ * have transparency, which JPEG would turn black, in which case they stay
+ * PNG. Re-encoding also drops any embedded metadata.
+ */
+export class ImageOptimizerService {
+	private static instance: ImageOptimizerService | null = null
+
+	private constructor() {
+		logger.info("Image optimizer service initialized")
+	}
+
+	/**
+	 * Get the singleton instance of the image optimizer service
+	 */
+	public static getInstance(): ImageOptimizerService {
+		if (!ImageOptimizerService.instance) {
+			ImageOptimizerService.instance = new ImageOptimizerService()
+		}
+		return ImageOptimizerService.instance
+	}
+
+	/**
+	 * Downscale and re-encode an image, falling back to the original bytes
+	 * when the format can't be decoded or re-encoding doesn't help
+	 *
+	 * @param buffer - Original image bytes
+	 * @param filename - Original file name, its extension changes when re-encoded
+	 */
+	public optimize(buffer: Buffer, filename: string): OptimizedImage {
+		const original: OptimizedImage = { buffer, filename, reencoded: false }
+
+		try {
+			const image = nativeImage.createFromBuffer(buffer)
+			if (image.isEmpty()) {
+				return original
+			}
+
+			const { maxDimension, jpegQuality } = this.getConfig()
+			const { width, height } = image.getSize()
+			const scale = Math.min(1, maxDimension / Math.max(width, height))
+
+			const resized =
+				scale < 1
+					? image.resize({
+							width: Math.max(1, Math.round(width * scale)),
+							height: Math.max(1, Math.round(height * scale)),
+							quality: "best",
+						})
+					: image
+			const transparent = this.hasTransparency(resized)
+			const encoded = transparent
+				? resized.toPNG()
+				: resized.toJPEG(Math.min(100, Math.max(1, jpegQuality)))
+
+			if (encoded.length === 0 || encoded.length >= buffer.length) {
+				return original
+			}
+
+			logger.info(
+				`Optimized ${filename}: ${width}x${height} ${buffer.length} bytes -> ` +
+					`${resized.getSize().width}x${resized.getSize().height} ${encoded.length} bytes`,
+			)
+
+			return {
+				buffer: encoded,
+				filename: `${filename.replace(/\.[^.]*$/, "")}.${transparent ? "png" : "jpg"}`,
+				reencoded: true,
+			}
+		} catch (error) {
+			logger.warn(`Could not optimize ${filename}, uploading original: ${error}`)
+			return original
+		}
+	}
+
+	/**
+	 * Whether any pixel is less than fully opaque
+	 */
+	private hasTransparency(image: NativeImage): boolean {
+		// BGRA or RGBA depending on the platform, alpha is the fourth byte either way
+		const bitmap = image.toBitmap()
+		for (let alpha = 3; alpha < bitmap.length; alpha += 4) {
+			if (bitmap[alpha] < 255) {
+				return true
+			}
+		}
+		return false
+	}
+
+	private getConfig(): ArtworkUploadConfig {
+		return {
+			...DEFAULT_CONFIG.artworkUpload,
+			...configService.get<ArtworkUploadConfig>("artworkUpload"),
+		}
+	}
+}
+
+export const imageOptimizerService = ImageOptimizerService.getInstance()
@@ -1,17 +1,55 @@
+import { createHash } from "node:crypto"
 import { promises as fs } from "node:fs"
+import { join } from "node:path"
 import { fileURLToPath } from "node:url"
+import { ARTWORK_PROTOCOL } from "@shared/constants"
+import type { ImageCacheStats } from "@shared/types/media"
+import { app, protocol } from "electron"
 import { logger } from "./logger"
 
+/** Decoded image bytes kept in memory across all entries */
+const MAX_MEMORY_BYTES = 32 * 1024 * 1024
+/** Images kept on disk across all entries */
+const MAX_DISK_BYTES = 256 * 1024 * 1024
+/** How often stale entries are swept */
+const SWEEP_INTERVAL = 10 * 60 * 1000
+/** Artwork URLs handed out to the renderer that stay resolvable */
+const MAX_ARTWORK_SOURCES = 1000
+
+interface CachedImage {
+	buffer: Buffer
+	contentType: string
+	timestamp: number // Seconds since epoch when the image was fetched
+}
+
 /**
- * Service for proxying images from various sources to data URLs
- * to avoid Content Security Policy restrictions
+ * Service for proxying images from various sources to the renderer
+ * through the `vlcrpc-art://` protocol, avoiding Content Security Policy
+ * restrictions without shipping base64 data URLs over IPC
+ *
+ * Fetched images are kept as raw bytes in an LRU bounded by total size.
+ * Entries pushed out of memory spill to a disk cache under `userData`,
+ * keyed by the SHA-256 of the source, and stale entries are swept in the
+ * background.
  */
 export class ImageProxyService {
 	private static instance: ImageProxyService | null = null
-	private cache: Map<string, { dataUrl: string; timestamp: number }> = new Map()
+	// Map iteration order doubles as the LRU order, oldest first
+	private cache: Map<string, CachedImage> = new Map()
+	// Source hash -> source, only sources handed out by getArtworkUrl can be served
+	private artworkSources: Map<string, string> = new Map()
+	private memoryBytes = 0
 	private readonly cacheTtl = 3600 // Cache TTL in seconds (1 hour)
+	private readonly diskDir: string
+	private sweepTimer: NodeJS.Timeout
+	private stats = { hits: 0, diskHits: 0, misses: 0, evictions: 0 }
 
 	private constructor() {
+		this.diskDir = join(app.getPath("userData"), "image-cache")
+		this.sweepTimer = setInterval(() => {
+			this.sweep().catch((error) => logger.warn(`Image cache sweep failed: ${error}`))
+		}, SWEEP_INTERVAL)
+		this.sweepTimer.unref()
 		logger.info("Image proxy service initialized")
 	}
 
@@ -26,19 +64,132 @@ export class ImageProxyService {
 	}
 
 	/**
-	 * Convert a URL or file path to a data URL
+	 * Register the artwork scheme as privileged, must run before the app is ready
+	 */
+	public static registerScheme(): void {
+		protocol.registerSchemesAsPrivileged([
+			{
+				scheme: ARTWORK_PROTOCOL,
+				privileges: { standard: true, secure: true, supportFetchAPI: true },
+			},
+		])
+	}
+
+	/**
+	 * Serve proxied images on the artwork scheme, must run once the app is ready
 	 */
-	public async getImageAsDataUrl(source: string | null | undefined): Promise<string | null> {
+	public registerProtocol(): void {
+		protocol.handle(ARTWORK_PROTOCOL, (request) => this.handleArtworkRequest(request))
+		logger.info(`Registered ${ARTWORK_PROTOCOL}:// protocol`)
+	}
+
+	/**
+	 * Get a `vlcrpc-art://` URL the renderer can load a URL or file path from
+	 */
+	public getArtworkUrl(source: string | null | undefined): string | null {
 		if (!source) {
 			return null
 		}
 
+		if (source.startsWith(`${ARTWORK_PROTOCOL}:`)) {
+			return source
+		}
+
+		const hash = this.hashSource(source)
+		this.artworkSources.delete(hash)
+		this.artworkSources.set(hash, source)
+
+		if (this.artworkSources.size > MAX_ARTWORK_SOURCES) {
+			const oldest = this.artworkSources.keys().next().value
+			if (oldest !== undefined) {
+				this.artworkSources.delete(oldest)
+			}
+		}
+
+		return `${ARTWORK_PROTOCOL}://artwork/${hash}`
+	}
+
+	/**
+	 * Clear the cache
+	 */
+	public clearCache(): void {
+		this.cache.clear()
+		this.memoryBytes = 0
+		fs.rm(this.diskDir, { recursive: true, force: true }).catch((error) => {
+			logger.warn(`Could not clear image disk cache: ${error}`)
+		})
+		logger.info("Image proxy cache cleared")
+	}
+
+	/**
+	 * Get cache hit, miss and eviction counters
+	 */
+	public getCacheStats(): ImageCacheStats {
+		return {
+			...this.stats,
+			entries: this.cache.size,
+			memoryBytes: this.memoryBytes,
+			maxMemoryBytes: MAX_MEMORY_BYTES,
+		}
+	}
+
+	/**
+	 * Answer a request on the artwork scheme straight from the image cache
+	 */
+	private async handleArtworkRequest(request: Request): Promise<Response> {
+		const hash = new URL(request.url).pathname.replace(/^\//, "")
+		const source = this.artworkSources.get(hash)
+		if (!source) {
+			return new Response(null, { status: 404 })
+		}
+
+		const image = await this.getImage(source)
+		if (!image) {
+			return new Response(null, { status: 404 })
+		}
+
+		const etag = `"${hash.slice(0, 16)}-${image.timestamp}"`
+		const headers = {
+			ETag: etag,
+			"Cache-Control": `private, max-age=${this.cacheTtl}`,
+		}
+
+		if (request.headers.get("If-None-Match") === etag) {
+			return new Response(null, { status: 304, headers })
+		}
+
+		return new Response(image.buffer, {
+			status: 200,
+			headers: { ...headers, "Content-Type": image.contentType },
+		})
+	}
+
+	/**
+	 * Get image bytes from memory, then disk, then the source itself
+	 */
+	private async getImage(source: string): Promise<CachedImage | null> {
 		const cached = this.cache.get(source)
-		if (cached && Date.now() / 1000 - cached.timestamp < this.cacheTtl) {
-			logger.info(`Using cached image data for: ${this.sanitizeUrl(source)}`)
-			return cached.dataUrl
+		if (cached && this.isFresh(cached.timestamp)) {
+			// Refresh the LRU position
+			this.cache.delete(source)
+			this.cache.set(source, cached)
+			this.stats.hits++
+			logger.debug(() => `Using cached image data for: ${this.sanitizeUrl(source)}`)
+			return cached
+		}
+		if (cached) {
+			this.remove(source)
 		}
 
+		const spilled = await this.readFromDisk(source)
+		if (spilled) {
+			this.stats.diskHits++
+			this.store(source, spilled)
+			return spilled
+		}
+
+		this.stats.misses++
+
 		try {
 			let buffer: Buffer
 			let contentType: string
@@ -68,28 +219,174 @@ export class ImageProxyService {
 				return null
 			}
 
-			const dataUrl = `data:${contentType};base64,${buffer.toString("base64")}`
-
-			this.cache.set(source, {
-				dataUrl,
+			const image: CachedImage = {
+				buffer,
+				contentType,
 				timestamp: Math.floor(Date.now() / 1000),
-			})
-
-			return dataUrl
+			}
+			this.store(source, image)
+			return image
 		} catch (error) {
 			logger.error(
-				`Error converting image to data URL: ${error}, Source: ${this.sanitizeUrl(source)}`,
+				`Error loading image: ${error}, Source: ${this.sanitizeUrl(source)}`,
 			)
 			return null
 		}
 	}
 
 	/**
-	 * Clear the cache
+	 * Add an image to the memory cache, spilling the least recently used
+	 * entries to disk until the byte budget is met
 	 */
-	public clearCache(): void {
-		this.cache.clear()
-		logger.info("Image proxy cache cleared")
+	private store(source: string, image: CachedImage): void {
+		this.remove(source)
+
+		if (image.buffer.length > MAX_MEMORY_BYTES) {
+			this.writeToDisk(source, image)
+			return
+		}
+
+		this.cache.set(source, image)
+		this.memoryBytes += image.buffer.length
+
+		for (const [oldestSource, oldest] of this.cache) {
+			if (this.memoryBytes <= MAX_MEMORY_BYTES) {
+				break
+			}
+			this.remove(oldestSource)
+			this.stats.evictions++
+			this.writeToDisk(oldestSource, oldest)
+		}
+	}
+
+	private remove(source: string): void {
+		const existing = this.cache.get(source)
+		if (existing) {
+			this.memoryBytes -= existing.buffer.length
+			this.cache.delete(source)
+		}
+	}
+
+	private isFresh(timestamp: number): boolean {
+		return Date.now() / 1000 - timestamp < this.cacheTtl
+	}
+
+	/**
+	 * Path of the disk cache file for a source
+	 */
+	private getDiskPath(source: string): string {
+		return join(this.diskDir, this.hashSource(source))
+	}
+
+	private hashSource(source: string): string {
+		return createHash("sha256").update(source).digest("hex")
+	}
+
+	/**
+	 * Write an evicted image to disk as `<content type>\n<bytes>`
+	 */
+	private writeToDisk(source: string, image: CachedImage): void {
+		if (!this.isFresh(image.timestamp)) {
+			return
+		}
+
+		const filePath = this.getDiskPath(source)
+		const header = Buffer.from(`${image.contentType}\n`)
+		fs.mkdir(this.diskDir, { recursive: true })
+			.then(() => fs.writeFile(filePath, Buffer.concat([header, image.buffer])))
+			.then(() => {
+				// Keep the fetch time so the TTL still applies on disk
+				const fetchedAt = new Date(image.timestamp * 1000)
+				return fs.utimes(filePath, fetchedAt, fetchedAt)
+			})
+			.catch((error) => {
+				logger.warn(`Could not spill image to disk: ${error}`)
+			})
+	}
+
+	/**
+	 * Read a spilled image back from disk if it is still fresh
+	 */
+	private async readFromDisk(source: string): Promise<CachedImage | null> {
+		const filePath = this.getDiskPath(source)
+
+		try {
+			const stat = await fs.stat(filePath)
+			const timestamp = Math.floor(stat.mtimeMs / 1000)
+			if (!this.isFresh(timestamp)) {
+				await fs.unlink(filePath)
+				return null
+			}
+
+			const data = await fs.readFile(filePath)
+			const separator = data.indexOf(0x0a)
+			if (separator === -1) {
+				return null
+			}
+
+			return {
+				contentType: data.subarray(0, separator).toString("utf-8"),
+				buffer: data.subarray(separator + 1),
+				timestamp,
+			}
+		} catch {
+			return null
+		}
+	}
+
+	/**
+	 * Drop expired entries from memory and disk, and trim the disk cache
+	 * to its byte budget, oldest first
+	 */
+	private async sweep(): Promise<void> {
+		for (const [source, image] of this.cache) {
+			if (!this.isFresh(image.timestamp)) {
+				this.remove(source)
+			}
+		}
+
+		let names: string[]
+		try {
+			names = await fs.readdir(this.diskDir)
+		} catch {
+			return
+		}
+
+		const files: Array<{ path: string; size: number; mtimeMs: number }> = []
+		let removed = 0
+		for (const name of names) {
+			const filePath = join(this.diskDir, name)
+			try {
+				const stat = await fs.stat(filePath)
+				if (this.isFresh(Math.floor(stat.mtimeMs / 1000))) {
+					files.push({ path: filePath, size: stat.size, mtimeMs: stat.mtimeMs })
+				} else {
+					await fs.unlink(filePath)
+					removed++
+				}
+			} catch {
+				// File vanished in the meantime
+			}
+		}
+
+		let diskBytes = files.reduce((total, file) => total + file.size, 0)
+		files.sort((a, b) => a.mtimeMs - b.mtimeMs)
+		for (const file of files) {
+			if (diskBytes <= MAX_DISK_BYTES) {
+				break
+			}
+			try {
+				await fs.unlink(file.path)
+				diskBytes -= file.size
+				removed++
+			} catch {
+				// File vanished in the meantime
+			}
+		}
+
+		if (removed > 0) {
+			logger.info(`Swept ${removed} stale images from the disk cache`)
+		}
 	}
 
 	/**
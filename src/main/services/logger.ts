@@ -1,21 +1,58 @@
+import { app } from "electron"
 import { Logger as ElectronWinston } from "electron-winston/main"
 
+type LogLevelName = "error" | "warn" | "info" | "debug" | "trace"
+
+/**
+ * A log message, or a function building it that only runs when the level is enabled
+ */
+type LogMessage = string | (() => string)
+
+const LEVELS: Record<LogLevelName, number> = { error: 0, warn: 1, info: 2, debug: 3, trace: 4 }
+
+/** Queued lines are handed to the transports together after this delay */
+const FLUSH_DELAY = 250
+/** Flush right away once this many lines are queued */
+const MAX_QUEUED = 500
+
+interface QueuedLine {
+	level: Exclude<LogLevelName, "error">
+	text: string
+}
+
 /**
  * Logger service for the application
+ *
+ * Lines below the active level cost a comparison: messages and arguments
+ * given as functions are never called, and arguments are only serialized
+ * for enabled levels. The level is `info` unless set with `--log-level=<level>`
+ * or the `VLC_RPC_LOG_LEVEL` environment variable. Lines are queued and
+ * handed to the transports in batches, errors go out at once along with
+ * everything queued before them.
  */
 class LoggerService {
 	private static instance: LoggerService | null = null
 	private logger: ElectronWinston
+	private level: number
+	private queue: QueuedLine[] = []
+	private flushTimer: NodeJS.Timeout | null = null
 
 	private constructor() {
+		const levelName = this.resolveLevel()
+		this.level = LEVELS[levelName]
+
+		// Winston has no trace level, trace lines go out as debug
+		const transportLevel = this.level >= LEVELS.debug ? "debug" : levelName
 		this.logger = new ElectronWinston({
-			fileLogLevel: "info",
-			consoleLogLevel: "info",
+			fileLogLevel: transportLevel,
+			consoleLogLevel: transportLevel,
 			handleExceptions: true,
 			handleRejections: true,
 		})
 
 		this.logger.registerRendererListener()
+		app.on("before-quit", () => this.flush())
+		process.on("exit", () => this.flush())
 	}
 
 	public static getInstance(): LoggerService {
@@ -25,16 +62,92 @@ class LoggerService {
 		return LoggerService.instance
 	}
 
-	public error(message: string, ...args: unknown[]): void {
-		this.logger.error(`${message} ${args.length ? JSON.stringify(args) : ""}`)
+	/**
+	 * Whether lines at a level are written, for work that only feeds a log line
+	 */
+	public isEnabled(level: LogLevelName): boolean {
+		return LEVELS[level] <= this.level
+	}
+
+	public error(message: LogMessage, ...args: unknown[]): void {
+		// Keep the order of lines queued before the error
+		this.flush()
+		this.logger.error(this.format(message, args))
+	}
+
+	public warn(message: LogMessage, ...args: unknown[]): void {
+		this.write("warn", message, args)
+	}
+
+	public info(message: LogMessage, ...args: unknown[]): void {
+		this.write("info", message, args)
+	}
+
+	public debug(message: LogMessage, ...args: unknown[]): void {
+		this.write("debug", message, args)
 	}
 
-	public warn(message: string, ...args: unknown[]): void {
-		this.logger.warn(`${message} ${args.length ? JSON.stringify(args) : ""}`)
+	public trace(message: LogMessage, ...args: unknown[]): void {
+		this.write("trace", message, args)
+	}
+
+	/**
+	 * Hand every queued line to the transports
+	 */
+	public flush(): void {
+		if (this.flushTimer !== null) {
+			clearTimeout(this.flushTimer)
+			this.flushTimer = null
+		}
+
+		const lines = this.queue
+		this.queue = []
+		for (const { level, text } of lines) {
+			if (level === "warn") {
+				this.logger.warn(text)
+			} else if (level === "info") {
+				this.logger.info(text)
+			} else {
+				this.logger.debug(level === "trace" ? `[trace] ${text}` : text)
+			}
+		}
+	}
+
+	private write(level: QueuedLine["level"], message: LogMessage, args: unknown[]): void {
+		if (LEVELS[level] > this.level) {
+			return
+		}
+
+		this.queue.push({ level, text: this.format(message, args) })
+
+		if (this.queue.length >= MAX_QUEUED) {
+			this.flush()
+		} else if (this.flushTimer === null) {
+			this.flushTimer = setTimeout(() => this.flush(), FLUSH_DELAY)
+		}
+	}
+
+	/**
+	 * Build the line now, so later changes to logged objects don't show up in it
+	 */
+	private format(message: LogMessage, args: unknown[]): string {
+		const text = typeof message === "function" ? message() : message
+		if (args.length === 0) {
+			return text
+		}
+
+		const values = args.map((arg) => (typeof arg === "function" ? arg() : arg))
+		try {
+			return `${text} ${JSON.stringify(values.length === 1 ? values[0] : values)}`
+		} catch {
+			return `${text} [unserializable]`
+		}
 	}
 
-	public info(message: string, ...args: unknown[]): void {
-		this.logger.info(`${message} ${args.length ? JSON.stringify(args) : ""}`)
+	private resolveLevel(): LogLevelName {
+		const flag = process.argv.find((arg) => arg.startsWith("--log-level="))
+		const requested = (flag?.split("=")[1] ?? process.env.VLC_RPC_LOG_LEVEL ?? "").toLowerCase()
+		return Object.keys(LEVELS).includes(requested) ? (requested as LogLevelName) : "info"
 	}
 }
 
@@ -1,354 +1,434 @@
 import { applyTemplate, getDefaultLayout, getLayoutByPreset } from "@shared/constants/layouts"
 import type { AppConfig } from "@shared/types"
-import type { DetectedMediaInfo, DiscordPresenceData } from "@shared/types/media"
-import type { VlcStatus } from "@shared/types/vlc"
+import type {
+	DiscordPresenceData,
+	MediaStatus,
+	MediaTransition,
+	MediaTransitionType,
+} from "@shared/types/media"
+import type { VlcStatus, VlcStatusChange } from "@shared/types/vlc"
 import { ActivityType } from "discord-api-types/v10"
 import { configService } from "./config"
 import { coverArtService } from "./cover-art"
 import { logger } from "./logger"
-import { VideoAnalyzerService } from "./video-analyzer"
+import { metricsService } from "./metrics"
+import { type VideoAnalysis, videoAnalyzerService } from "./video-analyzer"
+
+/** Settings the presence text and images are built from */
+const PRESENCE_CONFIG_KEYS: readonly (keyof AppConfig)[] = [
+	"presenceLayout",
+	"layoutPreset",
+	"largeImage",
+	"playingImage",
+	"pausedImage",
+]
+
+/** How long a video presence waits for the filename parser before using basic analysis */
+const PARSER_READY_DEADLINE = 1500
 
 /**
- * Base class for media states
+ * Callback invoked with every transition of the media state machine
  */
-abstract class MediaState {
-	protected formatText(text: string, maxLength = 128): string {
-		if (!text) return ""
-		if (text.length > maxLength) {
-			return `${text.substring(0, maxLength - 3)}...`
-		}
-		return text
-	}
+export type MediaTransitionListener = (transition: MediaTransition) => void
 
-	public abstract updatePresence(mediaInfo: VlcStatus | null): Promise<DiscordPresenceData | null>
+/**
+ * What's known about the current media, worked out once per track
+ */
+interface ResolvedMedia {
+	/** Settings the text was templated with */
+	configKey: string
+	/** Artwork URL VLC reported when the artwork was looked up */
+	artworkSource: string | undefined
+	artworkUrl: string | null
+	/** Whether the video was analyzed with the filename parser loaded */
+	analysisComplete: boolean
+	/** Presence for each playback state, without timestamps */
+	playing: DiscordPresenceData
+	paused: DiscordPresenceData
 }
 
-class StoppedState extends MediaState {
-	public async updatePresence(_mediaInfo: VlcStatus | null): Promise<DiscordPresenceData | null> {
-		logger.info("Cleared presence (VLC stopped)")
-		return null
-	}
+/**
+ * Key of the settings that shape the presence, the presence text is built
+ * again when it changes
+ */
+export function getPresenceConfigKey(): string {
+	return configService.fingerprint(PRESENCE_CONFIG_KEYS)
 }
 
-class NoStatusState extends MediaState {
-	public async updatePresence(_mediaInfo: VlcStatus | null): Promise<DiscordPresenceData | null> {
-		logger.info("Cleared presence (no status data)")
-		return null
+function formatText(text: string, maxLength = 128): string {
+	if (!text) return ""
+	if (text.length > maxLength) {
+		return `${text.substring(0, maxLength - 3)}...`
 	}
+	return text
 }
 
-class PlayingState extends MediaState {
-	public async updatePresence(mediaInfo: VlcStatus | null): Promise<DiscordPresenceData | null> {
-		if (!mediaInfo) {
-			return null
-		}
-
-		const config = configService.get<AppConfig>()
-		const currentTime = Math.floor(Date.now() / 1000)
+function getEpisodeInfo(analysis: Readonly<VideoAnalysis>): string {
+	if (!analysis.isTvShow) {
+		return ""
+	}
+	if (analysis.season && analysis.episode) {
+		return `S${analysis.season}E${analysis.episode}`
+	}
+	if (analysis.season) {
+		return `Season ${analysis.season}`
+	}
+	if (analysis.episode) {
+		return `Episode ${analysis.episode}`
+	}
+	return ""
+}
 
-		// Use the media info directly since VLC status service already provides reliable type detection
-		const detectedInfo = mediaInfo as VlcStatus & DetectedMediaInfo
+/**
+ * State machine turning VLC statuses into Discord presence
+ *
+ * Keeps the playback state and the identity of the playing media, and
+ * turns each status into at most one transition: `trackChanged`, `paused`,
+ * `resumed`, `seeked` or `stopped`. Analysis, artwork lookup and layout
+ * templating run on `trackChanged` only, the presence for both playing and
+ * paused is built then. The other transitions swap between the two and
+ * recompute timestamps, and statuses without a transition get the previous
+ * presence back as is, Discord advances the timestamps on its own.
+ */
+export class MediaStateService {
+	private static instance: MediaStateService | null = null
+	private state: MediaStatus = "stopped"
+	private mediaKey: string | null = null
+	private resolved: Promise<ResolvedMedia> | null = null
+	private presence: DiscordPresenceData | null = null
+	private presenceSource: ResolvedMedia | null = null
+	private listeners: Set<MediaTransitionListener> = new Set()
 
-		const media = detectedInfo.media
-		const mediaType = detectedInfo.mediaType || "unknown"
+	private constructor() {
+		logger.info("Media state service initialized")
+	}
 
-		// Simple activity type detection based on VLC's media type
-		const activityType = mediaType === "video" ? ActivityType.Watching : ActivityType.Listening
+	public static getInstance(): MediaStateService {
+		if (!MediaStateService.instance) {
+			MediaStateService.instance = new MediaStateService()
+		}
+		return MediaStateService.instance
+	}
 
-		logger.info(
-			`Activity type: ${activityType === ActivityType.Watching ? "WATCHING" : "LISTENING"} for media type: ${mediaType}`,
-		)
+	/**
+	 * Subscribe to transitions
+	 *
+	 * @returns Function that removes the subscription
+	 */
+	public onTransition(listener: MediaTransitionListener): () => void {
+		this.listeners.add(listener)
+		return () => {
+			this.listeners.delete(listener)
+		}
+	}
 
-		// Get the layout configuration
-		const layout =
-			config.presenceLayout ||
-			(config.layoutPreset ? getLayoutByPreset(config.layoutPreset) : getDefaultLayout())
+	/**
+	 * Current playback state
+	 */
+	public getState(): MediaStatus {
+		return this.state
+	}
 
-		let details = ""
-		let state = ""
+	/**
+	 * @param change - What the status reader saw change since the previous status
+	 */
+	public async getDiscordPresence(
+		vlcStatus: VlcStatus | null,
+		change: VlcStatusChange,
+	): Promise<DiscordPresenceData | null> {
+		const transition = this.advance(vlcStatus, change)
+		if (transition) {
+			this.emit(transition)
+		}
 
-		if (activityType === ActivityType.Listening) {
-			// For music, use customizable layout
-			const variables = {
-				title: media.title || "Unknown Song",
-				artist: media.artist || "Unknown Artist",
-				album: media.album || "",
+		if (!vlcStatus || this.state === "stopped") {
+			if (transition) {
+				logger.debug(`Cleared presence (${vlcStatus ? "VLC stopped" : "no status data"})`)
 			}
+			return null
+		}
 
-			details = applyTemplate(layout.musicDetails, variables)
-			state = applyTemplate(layout.musicState, variables)
-		} else {
-			// For video content, analyze the video and provide richer information
-			const videoAnalyzer = VideoAnalyzerService.getInstance()
-			const videoAnalysis = videoAnalyzer.analyzeVideo(mediaInfo)
-
-			let episodeInfo = ""
-			if (videoAnalysis.isTvShow) {
-				if (videoAnalysis.season && videoAnalysis.episode) {
-					episodeInfo = `S${videoAnalysis.season}E${videoAnalysis.episode}`
-				} else if (videoAnalysis.season) {
-					episodeInfo = `Season ${videoAnalysis.season}`
-				} else if (videoAnalysis.episode) {
-					episodeInfo = `Episode ${videoAnalysis.episode}`
-				}
-			}
+		return metricsService.timeAsync("presence.build_ms", async () => {
+			const resolved = await this.resolve(vlcStatus, transition?.type === "trackChanged")
 
-			const variables = {
-				title: videoAnalysis.title,
-				episodeInfo: episodeInfo || (videoAnalysis.isTvShow ? "TV Show" : "Movie"),
-				year: videoAnalysis.year || "",
-				season: videoAnalysis.season?.toString() || "",
-				episode: videoAnalysis.episode?.toString() || "",
+			if (transition || resolved !== this.presenceSource || !this.presence) {
+				const presence = this.compose(resolved, vlcStatus)
+				this.presence = presence
+				this.presenceSource = resolved
+				logger.debug(
+					() => `Updated presence (${this.state}): ${presence.details} - ${presence.state}`,
+				)
 			}
+			return this.presence
+		})
+	}
 
-			details = applyTemplate(layout.videoDetails, variables)
-			state = applyTemplate(layout.videoState, variables)
+	/**
+	 * Move the machine to the state of a status
+	 *
+	 * Seeks are spotted by the status reader, which reports them as a `seek` change.
+	 *
+	 * @returns The transition taken, null when nothing but the position moved as expected
+	 */
+	private advance(vlcStatus: VlcStatus | null, change: VlcStatusChange): MediaTransition | null {
+		const from = this.state
+		const to = this.getPlaybackState(vlcStatus)
+		const mediaKey = vlcStatus && to !== "stopped" ? this.getMediaKey(vlcStatus) : null
+		const time = vlcStatus?.playback.time ?? 0
+
+		let type: MediaTransitionType | null = null
+		if (to === "stopped") {
+			type = from !== "stopped" ? "stopped" : null
+		} else if (from === "stopped" || mediaKey !== this.mediaKey) {
+			type = "trackChanged"
+		} else if (from === "playing" && to === "paused") {
+			type = "paused"
+		} else if (from === "paused" && to === "playing") {
+			type = "resumed"
+		} else if (change === "seek") {
+			type = "seeked"
 		}
 
-		details = this.formatText(details)
-		state = this.formatText(state)
+		this.state = to
+		this.mediaKey = mediaKey
 
-		let startTimestamp: number | undefined
-		let endTimestamp: number | undefined
+		if (to === "stopped") {
+			this.resolved = null
+			this.presence = null
+			this.presenceSource = null
+		}
 
-		const playback = mediaInfo.playback
+		return type ? { type, from, to, mediaKey, position: time } : null
+	}
 
-		if (playback) {
-			const duration = playback.duration
-			const position = playback.time
+	private emit(transition: MediaTransition): void {
+		metricsService.increment(`media.transitions.${transition.type}`)
+		logger.debug(() => `Media ${transition.type} (${transition.from} -> ${transition.to})`)
 
-			if (position >= 0 && duration > 0 && duration < 86400) {
-				startTimestamp = currentTime - position
-				endTimestamp = currentTime + (duration - position)
-			} else {
-				startTimestamp = currentTime
+		for (const listener of this.listeners) {
+			try {
+				listener(transition)
+			} catch (error) {
+				logger.error(`Media transition listener failed: ${error}`)
 			}
 		}
+	}
 
-		let smallText = config.playingImage
-		let largeImage = config.largeImage
-		let largeText = "VLC Media Player"
-
-		// Use artwork from VLC if available
-		if (media.artworkUrl) {
-			largeImage = media.artworkUrl
-		}
-
-		// Set appropriate large text based on media type
-		if (activityType === ActivityType.Listening) {
-			// Use album name if available, otherwise fallback to "Listening to Music"
-			largeText = media.album || "Listening to Music"
-		} else {
-			largeText = "Watching Video"
+	private getPlaybackState(vlcStatus: VlcStatus | null): MediaStatus {
+		if (!vlcStatus?.active) {
+			return "stopped"
 		}
+		return vlcStatus.status === "playing" || vlcStatus.status === "paused"
+			? vlcStatus.status
+			: "stopped"
+	}
 
-		const videoInfo = detectedInfo.videoInfo
-		if (mediaType === "video" && videoInfo && videoInfo.width && videoInfo.height) {
-			const resolution = `${videoInfo.width}x${videoInfo.height}`
-			smallText += ` • ${resolution}`
-		}
+	/**
+	 * Identity of the media, the fields a track change shows up in
+	 */
+	private getMediaKey(vlcStatus: VlcStatus): string {
+		const { media } = vlcStatus
+		return JSON.stringify([
+			vlcStatus.mediaType,
+			vlcStatus.playlistId ?? null,
+			media.title,
+			media.artist,
+			media.album,
+		])
+	}
 
-		if (mediaType === "audio" && media) {
-			const coverArtUrl = await coverArtService.fetch(mediaInfo)
-			if (coverArtUrl) {
-				largeImage = coverArtUrl
+	/**
+	 * Get the resolved media, working it out again on a track change
+	 *
+	 * Outside track changes, the text is templated again when the presence
+	 * settings changed or the filename parser finished loading since, and
+	 * artwork is only looked up again when VLC reports different artwork.
+	 */
+	private async resolve(vlcStatus: VlcStatus, trackChanged: boolean): Promise<ResolvedMedia> {
+		const configKey = getPresenceConfigKey()
+		let artworkUrl: string | null | undefined
+
+		if (!trackChanged && this.resolved) {
+			const current = await this.resolved
+			const artworkChanged = current.artworkSource !== vlcStatus.media.artworkUrl
+			const analysisOutdated = !current.analysisComplete && videoAnalyzerService.isReady()
+
+			if (current.configKey === configKey && !artworkChanged && !analysisOutdated) {
+				return current
 			}
-		}
-
-		// For video content, try to fetch cover art from Google
-		if (mediaType === "video" && media) {
-			const videoCoverUrl = await coverArtService.fetchVideoImageFromGoogle(mediaInfo)
-			if (videoCoverUrl) {
-				largeImage = videoCoverUrl
-				logger.info(`Using video cover from Google: ${videoCoverUrl}`)
+			if (!artworkChanged) {
+				artworkUrl = current.artworkUrl
 			}
 		}
 
-		const presenceData: DiscordPresenceData = {
-			details,
-			state,
-			large_image: largeImage,
-			large_text: largeText,
-			small_image: config.playingImage,
-			small_text: smallText,
-			start_timestamp: startTimestamp,
-			end_timestamp: endTimestamp,
-			activity_type: activityType,
+		// Only copied once the media has to be worked out again
+		const config = configService.get<AppConfig>()
+		const resolved = metricsService.timeAsync("presence.resolve_ms", () =>
+			this.resolveMedia(vlcStatus, config, configKey, artworkUrl),
+		)
+		this.resolved = resolved
+
+		try {
+			return await resolved
+		} catch (error) {
+			// Let the next status try again
+			if (this.resolved === resolved) {
+				this.resolved = null
+			}
+			throw error
 		}
+	}
 
-		// Set custom activity name based on layout configuration
-		if (activityType === ActivityType.Listening && layout.activityName) {
-			const activityNameVariables = {
-				title: media.title || "Unknown Song",
-				artist: media.artist || "Unknown Artist",
-				album: media.album || "",
+	/**
+	 * @param artworkUrl - Artwork found earlier for the same media, looked up when undefined
+	 */
+	private async resolveMedia(
+		vlcStatus: VlcStatus,
+		config: AppConfig,
+		configKey: string,
+		artworkUrl: string | null | undefined,
+	): Promise<ResolvedMedia> {
+		let analysis: Readonly<VideoAnalysis> | null = null
+		let analysisComplete = true
+
+		// A presence built from the basic analysis would show a wrong title until the next track
+		if (vlcStatus.mediaType === "video") {
+			analysisComplete = await videoAnalyzerService.whenReady(PARSER_READY_DEADLINE)
+			if (!analysisComplete) {
+				logger.warn("Filename parser not ready in time, using basic video analysis")
 			}
-			presenceData.name = applyTemplate(layout.activityName, activityNameVariables)
+			analysis = videoAnalyzerService.analyzeVideo(vlcStatus)
 		}
 
-		const activityName = activityType === ActivityType.Watching ? "Watching" : "Listening to"
-		logger.info(`Updated presence: ${activityName} ${details} - ${state}`)
-
-		return presenceData
+		// Cover art for audio, poster art for video
+		const resolvedArtwork =
+			artworkUrl !== undefined ? artworkUrl : await coverArtService.fetch(vlcStatus)
+
+		return {
+			configKey,
+			artworkSource: vlcStatus.media.artworkUrl,
+			artworkUrl: resolvedArtwork,
+			analysisComplete,
+			playing: this.buildPlayingPresence(vlcStatus, config, analysis, resolvedArtwork),
+			paused: this.buildPausedPresence(vlcStatus, config, analysis, resolvedArtwork),
+		}
 	}
-}
 
-class PausedState extends MediaState {
-	public async updatePresence(mediaInfo: VlcStatus | null): Promise<DiscordPresenceData | null> {
-		if (!mediaInfo) {
-			return null
+	/**
+	 * The presence for the current state, with timestamps while playing
+	 */
+	private compose(resolved: ResolvedMedia, vlcStatus: VlcStatus): DiscordPresenceData {
+		if (this.state === "paused") {
+			return resolved.paused
 		}
 
-		const config = configService.get<AppConfig>()
-
-		// Use the media info directly since VLC status service already provides reliable type detection
-		const detectedInfo = mediaInfo as VlcStatus & DetectedMediaInfo
-
-		const media = detectedInfo.media
-		const mediaType = detectedInfo.mediaType || "unknown"
-
-		// Simple activity type detection based on VLC's media type
-		const activityType = mediaType === "video" ? ActivityType.Watching : ActivityType.Listening
-
-		logger.info(
-			`Paused activity type: ${activityType === ActivityType.Watching ? "WATCHING" : "LISTENING"} for media type: ${mediaType}`,
-		)
-
-		let details = ""
-		let state = ""
+		const presence: DiscordPresenceData = { ...resolved.playing }
+		const currentTime = Math.floor(Date.now() / 1000)
+		const { duration, time: position } = vlcStatus.playback
 
-		if (activityType === ActivityType.Listening) {
-			details = media.title || "Unknown Song"
-			state = `by ${media.artist || "Unknown Artist"}`
+		if (position >= 0 && duration > 0 && duration < 86400) {
+			presence.start_timestamp = currentTime - position
+			presence.end_timestamp = currentTime + (duration - position)
 		} else {
-			// For video content, analyze the video and provide richer information
-			const videoAnalyzer = VideoAnalyzerService.getInstance()
-			const videoAnalysis = videoAnalyzer.analyzeVideo(mediaInfo)
-
-			if (videoAnalysis.isTvShow) {
-				// TV Show: Show name as details, episode info as state
-				details = videoAnalysis.title
-
-				let episodeInfo = ""
-				if (videoAnalysis.season && videoAnalysis.episode) {
-					episodeInfo = `S${videoAnalysis.season}E${videoAnalysis.episode}`
-				} else if (videoAnalysis.season) {
-					episodeInfo = `Season ${videoAnalysis.season}`
-				} else if (videoAnalysis.episode) {
-					episodeInfo = `Episode ${videoAnalysis.episode}`
-				}
-
-				state = episodeInfo || "TV Show"
-			} else {
-				// Movie: Movie title as details, year as state
-				details = videoAnalysis.title
-				state = videoAnalysis.year ? `(${videoAnalysis.year})` : "Movie"
-			}
+			presence.start_timestamp = currentTime
 		}
+		return presence
+	}
 
-		details = this.formatText(details)
-		state = this.formatText(state)
-
-		let smallText = "Paused"
-		let largeImage = config.largeImage
-		let largeText = "VLC Media Player"
-
-		// Use artwork from VLC if available
-		if (media.artworkUrl) {
-			largeImage = media.artworkUrl
+	/**
+	 * Fields both playing and paused presence share
+	 */
+	private buildCommonPresence(
+		vlcStatus: VlcStatus,
+		config: AppConfig,
+		artworkUrl: string | null,
+	): DiscordPresenceData {
+		const { media, videoInfo } = vlcStatus
+		const isVideo = vlcStatus.mediaType === "video"
+
+		let resolution = ""
+		if (isVideo && videoInfo && videoInfo.width && videoInfo.height) {
+			resolution = ` • ${videoInfo.width}x${videoInfo.height}`
 		}
 
-		// Set appropriate large text based on media type
-		if (activityType === ActivityType.Listening) {
-			// Use album name if available, otherwise fallback to "Listening to Music"
-			largeText = media.album || "Listening to Music"
-		} else {
-			largeText = "Watching Video"
+		return {
+			// Artwork looked up for the media first, then what VLC reports
+			large_image: artworkUrl || media.artworkUrl || config.largeImage,
+			// Album name for music if available
+			large_text: isVideo ? "Watching Video" : media.album || "Listening to Music",
+			small_text: resolution,
+			activity_type: isVideo ? ActivityType.Watching : ActivityType.Listening,
 		}
+	}
 
-		const videoInfo = detectedInfo.videoInfo
-		if (mediaType === "video" && videoInfo && videoInfo.width && videoInfo.height) {
-			const resolution = `${videoInfo.width}x${videoInfo.height}`
-			smallText += ` • ${resolution}`
-		}
+	private buildPlayingPresence(
+		vlcStatus: VlcStatus,
+		config: AppConfig,
+		analysis: Readonly<VideoAnalysis> | null,
+		artworkUrl: string | null,
+	): DiscordPresenceData {
+		const { media } = vlcStatus
+		const layout =
+			config.presenceLayout ||
+			(config.layoutPreset ? getLayoutByPreset(config.layoutPreset) : getDefaultLayout())
+		const presence = this.buildCommonPresence(vlcStatus, config, artworkUrl)
 
-		if (mediaType === "audio" && media) {
-			const coverArtUrl = await coverArtService.fetch(mediaInfo)
-			if (coverArtUrl) {
-				largeImage = coverArtUrl
+		if (analysis) {
+			const episodeInfo = getEpisodeInfo(analysis)
+			const variables = {
+				title: analysis.title,
+				episodeInfo: episodeInfo || (analysis.isTvShow ? "TV Show" : "Movie"),
+				year: analysis.year || "",
+				season: analysis.season?.toString() || "",
+				episode: analysis.episode?.toString() || "",
 			}
-		}
 
-		// For video content, try to fetch cover art from Google
-		if (mediaType === "video" && media) {
-			const videoCoverUrl = await coverArtService.fetchVideoImageFromGoogle(mediaInfo)
-			if (videoCoverUrl) {
-				largeImage = videoCoverUrl
-				logger.info(`Using video cover from Google: ${videoCoverUrl}`)
+			presence.details = formatText(applyTemplate(layout.videoDetails, variables))
+			presence.state = formatText(applyTemplate(layout.videoState, variables))
+		} else {
+			const variables = {
+				title: media.title || "Unknown Song",
+				artist: media.artist || "Unknown Artist",
+				album: media.album || "",
 			}
-		}
-
-		const presenceData: DiscordPresenceData = {
-			details,
-			state,
-			large_image: largeImage,
-			large_text: largeText,
-			small_image: config.pausedImage,
-			small_text: smallText,
-			activity_type: activityType,
-		}
-
-		const activityName = activityType === ActivityType.Watching ? "Watching" : "Listening to"
-		logger.info(`Updated presence (paused): ${activityName} ${details} - ${state}`)
-
-		return presenceData
-	}
-}
-
-/**
- * Service to manage media state and update Discord presence
- */
-export class MediaStateService {
-	private static instance: MediaStateService | null = null
-	private states: Record<string, MediaState>
 
-	private constructor() {
-		this.states = {
-			stopped: new StoppedState(),
-			noStatus: new NoStatusState(),
-			playing: new PlayingState(),
-			paused: new PausedState(),
+			presence.details = formatText(applyTemplate(layout.musicDetails, variables))
+			presence.state = formatText(applyTemplate(layout.musicState, variables))
+			if (layout.activityName) {
+				presence.name = applyTemplate(layout.activityName, variables)
+			}
 		}
 
-		logger.info("Media state service initialized")
-	}
-
-	public static getInstance(): MediaStateService {
-		if (!MediaStateService.instance) {
-			MediaStateService.instance = new MediaStateService()
-		}
-		return MediaStateService.instance
+		presence.small_image = config.playingImage
+		presence.small_text = `${config.playingImage}${presence.small_text}`
+		return presence
 	}
 
-	public async getDiscordPresence(
-		vlcStatus: VlcStatus | null,
-	): Promise<DiscordPresenceData | null> {
-		if (!vlcStatus) {
-			return this.states.noStatus.updatePresence(null)
-		}
-
-		if (!vlcStatus.active) {
-			return this.states.stopped.updatePresence(vlcStatus)
+	private buildPausedPresence(
+		vlcStatus: VlcStatus,
+		config: AppConfig,
+		analysis: Readonly<VideoAnalysis> | null,
+		artworkUrl: string | null,
+	): DiscordPresenceData {
+		const { media } = vlcStatus
+		const presence = this.buildCommonPresence(vlcStatus, config, artworkUrl)
+
+		if (!analysis) {
+			presence.details = formatText(media.title || "Unknown Song")
+			presence.state = formatText(`by ${media.artist || "Unknown Artist"}`)
+		} else if (analysis.isTvShow) {
+			// TV Show: Show name as details, episode info as state
+			presence.details = formatText(analysis.title)
+			presence.state = formatText(getEpisodeInfo(analysis) || "TV Show")
+		} else {
+			// Movie: Movie title as details, year as state
+			presence.details = formatText(analysis.title)
+			presence.state = formatText(analysis.year ? `(${analysis.year})` : "Movie")
 		}
 
-		switch (vlcStatus.status) {
-			case "playing":
-				return this.states.playing.updatePresence(vlcStatus)
-			case "paused":
-				return this.states.paused.updatePresence(vlcStatus)
-			default:
-				return this.states.stopped.updatePresence(vlcStatus)
-		}
+		presence.small_image = config.pausedImage
+		presence.small_text = `Paused${presence.small_text}`
+		return presence
 	}
 }
 
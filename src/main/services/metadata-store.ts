@@ -0,0 +1,318 @@
+import { promises as fs } from "node:fs"
+import { join } from "node:path"
+import { configService } from "@main/services/config"
+import { ExpiryIndex } from "@main/services/expiry-index"
+import { logger } from "@main/services/logger"
+import type { FileMetadata } from "@shared/types"
+import { app } from "electron"
+
+/** Don't bother compacting logs shorter than this */
+const COMPACT_MIN_LINES = 1000
+/** Compact once the log holds this many lines per live entry */
+const COMPACT_RATIO = 2
+
+/**
+ * One line of the log, either a value for a key or its removal
+ */
+type LogRecord = { k: string; v: FileMetadata } | { k: string; d: 1 }
+
+/**
+ * Append-only store for per-file metadata
+ *
+ * Entries live in memory for O(1) reads, and every change is appended as a
+ * JSON line to `file-metadata.log` under `userData` instead of rewriting the
+ * whole config. A torn last line from a crash is skipped on load, and the
+ * log is compacted right away so later appends start on a fresh line. Once
+ * the log is mostly superseded records it is compacted into a snapshot
+ * written to a temp file and renamed over the log. Quitting waits for
+ * queued writes.
+ */
+export class MetadataStore {
+	private static instance: MetadataStore | null = null
+	private entries: Map<string, FileMetadata> = new Map()
+	private expiryIndex = new ExpiryIndex()
+	private liveBytes = 0
+	private loadPromise: Promise<void> | null = null
+	private pendingLines: string[] = []
+	private writeChain: Promise<void> = Promise.resolve()
+	private pendingWrites = 0
+	private quitFlushed = false
+	// The log ends in a partial line the next append has to step past
+	private tornTail = false
+	private logLines = 0
+	private readonly filePath: string
+
+	private constructor() {
+		this.filePath = join(app.getPath("userData"), "file-metadata.log")
+
+		app.on("before-quit", (event) => {
+			if (this.quitFlushed || this.pendingWrites === 0) {
+				return
+			}
+			// Hold the quit until batched records are on disk
+			event.preventDefault()
+			this.quitFlushed = true
+			this.flush().finally(() => app.quit())
+		})
+
+		logger.info("Metadata store initialized")
+	}
+
+	/**
+	 * Get the singleton instance of the metadata store
+	 */
+	public static getInstance(): MetadataStore {
+		if (!MetadataStore.instance) {
+			MetadataStore.instance = new MetadataStore()
+		}
+		return MetadataStore.instance
+	}
+
+	/**
+	 * Wait until the log has been loaded, loading it on first use
+	 */
+	public ready(): Promise<void> {
+		if (!this.loadPromise) {
+			this.loadPromise = this.load()
+		}
+		return this.loadPromise
+	}
+
+	public get(key: string): FileMetadata | undefined {
+		return this.entries.get(key)
+	}
+
+	public has(key: string): boolean {
+		return this.entries.has(key)
+	}
+
+	public get size(): number {
+		return this.entries.size
+	}
+
+	/**
+	 * Approximate serialized size of the live entries
+	 */
+	public get byteSize(): number {
+		return this.liveBytes
+	}
+
+	public all(): IterableIterator<[string, FileMetadata]> {
+		return this.entries.entries()
+	}
+
+	/**
+	 * Number of entries whose upload has expired
+	 */
+	public countExpired(now = Date.now()): number {
+		return this.expiryIndex.countExpired(now)
+	}
+
+	/**
+	 * Up to `limit` keys whose upload has expired
+	 */
+	public getExpiredKeys(limit: number, now = Date.now()): string[] {
+		return this.expiryIndex.getExpired(limit, now)
+	}
+
+	/**
+	 * Earliest upcoming expiry, null when nothing is left to expire
+	 */
+	public nextExpiry(): number | null {
+		return this.expiryIndex.nextExpiry()
+	}
+
+	public set(key: string, value: FileMetadata): void {
+		this.put(key, value)
+		this.append({ k: key, v: value })
+	}
+
+	public delete(key: string): void {
+		if (this.remove(key)) {
+			this.append({ k: key, d: 1 })
+		}
+	}
+
+	/**
+	 * Remove every entry and truncate the log
+	 */
+	public clear(): void {
+		this.entries.clear()
+		this.expiryIndex.clear()
+		this.liveBytes = 0
+		this.pendingLines = []
+		this.enqueue(() => this.compact())
+	}
+
+	/**
+	 * Wait until every change so far has reached the disk
+	 */
+	public flush(): Promise<void> {
+		return this.writeChain
+	}
+
+	/**
+	 * Read the log, replaying records in order, and migrate the legacy
+	 * `fileMetadata` config key on first start
+	 */
+	private async load(): Promise<void> {
+		let content = ""
+		try {
+			content = await fs.readFile(this.filePath, "utf-8")
+		} catch (error) {
+			const err = error as { code?: string }
+			if (err.code !== "ENOENT") {
+				logger.error(`Could not read metadata store: ${error}`)
+			}
+		}
+
+		// A write interrupted by a crash leaves a partial last line
+		let torn = content.length > 0 && !content.endsWith("\n")
+
+		for (const line of content.split("\n")) {
+			if (!line) {
+				continue
+			}
+			this.logLines++
+
+			let record: LogRecord
+			try {
+				record = JSON.parse(line)
+			} catch {
+				logger.warn("Skipping a corrupt metadata store record")
+				torn = true
+				continue
+			}
+
+			if ("d" in record) {
+				this.remove(record.k)
+			} else {
+				this.put(record.k, record.v)
+			}
+		}
+
+		const legacy = configService.get<Record<string, FileMetadata> | undefined>("fileMetadata")
+		if (torn && !(legacy && Object.keys(legacy).length > 0)) {
+			// Appending now would extend the corrupt line and lose the next record
+			try {
+				await this.compact()
+			} catch (error) {
+				logger.error(`Could not repair metadata store: ${error}`)
+				this.tornTail = !content.endsWith("\n")
+			}
+		}
+
+		if (legacy && Object.keys(legacy).length > 0) {
+			for (const [key, value] of Object.entries(legacy)) {
+				if (!this.entries.has(key)) {
+					this.put(key, value)
+				}
+			}
+
+			// Only drop the old key once the snapshot is safely on disk
+			try {
+				await this.compact()
+				configService.delete("fileMetadata")
+				logger.info(`Migrated ${Object.keys(legacy).length} metadata entries from config`)
+			} catch (error) {
+				logger.error(`Could not migrate metadata from config, will retry next start: ${error}`)
+			}
+		}
+
+		logger.info(`Loaded ${this.entries.size} metadata entries`)
+	}
+
+	/**
+	 * Update an entry in memory along with its expiry
+	 */
+	private put(key: string, value: FileMetadata): void {
+		this.remove(key)
+		this.entries.set(key, value)
+		this.liveBytes += this.measure(key, value)
+		this.expiryIndex.set(key, Date.parse(value["X-EXPIRY-DATE"]))
+	}
+
+	private remove(key: string): boolean {
+		const existing = this.entries.get(key)
+		if (existing === undefined) {
+			return false
+		}
+
+		this.liveBytes -= this.measure(key, existing)
+		this.expiryIndex.delete(key)
+		return this.entries.delete(key)
+	}
+
+	private measure(key: string, value: FileMetadata): number {
+		return key.length + JSON.stringify(value).length
+	}
+
+	/**
+	 * Queue a record for the next batched append
+	 */
+	private append(record: LogRecord): void {
+		this.pendingLines.push(JSON.stringify(record))
+
+		if (this.pendingLines.length === 1) {
+			// Batch changes made in the same tick into one write
+			this.enqueue(async () => {
+				const lines = this.pendingLines
+				this.pendingLines = []
+				if (lines.length === 0) {
+					return
+				}
+
+				const prefix = this.tornTail ? "\n" : ""
+				await fs.appendFile(this.filePath, `${prefix}${lines.join("\n")}\n`, "utf-8")
+				this.tornTail = false
+				this.logLines += lines.length
+
+				if (
+					this.logLines > COMPACT_MIN_LINES &&
+					this.logLines > this.entries.size * COMPACT_RATIO
+				) {
+					await this.compact()
+				}
+			})
+		}
+	}
+
+	/**
+	 * Run a disk operation after every operation queued before it
+	 */
+	private enqueue(operation: () => Promise<void>): void {
+		this.pendingWrites++
+		this.writeChain = this.writeChain
+			.then(operation)
+			.catch((error) => {
+				logger.error(`Metadata store write failed: ${error}`)
+			})
+			.finally(() => {
+				this.pendingWrites--
+			})
+	}
+
+	/**
+	 * Rewrite the log as a snapshot of the live entries
+	 */
+	private async compact(): Promise<void> {
+		const tempPath = `${this.filePath}.tmp`
+		const lines = [...this.entries].map(([k, v]) => JSON.stringify({ k, v }))
+		const content = lines.length > 0 ? `${lines.join("\n")}\n` : ""
+
+		const handle = await fs.open(tempPath, "w")
+		try {
+			await handle.writeFile(content, "utf-8")
+			await handle.sync()
+		} finally {
+			await handle.close()
+		}
+		await fs.rename(tempPath, this.filePath)
+
+		this.logLines = lines.length
+		this.tornTail = false
+		logger.info(`Compacted metadata store to ${lines.length} entries`)
+	}
+}
+
+export const metadataStore = MetadataStore.getInstance()
@@ -1,17 +1,29 @@
 import { promises as fs } from "node:fs"
 import { configService } from "@main/services/config"
 import { logger } from "@main/services/logger"
-import type { FileMetadata } from "@shared/types"
+import { metadataStore } from "@main/services/metadata-store"
+import type { ArtworkUpload, FileMetadata } from "@shared/types"
+
+/** Delay before the first expiry sweep after startup */
+const SWEEP_START_DELAY = 30 * 1000
+/** Longest time between expiry sweeps */
+const SWEEP_INTERVAL = 10 * 60 * 1000
+/** Shortest time between expiry sweeps */
+const MIN_SWEEP_INTERVAL = 60 * 1000
+/** Entries removed before yielding back to the event loop */
+const SWEEP_BATCH_SIZE = 100
 
 /**
- * Service to manage metadata for media files using electron-conf
- * This service handles storing and retrieving metadata centrally without creating individual JSON files
+ * Service to manage metadata for media files
+ * Metadata is stored centrally in the append-only metadata store without creating individual JSON files
  */
 export class MetadataWriterService {
 	private static instance: MetadataWriterService | null = null
+	private sweepTimer: NodeJS.Timeout | null = null
 
 	private constructor() {
 		logger.info("Metadata writer service initialized")
+		this.scheduleSweep(SWEEP_START_DELAY)
 	}
 
 	/**
@@ -57,7 +69,7 @@ export class MetadataWriterService {
 
 	/**
 	 * Write custom metadata tags for a media file
-	 * Now stores metadata centrally in electron-conf instead of individual JSON files
+	 * Stores metadata centrally in the metadata store instead of individual JSON files
 	 *
 	 * @param filePath - Path to the audio file
 	 * @param tags - Metadata tags to write
@@ -78,12 +90,10 @@ export class MetadataWriterService {
 			// Normalize file path for consistent storage
 			const normalizedPath = this.normalizeFilePath(filePath)
 
-			// Get current fileMetadata from config
-			const currentFileMetadata =
-				configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
+			await metadataStore.ready()
 
 			// Get existing metadata for this file if it exists
-			const existingMetadata = currentFileMetadata[normalizedPath] || {}
+			const existingMetadata: Partial<FileMetadata> = metadataStore.get(normalizedPath) || {}
 
 			// Create new metadata object
 			const updatedMetadata: FileMetadata = {
@@ -93,12 +103,11 @@ export class MetadataWriterService {
 				"X-EXPIRY-DATE": tags["X-EXPIRY-DATE"] || existingMetadata["X-EXPIRY-DATE"] || "",
 			}
 
-			// Update the file metadata in config
-			currentFileMetadata[normalizedPath] = updatedMetadata
-			configService.set("fileMetadata", currentFileMetadata)
+			// Only this entry is appended to the store
+			metadataStore.set(normalizedPath, updatedMetadata)
 
 			logger.info(`Metadata stored successfully for: ${normalizedPath}`)
-			logger.info(`Tags stored: ${JSON.stringify(updatedMetadata)}`)
+			logger.debug("Tags stored:", updatedMetadata)
 			return true
 		} catch (error) {
 			logger.error(`Error storing metadata: ${error}`)
@@ -116,18 +125,17 @@ export class MetadataWriterService {
 			// Normalize file path for consistent retrieval
 			const normalizedPath = this.normalizeFilePath(filePath)
 
-			// Get fileMetadata from config
-			const fileMetadata = configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
+			await metadataStore.ready()
 
 			// Get metadata for this specific file
-			const metadata = fileMetadata[normalizedPath]
+			const metadata = metadataStore.get(normalizedPath)
 
 			if (metadata) {
-				logger.info(`Read metadata for: ${normalizedPath}`)
+				logger.debug(() => `Read metadata for: ${normalizedPath}`)
 				return metadata as unknown as Record<string, string>
 			}
 
-			logger.info(`No metadata found for: ${normalizedPath}`)
+			logger.debug(() => `No metadata found for: ${normalizedPath}`)
 			return null
 		} catch (error) {
 			logger.error(`Error reading metadata: ${error}`)
@@ -145,15 +153,10 @@ export class MetadataWriterService {
 			// Normalize file path for consistent removal
 			const normalizedPath = this.normalizeFilePath(filePath)
 
-			// Get current fileMetadata from config
-			const currentFileMetadata =
-				configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
+			await metadataStore.ready()
 
 			// Remove metadata for this file
-			delete currentFileMetadata[normalizedPath]
-
-			// Update config
-			configService.set("fileMetadata", currentFileMetadata)
+			metadataStore.delete(normalizedPath)
 
 			logger.info(`Removed metadata for: ${normalizedPath}`)
 			return true
@@ -173,16 +176,44 @@ export class MetadataWriterService {
 			// Normalize file path for consistent checking
 			const normalizedPath = this.normalizeFilePath(filePath)
 
-			// Get fileMetadata from config
-			const fileMetadata = configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
+			await metadataStore.ready()
 
-			return normalizedPath in fileMetadata
+			return metadataStore.has(normalizedPath)
 		} catch (error) {
 			logger.error(`Error checking metadata existence: ${error}`)
 			return false
 		}
 	}
 
+	/**
+	 * Get a still valid upload of artwork with the given content hash
+	 * @param hash - SHA-256 of the image bytes
+	 * @param minValidUntil - Uploads expiring before this time (epoch ms) are ignored
+	 * @returns The upload or null if unknown or expired
+	 */
+	public getArtworkUpload(hash: string, minValidUntil = Date.now()): ArtworkUpload | null {
+		const uploads = configService.get<Record<string, ArtworkUpload>>("artworkUploads") || {}
+		const upload = uploads[hash]
+
+		if (!upload || new Date(upload.expiresAt).getTime() <= minValidUntil) {
+			return null
+		}
+
+		return upload
+	}
+
+	/**
+	 * Remember the upload of artwork so identical images reuse it
+	 * @param hash - SHA-256 of the image bytes
+	 * @param url - Uploaded image URL
+	 * @param expiryDate - When the upload expires
+	 */
+	public storeArtworkUpload(hash: string, url: string, expiryDate: Date): void {
+		const uploads = configService.get<Record<string, ArtworkUpload>>("artworkUploads") || {}
+		uploads[hash] = { url, expiresAt: expiryDate.toISOString() }
+		configService.set("artworkUploads", uploads)
+	}
+
 	/**
 	 * Normalize file path for consistent storage across platforms
 	 * @param filePath - Original file path
@@ -205,32 +236,43 @@ export class MetadataWriterService {
 	 */
 	public async cleanupExpiredMetadata(): Promise<number> {
 		try {
-			const currentFileMetadata =
-				configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
+			await metadataStore.ready()
 			const now = new Date()
 			let cleanedCount = 0
 
-			for (const [filePath, metadata] of Object.entries(currentFileMetadata)) {
-				try {
-					const expiryDate = new Date(metadata["X-EXPIRY-DATE"])
-					if (expiryDate < now) {
-						delete currentFileMetadata[filePath]
-						cleanedCount++
-						logger.info(`Cleaned up expired metadata for: ${filePath}`)
-					}
-				} catch (error) {
-					// Invalid expiry date, remove it
-					delete currentFileMetadata[filePath]
-					cleanedCount++
-					logger.warn(`Removed metadata with invalid expiry date for: ${filePath}`)
+			// Remove in small batches so a large backlog doesn't stall the main process
+			while (true) {
+				const expiredPaths = metadataStore.getExpiredKeys(SWEEP_BATCH_SIZE, now.getTime())
+				if (expiredPaths.length === 0) {
+					break
 				}
+
+				for (const filePath of expiredPaths) {
+					metadataStore.delete(filePath)
+				}
+				cleanedCount += expiredPaths.length
+
+				await new Promise((resolve) => setImmediate(resolve))
 			}
 
 			if (cleanedCount > 0) {
-				configService.set("fileMetadata", currentFileMetadata)
 				logger.info(`Cleaned up ${cleanedCount} expired metadata entries`)
 			}
 
+			// Expired uploads can't be shared anymore either
+			const uploads = configService.get<Record<string, ArtworkUpload>>("artworkUploads") || {}
+			let expiredUploads = 0
+			for (const [hash, upload] of Object.entries(uploads)) {
+				if (!(new Date(upload.expiresAt).getTime() > now.getTime())) {
+					delete uploads[hash]
+					expiredUploads++
+				}
+			}
+			if (expiredUploads > 0) {
+				configService.set("artworkUploads", uploads)
+				logger.info(`Cleaned up ${expiredUploads} expired artwork uploads`)
+			}
+
 			return cleanedCount
 		} catch (error) {
 			logger.error(`Error cleaning up expired metadata: ${error}`)
@@ -242,38 +284,58 @@ export class MetadataWriterService {
 	 * Get all stored metadata (for debugging purposes)
 	 * @returns All stored metadata
 	 */
-	public getAllMetadata(): Record<string, FileMetadata> {
-		return configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
+	public async getAllMetadata(): Promise<Record<string, FileMetadata>> {
+		await metadataStore.ready()
+		return Object.fromEntries(metadataStore.all())
+	}
+
+	/**
+	 * Remove all stored metadata
+	 */
+	public async clearAllMetadata(): Promise<void> {
+		await metadataStore.ready()
+		metadataStore.clear()
 	}
 
 	/**
 	 * Get metadata statistics
 	 * @returns Statistics about stored metadata
 	 */
-	public getMetadataStats(): { totalFiles: number; expiredFiles: number } {
-		const fileMetadata = configService.get<Record<string, FileMetadata>>("fileMetadata") || {}
-		const now = new Date()
-		let expiredCount = 0
+	public async getMetadataStats(): Promise<{
+		totalFiles: number
+		expiredFiles: number
+		sizeBytes: number
+	}> {
+		await metadataStore.ready()
 
-		for (const metadata of Object.values(fileMetadata)) {
-			try {
-				const expiryDate = new Date(metadata["X-EXPIRY-DATE"])
-				if (expiryDate < now) {
-					expiredCount++
-				}
-			} catch {
-				expiredCount++
-			}
+		return {
+			totalFiles: metadataStore.size,
+			expiredFiles: metadataStore.countExpired(),
+			sizeBytes: metadataStore.byteSize,
 		}
+	}
 
-		return {
-			totalFiles: Object.keys(fileMetadata).length,
-			expiredFiles: expiredCount,
+	/**
+	 * Run the expiry sweep after `delay`, then again around the next expiry
+	 */
+	private scheduleSweep(delay: number): void {
+		if (this.sweepTimer !== null) {
+			clearTimeout(this.sweepTimer)
 		}
+
+		this.sweepTimer = setTimeout(async () => {
+			this.sweepTimer = null
+			await this.cleanupExpiredMetadata()
+
+			const nextExpiry = metadataStore.nextExpiry()
+			const untilNext = nextExpiry === null ? SWEEP_INTERVAL : nextExpiry - Date.now()
+			this.scheduleSweep(Math.min(SWEEP_INTERVAL, Math.max(MIN_SWEEP_INTERVAL, untilNext)))
+		}, delay)
+		this.sweepTimer.unref()
 	}
 
 	/**
-	 * Migrate metadata from old JSON files to electron-conf
+	 * Migrate metadata from old JSON files to the metadata store
 	 * This method searches for .vlc-metadata.json files and imports them to the central storage
 	 * @param searchPaths - Array of directories to search for JSON files
 	 * @returns Number of files migrated
@@ -295,7 +357,7 @@ export class MetadataWriterService {
 							const jsonData = await fs.readFile(metadataFilePath, "utf-8")
 							const metadata = JSON.parse(jsonData)
 
-							// Migrate to electron-conf
+							// Migrate to the metadata store
 							const success = await this.writeMetadataTags(originalFilePath, metadata)
 
 							if (success) {
@@ -316,7 +378,7 @@ export class MetadataWriterService {
 
 		if (migratedCount > 0) {
 			logger.info(
-				`Successfully migrated ${migratedCount} metadata files from JSON to electron-conf`,
+				`Successfully migrated ${migratedCount} metadata files from JSON to the metadata store`,
 			)
 		}
 
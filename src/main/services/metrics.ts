@@ -0,0 +1,158 @@
+import { performance } from "node:perf_hooks"
+import type { HistogramSnapshot, MetricsSnapshot } from "@shared/types"
+import { ipcMain } from "electron"
+
+/** Upper bounds of the latency histogram buckets in ms, the last bucket is unbounded */
+const LATENCY_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+interface Histogram {
+	counts: number[]
+	count: number
+	sum: number
+	min: number
+	max: number
+}
+
+/**
+ * Registry of counters, gauges and latency histograms for the hot paths
+ *
+ * Recording is a map lookup and an increment, so it can stay on in
+ * production. Histograms use fixed buckets, percentiles in snapshots are
+ * the upper bound of the bucket they fall in. IPC handlers registered
+ * through `handle` count their invocations per channel.
+ */
+class MetricsService {
+	private static instance: MetricsService | null = null
+	private counters: Map<string, number> = new Map()
+	private gauges: Map<string, number> = new Map()
+	private histograms: Map<string, Histogram> = new Map()
+
+	private constructor() {}
+
+	/**
+	 * Get the singleton instance of the metrics service
+	 */
+	public static getInstance(): MetricsService {
+		if (!MetricsService.instance) {
+			MetricsService.instance = new MetricsService()
+		}
+		return MetricsService.instance
+	}
+
+	/**
+	 * Register an IPC handler like `ipcMain.handle`, counting its invocations
+	 * as `ipc.<channel>`
+	 */
+	public handle(channel: string, listener: Parameters<typeof ipcMain.handle>[1]): void {
+		const counter = `ipc.${channel}`
+		ipcMain.handle(channel, (event, ...args) => {
+			this.increment(counter)
+			return listener(event, ...args)
+		})
+	}
+
+	public increment(name: string, by = 1): void {
+		this.counters.set(name, (this.counters.get(name) ?? 0) + by)
+	}
+
+	public setGauge(name: string, value: number): void {
+		this.gauges.set(name, value)
+	}
+
+	/**
+	 * Record a duration in ms
+	 */
+	public observe(name: string, ms: number): void {
+		let histogram = this.histograms.get(name)
+		if (!histogram) {
+			histogram = {
+				counts: new Array(LATENCY_BUCKETS.length + 1).fill(0),
+				count: 0,
+				sum: 0,
+				min: Number.POSITIVE_INFINITY,
+				max: 0,
+			}
+			this.histograms.set(name, histogram)
+		}
+
+		let bucket = 0
+		while (bucket < LATENCY_BUCKETS.length && ms > LATENCY_BUCKETS[bucket]) {
+			bucket++
+		}
+		histogram.counts[bucket]++
+		histogram.count++
+		histogram.sum += ms
+		histogram.min = Math.min(histogram.min, ms)
+		histogram.max = Math.max(histogram.max, ms)
+	}
+
+	/**
+	 * Run a step and record how long it took
+	 */
+	public time<T>(name: string, step: () => T): T {
+		const start = performance.now()
+		try {
+			return step()
+		} finally {
+			this.observe(name, performance.now() - start)
+		}
+	}
+
+	/**
+	 * Run an async step and record how long it took, failures included
+	 */
+	public async timeAsync<T>(name: string, step: () => Promise<T>): Promise<T> {
+		const start = performance.now()
+		try {
+			return await step()
+		} finally {
+			this.observe(name, performance.now() - start)
+		}
+	}
+
+	public snapshot(): MetricsSnapshot {
+		const { rss, heapUsed } = process.memoryUsage()
+		this.setGauge("process.rss_bytes", rss)
+		this.setGauge("process.heap_used_bytes", heapUsed)
+
+		const histograms: Record<string, HistogramSnapshot> = {}
+		for (const [name, histogram] of this.histograms) {
+			histograms[name] = {
+				buckets: LATENCY_BUCKETS,
+				counts: [...histogram.counts],
+				count: histogram.count,
+				sum: Math.round(histogram.sum * 100) / 100,
+				min: histogram.count > 0 ? Math.round(histogram.min * 100) / 100 : 0,
+				max: Math.round(histogram.max * 100) / 100,
+				p50: this.percentile(histogram, 0.5),
+				p95: this.percentile(histogram, 0.95),
+			}
+		}
+
+		return {
+			takenAt: new Date().toISOString(),
+			uptimeMs: Math.round(performance.now()),
+			counters: Object.fromEntries(this.counters),
+			gauges: Object.fromEntries(this.gauges),
+			histograms,
+		}
+	}
+
+	/**
+	 * Upper bound of the bucket holding the given quantile, the max for the last bucket
+	 */
+	private percentile(histogram: Histogram, quantile: number): number {
+		const target = histogram.count * quantile
+		let seen = 0
+		for (let bucket = 0; bucket < histogram.counts.length; bucket++) {
+			seen += histogram.counts[bucket]
+			if (seen >= target && seen > 0) {
+				const bound = LATENCY_BUCKETS[bucket] ?? histogram.max
+				return Math.min(bound, Math.round(histogram.max * 100) / 100)
+			}
+		}
+		return 0
+	}
+}
+
+export const metricsService = MetricsService.getInstance()
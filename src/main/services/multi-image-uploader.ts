@@ -1,12 +1,39 @@
+import { configService } from "@main/services/config"
+import { imageOptimizerService } from "@main/services/image-optimizer"
 import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
+import type { UploadHostHealth } from "@shared/types"
+import type { ImageUploadStats } from "@shared/types/media"
 
 interface ImageUploadService {
     name: string
-    upload: (imageBuffer: Buffer, filename: string, expiryHours?: number) => Promise<string | null>
+    upload: (
+        imageBuffer: Buffer,
+        filename: string,
+        expiryHours: number,
+        signal: AbortSignal
+    ) => Promise<string | null>
     maxFileSize: number
     supportsExpiry: boolean
 }
 
+/** Hosts uploading at the same time, the leader plus one hedge */
+const MAX_PARALLEL_UPLOADS = 2
+/** Give up on a single host after this long */
+const UPLOAD_TIMEOUT = 30000
+/** Hedge delay used while a host has no latency history */
+const DEFAULT_HEDGE_DELAY = 3000
+const MIN_HEDGE_DELAY = 1000
+const MAX_HEDGE_DELAY = 10000
+/** Weight of the newest sample in the latency and success averages */
+const EWMA_ALPHA = 0.3
+/** Latency samples kept per host for the median */
+const LATENCY_SAMPLES = 20
+/** Consecutive failures that open a host's circuit */
+const CIRCUIT_FAILURE_THRESHOLD = 3
+/** How long an open circuit keeps a host out of rotation */
+const CIRCUIT_COOLDOWN = 10 * 60 * 1000
+
 export class MultiImageUploaderService {
     private static instance: MultiImageUploaderService | null = null
     private readonly appVersion = "4.0.2"
@@ -22,6 +49,8 @@ export class MultiImageUploaderService {
     ]
     
     private currentUserAgentIndex = 0
+    private hostHealth: Record<string, UploadHostHealth>
+    private uploadStats: ImageUploadStats = { uploads: 0, failures: 0, bytesBefore: 0, bytesAfter: 0 }
     
     private readonly services: ImageUploadService[] = [
         {
@@ -57,6 +86,7 @@ export class MultiImageUploaderService {
     ]
 
     private constructor() {
+        this.hostHealth = { ...configService.get<Record<string, UploadHostHealth>>("uploadHostHealth") }
         logger.info("Multi-service image uploader initialized")
         this.shuffleUserAgents()
     }
@@ -68,42 +98,277 @@ export class MultiImageUploaderService {
         return MultiImageUploaderService.instance
     }
 
+    /**
+     * Upload an image, racing hosts instead of waiting on them one by one
+     *
+     * The historically fastest healthy host starts first. If it hasn't
+     * finished after its median latency, the next host starts in parallel,
+     * and a failure immediately hands over to the next one. The first
+     * success wins and the other uploads are cancelled.
+     */
     public async uploadImage(
         imageBuffer: Buffer,
         filename: string,
         expiryHours = 24
     ): Promise<string | null> {
-        const fileSize = imageBuffer.length
-        logger.info(`Starting multi-service upload: ${filename} (${fileSize} bytes)`)
+        // Discord never shows more than a small thumbnail, so send that
+        const optimized = imageOptimizerService.optimize(imageBuffer, filename)
+        const fileSize = optimized.buffer.length
+        logger.info(`Starting multi-service upload: ${optimized.filename} (${fileSize} bytes)`)
+
+        this.uploadStats.bytesBefore += imageBuffer.length
+        this.uploadStats.bytesAfter += fileSize
+
+        const candidates = this.rankServices(fileSize)
+        if (candidates.length === 0) {
+            logger.error(`No upload service accepts ${fileSize} bytes`)
+            this.uploadStats.failures++
+            return null
+        }
 
-        for (const service of this.services) {
-            if (fileSize > service.maxFileSize) {
-                logger.warn(`Skipping ${service.name}: file too large (${fileSize} > ${service.maxFileSize})`)
-                continue
+        const result = await this.raceUploads(candidates, optimized.buffer, optimized.filename, expiryHours)
+        if (result) {
+            this.uploadStats.uploads++
+        } else {
+            this.uploadStats.failures++
+            logger.error("All upload services failed")
+        }
+        return result
+    }
+
+    /**
+     * Get upload counters, including bytes before and after optimization
+     */
+    public getUploadStats(): ImageUploadStats {
+        return { ...this.uploadStats }
+    }
+
+    /**
+     * Get the recorded health of every upload host
+     */
+    public getHostHealth(): Record<string, UploadHostHealth> {
+        return structuredClone(this.hostHealth)
+    }
+
+    /**
+     * Run uploads against the ranked hosts with hedging, resolving with the first URL
+     */
+    private raceUploads(
+        candidates: ImageUploadService[],
+        imageBuffer: Buffer,
+        filename: string,
+        expiryHours: number
+    ): Promise<string | null> {
+        return new Promise((resolve) => {
+            const controllers = new Set<AbortController>()
+            let hedgeTimer: NodeJS.Timeout | null = null
+            let next = 0
+            let active = 0
+            let settled = false
+
+            const finish = (url: string | null) => {
+                if (settled) {
+                    return
+                }
+                settled = true
+                if (hedgeTimer) {
+                    clearTimeout(hedgeTimer)
+                }
+                for (const controller of controllers) {
+                    controller.abort()
+                }
+                resolve(url)
             }
 
-            try {
-                logger.info(`Attempting upload to ${service.name}`)
-                
-                const result = await service.upload(imageBuffer, filename, expiryHours)
-                
-                if (result) {
-                    logger.info(`Successfully uploaded to ${service.name}: ${result}`)
-                    return result
+            const launch = () => {
+                if (settled) {
+                    return
+                }
+                if (hedgeTimer) {
+                    clearTimeout(hedgeTimer)
+                    hedgeTimer = null
+                }
+                if (next >= candidates.length) {
+                    if (active === 0) {
+                        finish(null)
+                    }
+                    return
+                }
+
+                const service = candidates[next++]
+                const controller = new AbortController()
+                controllers.add(controller)
+                active++
+
+                this.attemptUpload(service, imageBuffer, filename, expiryHours, controller).then(
+                    (url) => {
+                        controllers.delete(controller)
+                        active--
+                        if (url) {
+                            finish(url)
+                        } else {
+                            launch()
+                        }
+                    }
+                )
+
+                // Hedge against a slow host by starting the next one alongside it
+                if (active < MAX_PARALLEL_UPLOADS && next < candidates.length) {
+                    hedgeTimer = setTimeout(launch, this.getHedgeDelay(service.name))
                 }
-                
-                logger.warn(`Upload to ${service.name} returned null`)
-            } catch (error) {
-                logger.error(`Upload to ${service.name} failed: ${error}`)
             }
 
-            this.rotateUserAgent()
+            launch()
+        })
+    }
+
+    /**
+     * Upload to a single host, recording its latency or failure
+     *
+     * @returns The uploaded URL, or null on failure or cancellation
+     */
+    private async attemptUpload(
+        service: ImageUploadService,
+        imageBuffer: Buffer,
+        filename: string,
+        expiryHours: number,
+        controller: AbortController
+    ): Promise<string | null> {
+        const startedAt = Date.now()
+        let timedOut = false
+        const timer = setTimeout(() => {
+            timedOut = true
+            controller.abort()
+        }, UPLOAD_TIMEOUT)
+
+        try {
+            logger.info(`Attempting upload to ${service.name}`)
+
+            const result = await service.upload(imageBuffer, filename, expiryHours, controller.signal)
+
+            if (result) {
+                metricsService.observe(`upload.${service.name}_ms`, Date.now() - startedAt)
+                this.recordSuccess(service.name, Date.now() - startedAt)
+                logger.info(`Successfully uploaded to ${service.name}: ${result}`)
+                return result
+            }
+
+            logger.warn(`Upload to ${service.name} returned null`)
+        } catch (error) {
+            if (controller.signal.aborted && !timedOut) {
+                // Another host won the race, this says nothing about this host's health
+                logger.info(`Cancelled upload to ${service.name}`)
+                return null
+            }
+
+            logger.error(`Upload to ${service.name} failed: ${timedOut ? "timed out" : error}`)
+        } finally {
+            clearTimeout(timer)
         }
 
-        logger.error("All upload services failed")
+        metricsService.increment(`upload.${service.name}_failures`)
+        this.recordFailure(service.name)
+        this.rotateUserAgent()
         return null
     }
 
+    /**
+     * Order hosts that accept the file by expected latency, skipping open circuits.
+     * Hosts with an open circuit are only kept as a last resort.
+     */
+    private rankServices(fileSize: number): ImageUploadService[] {
+        const now = Date.now()
+        const eligible = this.services.filter((service) => {
+            if (fileSize > service.maxFileSize) {
+                logger.warn(`Skipping ${service.name}: file too large (${fileSize} > ${service.maxFileSize})`)
+                return false
+            }
+            return true
+        })
+
+        const score = (service: ImageUploadService): number => {
+            const health = this.hostHealth[service.name]
+            if (!health) {
+                return DEFAULT_HEDGE_DELAY
+            }
+            const latency = health.latencyEwma ?? DEFAULT_HEDGE_DELAY
+            return latency / Math.max(health.successRate, 0.05)
+        }
+        const isOpen = (service: ImageUploadService): boolean =>
+            (this.hostHealth[service.name]?.circuitOpenUntil ?? 0) > now
+
+        // Array.prototype.sort is stable, so unknown hosts keep their configured order
+        const closed = eligible.filter((service) => !isOpen(service)).sort((a, b) => score(a) - score(b))
+        const open = eligible.filter(isOpen).sort(
+            (a, b) => this.hostHealth[a.name].circuitOpenUntil - this.hostHealth[b.name].circuitOpenUntil
+        )
+
+        if (open.length > 0) {
+            logger.info(`Upload circuit open for: ${open.map((service) => service.name).join(", ")}`)
+        }
+
+        return [...closed, ...open]
+    }
+
+    /**
+     * Delay before hedging a host, based on its median latency
+     */
+    private getHedgeDelay(name: string): number {
+        const samples = this.hostHealth[name]?.recentLatencies
+        if (!samples || samples.length === 0) {
+            return DEFAULT_HEDGE_DELAY
+        }
+
+        const sorted = [...samples].sort((a, b) => a - b)
+        const median = sorted[Math.floor(sorted.length / 2)]
+        return Math.min(MAX_HEDGE_DELAY, Math.max(MIN_HEDGE_DELAY, median))
+    }
+
+    private recordSuccess(name: string, latencyMs: number): void {
+        const health = this.getHealth(name)
+        health.latencyEwma =
+            health.latencyEwma === null
+                ? latencyMs
+                : EWMA_ALPHA * latencyMs + (1 - EWMA_ALPHA) * health.latencyEwma
+        health.recentLatencies = [...health.recentLatencies, latencyMs].slice(-LATENCY_SAMPLES)
+        health.successRate = EWMA_ALPHA + (1 - EWMA_ALPHA) * health.successRate
+        health.consecutiveFailures = 0
+        health.circuitOpenUntil = 0
+        this.saveHealth()
+    }
+
+    private recordFailure(name: string): void {
+        const health = this.getHealth(name)
+        health.successRate = (1 - EWMA_ALPHA) * health.successRate
+        health.consecutiveFailures++
+
+        // A failed trial after the cooldown reopens the circuit right away
+        if (health.consecutiveFailures >= CIRCUIT_FAILURE_THRESHOLD) {
+            health.circuitOpenUntil = Date.now() + CIRCUIT_COOLDOWN
+            logger.warn(
+                `Opening upload circuit for ${name} after ${health.consecutiveFailures} failures`
+            )
+        }
+        this.saveHealth()
+    }
+
+    private getHealth(name: string): UploadHostHealth {
+        if (!this.hostHealth[name]) {
+            this.hostHealth[name] = {
+                latencyEwma: null,
+                recentLatencies: [],
+                successRate: 1,
+                consecutiveFailures: 0,
+                circuitOpenUntil: 0,
+            }
+        }
+        return this.hostHealth[name]
+    }
+
+    private saveHealth(): void {
+        configService.set("uploadHostHealth", this.hostHealth)
+    }
+
     public async uploadImageFromUrl(imageUrl: string, expiryHours = 24): Promise<string | null> {
         logger.info(`Starting multi-service URL upload: ${imageUrl}`)
 
@@ -145,7 +410,12 @@ export class MultiImageUploaderService {
         logger.info(`User agents shuffled, starting with: ${this.userAgents[0]}`)
     }
 
-    private async uploadToX0At(imageBuffer: Buffer, filename: string): Promise<string | null> {
+    private async uploadToX0At(
+        imageBuffer: Buffer,
+        filename: string,
+        _expiryHours: number,
+        signal: AbortSignal
+    ): Promise<string | null> {
         const formData = new FormData()
         
         const uint8Array = new Uint8Array(imageBuffer)
@@ -158,6 +428,7 @@ export class MultiImageUploaderService {
         const response = await fetch("https://x0.at/", {
             method: "POST",
             body: formData,
+            signal,
             headers: {
                 "User-Agent": this.getCurrentUserAgent(),
             },
@@ -171,7 +442,12 @@ export class MultiImageUploaderService {
         return result.trim().startsWith("http") ? result.trim() : null
     }
 
-    private async uploadToCatbox(imageBuffer: Buffer, filename: string): Promise<string | null> {
+    private async uploadToCatbox(
+        imageBuffer: Buffer,
+        filename: string,
+        _expiryHours: number,
+        signal: AbortSignal
+    ): Promise<string | null> {
         const formData = new FormData()
         
         const uint8Array = new Uint8Array(imageBuffer)
@@ -185,6 +461,7 @@ export class MultiImageUploaderService {
         const response = await fetch("https://catbox.moe/user/api.php", {
             method: "POST",
             body: formData,
+            signal,
             headers: {
                 "User-Agent": this.getCurrentUserAgent(),
             },
@@ -198,7 +475,12 @@ export class MultiImageUploaderService {
         return result.trim().startsWith("http") ? result.trim() : null
     }
 
-    private async uploadToUguu(imageBuffer: Buffer, filename: string): Promise<string | null> {
+    private async uploadToUguu(
+        imageBuffer: Buffer,
+        filename: string,
+        _expiryHours: number,
+        signal: AbortSignal
+    ): Promise<string | null> {
         const formData = new FormData()
         
         const uint8Array = new Uint8Array(imageBuffer)
@@ -211,6 +493,7 @@ export class MultiImageUploaderService {
         const response = await fetch("https://uguu.se/upload", {
             method: "POST",
             body: formData,
+            signal,
             headers: {
                 "User-Agent": this.getCurrentUserAgent(),
             },
@@ -229,7 +512,12 @@ export class MultiImageUploaderService {
         return null
     }
 
-    private async uploadTo0x0st(imageBuffer: Buffer, filename: string, expiryHours = 24): Promise<string | null> {
+    private async uploadTo0x0st(
+        imageBuffer: Buffer,
+        filename: string,
+        expiryHours: number,
+        signal: AbortSignal
+    ): Promise<string | null> {
         const formData = new FormData()
         
         const uint8Array = new Uint8Array(imageBuffer)
@@ -244,6 +532,7 @@ export class MultiImageUploaderService {
         const response = await fetch("https://0x0.st", {
             method: "POST",
             body: formData,
+            signal,
             headers: {
                 "User-Agent": this.getCurrentUserAgent(),
             },
@@ -257,7 +546,12 @@ export class MultiImageUploaderService {
         return result.trim().startsWith("http") ? result.trim() : null
     }
 
-    private async uploadToTmpFiles(imageBuffer: Buffer, filename: string): Promise<string | null> {
+    private async uploadToTmpFiles(
+        imageBuffer: Buffer,
+        filename: string,
+        _expiryHours: number,
+        signal: AbortSignal
+    ): Promise<string | null> {
         const formData = new FormData()
         
         const uint8Array = new Uint8Array(imageBuffer)
@@ -270,6 +564,7 @@ export class MultiImageUploaderService {
         const response = await fetch("https://tmpfiles.org/api/v1/upload", {
             method: "POST",
             body: formData,
+            signal,
             headers: {
                 "User-Agent": this.getCurrentUserAgent(),
             },
@@ -326,6 +621,7 @@ export class MultiImageUploaderService {
     public parseMetadataTags(metadata: Record<string, string | undefined>): {
         imageUrl: string | null
         isExpired: boolean
+        expiresAt: number | null
         appVersion: string | null
         processedBy: string | null
     } {
@@ -335,9 +631,11 @@ export class MultiImageUploaderService {
         const expiryDateStr = metadata["X-EXPIRY-DATE"]
 
         let isExpired = false
+        let expiresAt: number | null = null
         if (expiryDateStr) {
             try {
                 const expiryDate = new Date(expiryDateStr)
+                expiresAt = Number.isNaN(expiryDate.getTime()) ? null : expiryDate.getTime()
                 isExpired = expiryDate.getTime() < Date.now()
             } catch (error) {
                 logger.warn(`Invalid expiry date format: ${expiryDateStr}`)
@@ -347,6 +645,7 @@ export class MultiImageUploaderService {
         return {
             imageUrl,
             isExpired,
+            expiresAt,
             appVersion,
             processedBy,
         }
@@ -0,0 +1,116 @@
+import type { PollCadence, VlcStatus } from "@shared/types/vlc"
+
+/** Interval used right after a state or track change */
+const FAST_INTERVAL = 1000
+/** Number of fast polls after a change */
+const FAST_TICKS = 5
+/** Minimum interval during steady playback, Discord advances the timestamps on its own */
+const MIN_STEADY_INTERVAL = 15000
+/** First retry delay when VLC can't be reached */
+const BACKOFF_START = 2000
+/** Longest retry delay when VLC can't be reached */
+const BACKOFF_MAX = 60000
+/** How long VLC must stay stopped before going nearly idle */
+const IDLE_AFTER = 3 * 60 * 1000
+/** Interval while VLC has been stopped for a while */
+const IDLE_INTERVAL = 60000
+
+/**
+ * Computes the delay until the next VLC poll from the last observed status
+ *
+ * Polls fast right after something changed, slows down during steady
+ * playback, backs off exponentially while VLC is unreachable and goes
+ * nearly idle when VLC has been stopped for minutes.
+ */
+export class PollScheduler {
+	private lastKey: string | null = null
+	private fastTicksLeft = 0
+	private failures = 0
+	private stoppedSince: number | null = null
+	private cadence: PollCadence
+
+	constructor(private readonly baseInterval: number) {
+		this.cadence = { intervalMs: baseInterval, reason: "stopped" }
+	}
+
+	/**
+	 * Record the outcome of a poll and compute the next cadence
+	 */
+	public record(status: VlcStatus | null, now = Date.now()): PollCadence {
+		this.cadence = this.compute(status, now)
+		return this.cadence
+	}
+
+	/**
+	 * Get the cadence computed from the last recorded poll
+	 */
+	public getCadence(): PollCadence {
+		return { ...this.cadence }
+	}
+
+	private compute(status: VlcStatus | null, now: number): PollCadence {
+		if (!status) {
+			this.lastKey = null
+			this.stoppedSince = null
+			this.failures++
+			const intervalMs = Math.min(BACKOFF_MAX, BACKOFF_START * 2 ** (this.failures - 1))
+			return { intervalMs, reason: "unreachable" }
+		}
+
+		this.failures = 0
+
+		const key = this.getStateKey(status)
+		if (key !== this.lastKey) {
+			this.lastKey = key
+			this.fastTicksLeft = FAST_TICKS
+		}
+
+		if (status.active) {
+			this.stoppedSince = null
+		} else if (this.stoppedSince === null) {
+			this.stoppedSince = now
+		}
+
+		if (this.fastTicksLeft > 0) {
+			this.fastTicksLeft--
+			return { intervalMs: FAST_INTERVAL, reason: "change" }
+		}
+
+		if (this.stoppedSince !== null) {
+			return now - this.stoppedSince >= IDLE_AFTER
+				? { intervalMs: IDLE_INTERVAL, reason: "idle" }
+				: { intervalMs: this.baseInterval, reason: "stopped" }
+		}
+
+		if (status.status === "playing") {
+			const steady = Math.max(this.baseInterval, MIN_STEADY_INTERVAL)
+			const { time, duration } = status.playback
+
+			// Wake up shortly after the track should end to pick up the next one
+			if (duration > 0 && time < duration) {
+				const untilEnd = (duration - time) * 1000 + 500
+				if (untilEnd < steady) {
+					return { intervalMs: Math.max(FAST_INTERVAL, untilEnd), reason: "track-ending" }
+				}
+			}
+
+			return { intervalMs: steady, reason: "playing" }
+		}
+
+		return { intervalMs: this.baseInterval, reason: "paused" }
+	}
+
+	/**
+	 * Build a key that changes with the playback state or the current track
+	 */
+	private getStateKey(status: VlcStatus): string {
+		const { media } = status
+		return JSON.stringify([
+			status.status,
+			media.title,
+			media.artist,
+			media.album,
+			status.playback.duration,
+		])
+	}
+}
@@ -0,0 +1,95 @@
+import { performance } from "node:perf_hooks"
+import type { StartupTimelineEntry } from "@shared/types"
+import { logger } from "./logger"
+
+/** Steps recorded after this are dropped, startup is long over */
+const MAX_ENTRIES = 200
+
+/**
+ * Records when the main process reaches each startup milestone and how long
+ * module imports and service construction take
+ *
+ * Times are relative to process start. Launching with `--trace-startup`
+ * logs the timeline once the window has painted.
+ */
+class StartupTimelineService {
+	private static instance: StartupTimelineService | null = null
+	private entries: StartupTimelineEntry[] = []
+	public readonly tracing = process.argv.includes("--trace-startup")
+
+	private constructor() {}
+
+	/**
+	 * Get the singleton instance of the startup timeline service
+	 */
+	public static getInstance(): StartupTimelineService {
+		if (!StartupTimelineService.instance) {
+			StartupTimelineService.instance = new StartupTimelineService()
+		}
+		return StartupTimelineService.instance
+	}
+
+	/**
+	 * Record that a milestone has been reached
+	 */
+	public mark(label: string): void {
+		this.record({ label, at: this.now() })
+	}
+
+	/**
+	 * Run a step and record how long it took
+	 */
+	public measure<T>(label: string, step: () => T): T {
+		const start = this.now()
+		try {
+			return step()
+		} finally {
+			this.record({ label, at: start, duration: this.now() - start })
+		}
+	}
+
+	/**
+	 * Run an async step, such as a dynamic import, and record how long it took
+	 */
+	public async measureAsync<T>(label: string, step: () => Promise<T>): Promise<T> {
+		const start = this.now()
+		try {
+			return await step()
+		} finally {
+			this.record({ label, at: start, duration: this.now() - start })
+		}
+	}
+
+	public getTimeline(): StartupTimelineEntry[] {
+		return this.entries.map((entry) => ({ ...entry }))
+	}
+
+	/**
+	 * Log the timeline when tracing is enabled
+	 */
+	public report(): void {
+		if (!this.tracing) {
+			return
+		}
+
+		const lines = this.entries.map(({ label, at, duration }) =>
+			duration === undefined
+				? `${at.toFixed(1).padStart(9)}ms  ${label}`
+				: `${at.toFixed(1).padStart(9)}ms  ${label} (${duration.toFixed(1)}ms)`,
+		)
+		logger.info(`Startup timeline:\n${lines.join("\n")}`)
+	}
+
+	private now(): number {
+		// timeOrigin is when the process started, not when this module loaded
+		return Math.round(performance.now() * 10) / 10
+	}
+
+	private record(entry: StartupTimelineEntry): void {
+		if (this.entries.length < MAX_ENTRIES) {
+			this.entries.push(entry)
+		}
+	}
+}
+
+export const startupTimelineService = StartupTimelineService.getInstance()
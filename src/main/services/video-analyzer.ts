@@ -1,6 +1,10 @@
+import type { VideoAnalysisCacheStats } from "@shared/types/media"
 import type { VlcStatus } from "@shared/types/vlc"
 import { logger } from "./logger"
 
+/** Analyses kept in the memo cache */
+const MAX_CACHED_ANALYSES = 200
+
 // Import types from the ESM module
 type ParsedFilename = import("@ctrl/video-filename-parser").ParsedFilename
 type ParsedShow = import("@ctrl/video-filename-parser").ParsedShow
@@ -30,10 +34,52 @@ function isParsedShow(parsed: ParsedFilename): parsed is ParsedShow {
 export class VideoAnalyzerService {
 	private static instance: VideoAnalyzerService | null = null
 	private filenameParse: ((filename: string, isTv?: boolean) => ParsedFilename) | null = null
+	// Map iteration order doubles as the LRU order, oldest first
+	private analysisCache: Map<string, Readonly<VideoAnalysis>> = new Map()
+	private cacheStats = { hits: 0, misses: 0 }
+
+	private parserReady: Promise<void> | null = null
 
 	private constructor() {
 		logger.info("Video analyzer service initialized")
-		this.initializeParser()
+	}
+
+	/**
+	 * Load the filename parser. Called once the window has painted so the
+	 * import doesn't compete with startup; safe to call more than once.
+	 */
+	public init(): Promise<void> {
+		if (!this.parserReady) {
+			this.parserReady = this.initializeParser()
+		}
+		return this.parserReady
+	}
+
+	/**
+	 * Whether the filename parser is loaded
+	 */
+	public isReady(): boolean {
+		return this.filenameParse !== null
+	}
+
+	/**
+	 * Wait for the filename parser, giving up after `timeoutMs`
+	 *
+	 * @returns Whether the parser is ready
+	 */
+	public async whenReady(timeoutMs: number): Promise<boolean> {
+		if (this.filenameParse) {
+			return true
+		}
+
+		let timer: NodeJS.Timeout | undefined
+		const deadline = new Promise<void>((resolve) => {
+			timer = setTimeout(resolve, timeoutMs)
+		})
+
+		await Promise.race([this.init(), deadline])
+		clearTimeout(timer)
+		return this.filenameParse !== null
 	}
 
 	/**
@@ -61,8 +107,11 @@ export class VideoAnalyzerService {
 
 	/**
 	 * Analyze video content to determine type and metadata
+	 *
+	 * Results are memoized per filename and duration (in whole minutes), so
+	 * a file is parsed once rather than on every presence update.
 	 */
-	public analyzeVideo(vlcStatus: VlcStatus, filename?: string): VideoAnalysis {
+	public analyzeVideo(vlcStatus: VlcStatus, filename?: string): Readonly<VideoAnalysis> {
 		if (vlcStatus.mediaType !== "video") {
 			return {
 				isVideo: false,
@@ -75,8 +124,46 @@ export class VideoAnalyzerService {
 		const title = vlcStatus.media.title || ""
 		const duration = vlcStatus.playback?.duration || 0
 		const actualFilename = filename || title
+		const key = `${actualFilename}\u0000${title}\u0000${Math.floor(duration / 60)}`
+
+		const cached = this.analysisCache.get(key)
+		if (cached) {
+			// Refresh the LRU position
+			this.analysisCache.delete(key)
+			this.analysisCache.set(key, cached)
+			this.cacheStats.hits++
+			return cached
+		}
+
+		this.cacheStats.misses++
+		const analysis = Object.freeze(this.computeAnalysis(title, duration, actualFilename))
+
+		// Results from the basic fallback are redone once the parser is ready
+		if (this.filenameParse || !actualFilename) {
+			this.analysisCache.set(key, analysis)
+			if (this.analysisCache.size > MAX_CACHED_ANALYSES) {
+				const oldest = this.analysisCache.keys().next().value
+				if (oldest !== undefined) {
+					this.analysisCache.delete(oldest)
+				}
+			}
+		}
+
+		return analysis
+	}
+
+	/**
+	 * Get memo cache hit and miss counters
+	 */
+	public getCacheStats(): VideoAnalysisCacheStats {
+		return { ...this.cacheStats, entries: this.analysisCache.size }
+	}
 
-		logger.info(`Analyzing video: "${actualFilename}" with duration: ${duration}s`)
+	/**
+	 * Parse a video filename and combine it with duration heuristics
+	 */
+	private computeAnalysis(title: string, duration: number, actualFilename: string): VideoAnalysis {
+		logger.debug(() => `Analyzing video: "${actualFilename}" with duration: ${duration}s`)
 
 		// First, let's try to determine if it's a TV show based on duration heuristics
 		const durationMinutes = duration / 60
@@ -86,7 +173,7 @@ export class VideoAnalyzerService {
 		// Movies are typically 90+ minutes
 		if (durationMinutes > 0 && durationMinutes < 90) {
 			likelyTvShow = true
-			logger.info(`Duration ${durationMinutes.toFixed(1)} minutes suggests TV show`)
+			logger.debug(() => `Duration ${durationMinutes.toFixed(1)} minutes suggests TV show`)
 		}
 
 		// Parse filename to get detailed information
@@ -97,7 +184,7 @@ export class VideoAnalyzerService {
 			try {
 				// First try parsing as TV show
 				parsedInfo = this.filenameParse(actualFilename, true)
-				logger.info(`Parsed as TV show: ${JSON.stringify(parsedInfo)}`)
+				logger.trace("Parsed as TV show:", parsedInfo)
 
 				// Check if it actually has TV show characteristics
 				if (parsedInfo && isParsedShow(parsedInfo)) {
@@ -111,25 +198,26 @@ export class VideoAnalyzerService {
 				if (!isTvShow) {
 					// If no TV characteristics found, try parsing as movie
 					parsedInfo = this.filenameParse(actualFilename, false)
-					logger.info(`Parsed as movie: ${JSON.stringify(parsedInfo)}`)
+					logger.trace("Parsed as movie:", parsedInfo)
 				}
 			} catch (error) {
 				logger.warn(`Error parsing filename "${actualFilename}": ${error}`)
 			}
 		} else if (actualFilename && !this.filenameParse) {
 			logger.warn("Filename parser not yet initialized, falling back to basic analysis")
+			this.init()
 		}
 
 		// Combine heuristics with parsed data
 		if (!isTvShow && likelyTvShow) {
 			// Duration suggests TV show but filename parser didn't detect it
 			// This could be a TV show with non-standard naming
-			logger.info("Duration heuristic suggests TV show despite filename parsing")
+			logger.debug("Duration heuristic suggests TV show despite filename parsing")
 		}
 
 		if (isTvShow && !likelyTvShow && durationMinutes > 120) {
 			// Filename suggests TV show but duration is very long (might be a movie)
-			logger.info("Long duration suggests movie despite TV show filename pattern")
+			logger.debug("Long duration suggests movie despite TV show filename pattern")
 			isTvShow = false
 		}
 
@@ -171,14 +259,14 @@ export class VideoAnalyzerService {
 			originalFilename: actualFilename,
 		}
 
-		logger.info(`Video analysis result: ${JSON.stringify(analysis)}`)
+		logger.debug("Video analysis result:", analysis)
 		return analysis
 	}
 
 	/**
 	 * Format video title for Discord display based on analysis
 	 */
-	public formatVideoTitle(analysis: VideoAnalysis): { details: string; state: string } {
+	public formatVideoTitle(analysis: Readonly<VideoAnalysis>): { details: string; state: string } {
 		if (!analysis.isVideo) {
 			return {
 				details: analysis.title,
@@ -219,7 +307,7 @@ export class VideoAnalyzerService {
 	/**
 	 * Get appropriate large text for Discord based on analysis
 	 */
-	public getLargeText(analysis: VideoAnalysis): string {
+	public getLargeText(analysis: Readonly<VideoAnalysis>): string {
 		if (!analysis.isVideo) {
 			return "Watching Video"
 		}
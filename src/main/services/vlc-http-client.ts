@@ -0,0 +1,215 @@
+import * as http from "node:http"
+import { logger } from "@main/services/logger"
+import type { VlcHttpStats } from "@shared/types/vlc"
+
+/** Default timeout for a single request to VLC */
+const DEFAULT_TIMEOUT = 2000
+/** Upper bounds (ms) of the latency histogram buckets, the last bucket catches everything above */
+const LATENCY_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2000]
+
+/**
+ * Response from VLC's HTTP interface
+ */
+export interface VlcHttpResponse {
+	status: number
+	body: string
+}
+
+/**
+ * Options for a single request to VLC
+ */
+export interface VlcRequestOptions {
+	/** Timeout for this request in milliseconds */
+	timeoutMs?: number
+	/** Absolute time (epoch ms) by which the whole operation must finish */
+	deadline?: number
+}
+
+/**
+ * HTTP client for VLC's Lua web interface
+ *
+ * Keeps a small pool of keep-alive sockets to localhost so constant short
+ * polling doesn't pay TCP setup on every tick. The auth header is built once
+ * per configuration change and reused for every request.
+ */
+export class VlcHttpClient {
+	private static instance: VlcHttpClient | null = null
+	private agent: http.Agent
+	private port = 8080
+	private authorization = ""
+	private lastAuthRejected = false
+	private stats = {
+		requests: 0,
+		reusedSockets: 0,
+		failures: 0,
+		timeouts: 0,
+		latencyCounts: new Array<number>(LATENCY_BUCKETS.length + 1).fill(0),
+	}
+
+	private constructor() {
+		this.agent = this.createAgent()
+	}
+
+	/**
+	 * Get the singleton instance of the VLC HTTP client
+	 */
+	public static getInstance(): VlcHttpClient {
+		if (!VlcHttpClient.instance) {
+			VlcHttpClient.instance = new VlcHttpClient()
+		}
+		return VlcHttpClient.instance
+	}
+
+	/**
+	 * Set the port and password used to reach VLC
+	 */
+	public configure(port: number, password: string): void {
+		// VLC requires an empty username with the password
+		const credentials = Buffer.from(`:${password || ""}`).toString("base64")
+		this.authorization = `Basic ${credentials}`
+		this.lastAuthRejected = false
+
+		// Sockets to a previous port are useless now
+		if (port !== this.port) {
+			this.agent.destroy()
+			this.agent = this.createAgent()
+		}
+		this.port = port
+
+		logger.info(
+			`VLC HTTP client configured for port ${port} (password length: ${password ? password.length : 0})`,
+		)
+	}
+
+	/**
+	 * Issue a GET request under `/requests/`
+	 *
+	 * Rejects with an `AbortError` when the timeout or deadline is hit, and
+	 * with the socket error (e.g. `ECONNREFUSED`) when VLC isn't reachable.
+	 */
+	public get(path: string, options: VlcRequestOptions = {}): Promise<VlcHttpResponse> {
+		const startedAt = Date.now()
+		let timeoutMs = options.timeoutMs ?? DEFAULT_TIMEOUT
+		if (options.deadline !== undefined) {
+			timeoutMs = Math.min(timeoutMs, options.deadline - startedAt)
+		}
+
+		this.stats.requests++
+
+		if (timeoutMs <= 0) {
+			this.stats.timeouts++
+			return Promise.reject(this.createAbortError())
+		}
+
+		return new Promise<VlcHttpResponse>((resolve, reject) => {
+			const req = http.request(
+				{
+					host: "localhost",
+					port: this.port,
+					path: `/requests/${path}`,
+					method: "GET",
+					agent: this.agent,
+					headers: {
+						Authorization: this.authorization,
+						Accept: "application/json",
+					},
+				},
+				(res) => {
+					const chunks: Buffer[] = []
+					res.on("data", (chunk: Buffer) => chunks.push(chunk))
+					res.on("end", () => {
+						clearTimeout(timer)
+						this.recordLatency(Date.now() - startedAt)
+						this.trackAuth(res.statusCode || 0)
+						resolve({
+							status: res.statusCode || 0,
+							body: Buffer.concat(chunks).toString("utf-8"),
+						})
+					})
+					res.on("error", fail)
+				},
+			)
+
+			const timer = setTimeout(() => {
+				this.stats.timeouts++
+				req.destroy(this.createAbortError())
+			}, timeoutMs)
+
+			function fail(error: Error): void {
+				clearTimeout(timer)
+				reject(error)
+			}
+
+			req.on("socket", () => {
+				if (req.reusedSocket) {
+					this.stats.reusedSockets++
+				}
+			})
+			req.on("error", (error) => {
+				if (error.name !== "AbortError") {
+					this.stats.failures++
+				}
+				fail(error)
+			})
+			req.end()
+		})
+	}
+
+	/**
+	 * Get connection reuse and latency statistics
+	 */
+	public getStats(): VlcHttpStats {
+		const { requests, reusedSockets, failures, timeouts, latencyCounts } = this.stats
+		return {
+			requests,
+			reusedSockets,
+			reuseRate: requests > 0 ? reusedSockets / requests : 0,
+			failures,
+			timeouts,
+			latency: {
+				bucketsMs: [...LATENCY_BUCKETS],
+				counts: [...latencyCounts],
+			},
+		}
+	}
+
+	/**
+	 * Log auth rejections once instead of on every poll
+	 */
+	private trackAuth(status: number): void {
+		const rejected = status === 401
+		if (rejected && !this.lastAuthRejected) {
+			logger.error("VLC rejected the HTTP password, check it in VLC and in the settings")
+		}
+		this.lastAuthRejected = rejected
+	}
+
+	/**
+	 * Create the keep-alive socket pool
+	 */
+	private createAgent(): http.Agent {
+		// VLC's Lua httpd serves one request at a time, so a couple of sockets is plenty
+		return new http.Agent({
+			keepAlive: true,
+			keepAliveMsecs: 10000,
+			maxSockets: 2,
+			maxFreeSockets: 2,
+		})
+	}
+
+	private recordLatency(ms: number): void {
+		let bucket = LATENCY_BUCKETS.findIndex((limit) => ms <= limit)
+		if (bucket === -1) {
+			bucket = LATENCY_BUCKETS.length
+		}
+		this.stats.latencyCounts[bucket]++
+	}
+
+	private createAbortError(): Error {
+		const error = new Error("Request to VLC timed out")
+		error.name = "AbortError"
+		return error
+	}
+}
+
+export const vlcHttpClient = VlcHttpClient.getInstance()
@@ -0,0 +1,202 @@
+import { logger } from "@main/services/logger"
+import { PollScheduler } from "@main/services/poll-scheduler"
+import { vlcStatusService } from "@main/services/vlc-status"
+import type { PollCadence, VlcStatus, VlcStatusChange } from "@shared/types/vlc"
+
+/**
+ * Callback invoked with every status read by the poller, along with what
+ * changed since the previous read
+ */
+export type VlcStatusListener = (
+	status: VlcStatus | null,
+	change: VlcStatusChange,
+) => void | Promise<void>
+
+/** How long a status read stays fresh for on-demand callers */
+const STATUS_MAX_AGE = 2000
+
+/**
+ * Single owner of the VLC `status.json` fetch cadence
+ *
+ * Every consumer in the main process (Discord loop, renderer IPC, media info)
+ * reads VLC through this service, so VLC only sees one request per tick no
+ * matter how many subscribers there are. The delay between ticks adapts to
+ * the playback state through {@link PollScheduler}.
+ */
+export class VlcPollerService {
+	private static instance: VlcPollerService | null = null
+	private listeners: Set<VlcStatusListener> = new Set()
+	private timer: NodeJS.Timeout | null = null
+	private running = false
+	private scheduler: PollScheduler
+	private inFlight: Promise<VlcStatus | null> | null = null
+	private lastStatus: VlcStatus | null = null
+	private lastPolledAt = 0
+
+	private constructor() {
+		const baseInterval =
+			Math.max(1, Math.min(15, Number(process.env.UPDATE_INTERVAL) || 10)) * 1000
+		this.scheduler = new PollScheduler(baseInterval)
+		logger.info(`VLC poller initialized (base interval ${baseInterval}ms)`)
+	}
+
+	/**
+	 * Get the singleton instance of the VLC poller service
+	 */
+	public static getInstance(): VlcPollerService {
+		if (!VlcPollerService.instance) {
+			VlcPollerService.instance = new VlcPollerService()
+		}
+		return VlcPollerService.instance
+	}
+
+	/**
+	 * Subscribe to status updates. The poller starts with the first subscriber
+	 * and stops once the last one is gone.
+	 *
+	 * @returns Function that removes the subscription
+	 */
+	public subscribe(listener: VlcStatusListener): () => void {
+		this.listeners.add(listener)
+		this.start()
+
+		return () => {
+			this.listeners.delete(listener)
+			if (this.listeners.size === 0) {
+				this.stop()
+			}
+		}
+	}
+
+	/**
+	 * Whether the poller is running
+	 */
+	public isRunning(): boolean {
+		return this.running
+	}
+
+	/**
+	 * Get the current poll cadence and the reason it was chosen
+	 */
+	public getCadence(): PollCadence {
+		return this.scheduler.getCadence()
+	}
+
+	/**
+	 * Start polling, the first poll happens immediately
+	 */
+	public start(): void {
+		if (this.running) {
+			return
+		}
+
+		logger.info("Starting VLC status poller")
+		this.running = true
+		this.poll()
+	}
+
+	/**
+	 * Stop polling
+	 */
+	public stop(): void {
+		if (!this.running) {
+			return
+		}
+
+		this.running = false
+		this.clearTimer()
+		logger.info("VLC status poller stopped")
+	}
+
+	/**
+	 * Read the VLC status now and publish it to every subscriber.
+	 * Concurrent calls share the same in-flight request.
+	 */
+	public poll(): Promise<VlcStatus | null> {
+		if (this.inFlight) {
+			return this.inFlight
+		}
+
+		this.inFlight = this.fetchAndPublish().finally(() => {
+			this.inFlight = null
+		})
+		return this.inFlight
+	}
+
+	/**
+	 * Get the latest known status without issuing a new request when the
+	 * cached value is still fresh
+	 */
+	public async getLatestStatus(): Promise<VlcStatus | null> {
+		if (this.inFlight) {
+			return this.inFlight
+		}
+
+		if (this.lastPolledAt > 0 && Date.now() - this.lastPolledAt < STATUS_MAX_AGE) {
+			return this.lastStatus
+		}
+
+		return this.poll()
+	}
+
+	/**
+	 * Fetch the status from VLC, fan it out to subscribers and schedule the next poll
+	 */
+	private async fetchAndPublish(): Promise<VlcStatus | null> {
+		const status = await vlcStatusService.readStatus()
+		const change = status ? vlcStatusService.getLastChange() : "semantic"
+		this.lastStatus = status
+		this.lastPolledAt = Date.now()
+
+		const previousReason = this.scheduler.getCadence().reason
+		const cadence = this.scheduler.record(status, this.lastPolledAt)
+		if (cadence.reason !== previousReason) {
+			logger.info(`VLC poll cadence: ${cadence.intervalMs}ms (${cadence.reason})`)
+		}
+
+		if (this.running) {
+			this.clearTimer()
+			this.timer = setTimeout(() => {
+				this.timer = null
+				this.poll()
+			}, cadence.intervalMs)
+		}
+
+		// Listeners run detached so a slow consumer (e.g. cover art lookup)
+		// never holds up the next poll or callers waiting on this one
+		for (const listener of this.listeners) {
+			this.notify(listener, status, change)
+		}
+
+		return status
+	}
+
+	/**
+	 * Invoke a single listener, logging any failure
+	 */
+	private notify(
+		listener: VlcStatusListener,
+		status: VlcStatus | null,
+		change: VlcStatusChange,
+	): void {
+		try {
+			Promise.resolve(listener(status, change)).catch((error) => {
+				logger.error(`VLC status listener failed: ${error}`)
+			})
+		} catch (error) {
+			logger.error(`VLC status listener failed: ${error}`)
+		}
+	}
+
+	/**
+	 * Clear the pending poll timer
+	 */
+	private clearTimer(): void {
+		if (this.timer !== null) {
+			clearTimeout(this.timer)
+			this.timer = null
+		}
+	}
+}
+
+export const vlcPollerService = VlcPollerService.getInstance()
@@ -1,26 +1,37 @@
-import { createHash } from "node:crypto"
 import { configService } from "@main/services/config"
 import { logger } from "@main/services/logger"
+import { metricsService } from "@main/services/metrics"
+import { vlcHttpClient } from "@main/services/vlc-http-client"
 import type { VlcConfig } from "@shared/types"
 import type {
 	VlcConnectionStatus,
+	VlcHttpStats,
 	VlcMetadata,
 	VlcPlaylistItem,
 	VlcPlaylistResponse,
 	VlcRawStatus,
 	VlcStatus,
+	VlcStatusChange,
 	VlcStreamInfo,
 } from "@shared/types/vlc"
 
+/** Seconds the playback time may deviate from wall-clock progress before it counts as a seek */
+const SEEK_TOLERANCE = 2
+/** Time budget for a whole status read */
+const STATUS_DEADLINE = 2000
+
 /**
  * Service to read and process VLC media status through HTTP interface
  */
 export class VlcStatusService {
 	private static instance: VlcStatusService | null = null
-	private lastStatusHash = ""
+	private lastFingerprint = ""
 	private lastStatus: VlcStatus | null = null
+	private lastReadAt = 0
+	private lastChange: VlcStatusChange = "semantic"
 	private baseUrl = ""
-	private authHeader: Record<string, string> = {}
+	private playlistIndex: Map<string, { uri: string; name: string }> = new Map()
+	private unindexedPlaylistId: number | null = null
 
 	private constructor() {
 		this.updateConnectionInfo()
@@ -42,34 +53,22 @@ export class VlcStatusService {
 	public updateConnectionInfo(): void {
 		const vlcConfig = configService.get<VlcConfig>("vlc")
 		this.baseUrl = `http://localhost:${vlcConfig.httpPort}/requests/`
-		this.authHeader = this.createAuthHeader(vlcConfig.httpPassword)
+		vlcHttpClient.configure(vlcConfig.httpPort, vlcConfig.httpPassword)
+		this.clearPlaylistIndex()
 		logger.info(`VLC status service configured for ${this.baseUrl}`)
-		logger.info(`Auth headers created: ${Object.keys(this.authHeader).length > 0 ? "Yes" : "No"}`)
 	}
 
 	/**
-	 * Create the HTTP Basic Auth header for VLC
+	 * Get connection reuse and latency statistics for requests to VLC
 	 */
-	private createAuthHeader(password: string): Record<string, string> {
-		// VLC requires empty username and password in a specific format
-		const username = ""
-		const authString = `${username}:${password || ""}`
-		const base64Auth = Buffer.from(authString).toString("base64")
-
-		logger.info(
-			`Creating auth header with username: '' and password length: ${password ? password.length : 0}`,
-		)
-
-		return {
-			Authorization: `Basic ${base64Auth}`,
-			Accept: "application/json",
-		}
+	public getHttpStats(): VlcHttpStats {
+		return vlcHttpClient.getStats()
 	}
 
 	/**
 	 * Read VLC status through HTTP interface
 	 *
-	 * @param forceUpdate Whether to force an update even if hash hasn't changed
+	 * @param forceUpdate Whether to force a full conversion even if nothing relevant changed
 	 * @returns Parsed status information or null if unavailable
 	 */
 	public async readStatus(forceUpdate = false): Promise<VlcStatus | null> {
@@ -81,65 +80,42 @@ export class VlcStatusService {
 		}
 
 		try {
-			const statusUrl = new URL("status.json", this.baseUrl).toString()
-			logger.info(`Fetching VLC status from: ${statusUrl}`)
-
-			const controller = new AbortController()
-			const timeoutId = setTimeout(() => controller.abort(), 2000)
+			logger.trace(() => `Fetching VLC status from: ${this.baseUrl}status.json`)
 
-			logger.info(
-				`Making request with headers: ${JSON.stringify({
-					...this.authHeader,
-					Authorization: this.authHeader.Authorization ? "Basic ***" : undefined,
-				})}`,
+			const response = await metricsService.timeAsync("vlc.fetch_ms", () =>
+				vlcHttpClient.get("status.json", {
+					deadline: Date.now() + STATUS_DEADLINE,
+				}),
 			)
 
-			const response = await fetch(statusUrl, {
-				headers: this.authHeader,
-				signal: controller.signal,
-			})
-
-			clearTimeout(timeoutId)
-
-			logger.info(`VLC response status: ${response.status}`)
+			logger.trace(() => `VLC response status: ${response.status}`)
 
 			if (response.status !== 200) {
 				if (response.status === 404) {
-					logger.info("VLC is not running or HTTP interface is misconfigured")
-				} else if (response.status === 401) {
-					logger.error(
-						`Authentication failed. Check your HTTP password. Auth header: ${this.authHeader.Authorization ? "Present" : "Missing"}`,
-					)
-					return await this.retryWithAlternativeAuth(statusUrl)
-				} else {
+					logger.debug("VLC is not running or HTTP interface is misconfigured")
+				} else if (response.status !== 401) {
+					// 401 is reported once by the HTTP client rather than on every poll
 					logger.error(`Failed to get VLC status: HTTP ${response.status}`)
 				}
 				return null
 			}
 
-			const content = await response.text()
-			logger.info(`Received content size: ${content.length} bytes`)
+			logger.trace(() => `Received content size: ${response.body.length} bytes`)
 
-			const contentHash = createHash("md5").update(content).digest("hex")
-
-			if (contentHash === this.lastStatusHash && !forceUpdate && this.lastStatus) {
-				return this.lastStatus
-			}
-
-			this.lastStatusHash = contentHash
-			const vlcStatus: VlcRawStatus = JSON.parse(content)
-
-			const status = this.convertVlcStatus(vlcStatus)
-			this.lastStatus = status
-			logger.info("Successfully parsed VLC status")
-			return status
+			const body = metricsService.time("vlc.parse_ms", () => JSON.parse(response.body))
+			return this.processStatus(body, forceUpdate)
 		} catch (error: unknown) {
 			const err = error as Error & { code?: string }
+			if (err.code === "ECONNREFUSED" || err.code === "ECONNRESET") {
+				// VLC may have restarted, reusing playlist ids for other items
+				this.clearPlaylistIndex()
+			}
+
 			if (err.name === "AbortError") {
-				logger.info("Connection to VLC timed out")
+				logger.debug("Connection to VLC timed out")
 			} else if (err.code === "ECONNREFUSED" || err.code === "ECONNRESET") {
-				logger.info("VLC is not running or HTTP interface is not accessible")
-				logger.warn(`Error reading VLC status: ${error}`)
+				// Expected on every poll while VLC is closed
+				logger.debug(() => `VLC is not running or HTTP interface is not accessible: ${error}`)
 			} else if (error instanceof SyntaxError) {
 				logger.error("Invalid JSON in VLC response")
 			} else {
@@ -150,67 +126,85 @@ export class VlcStatusService {
 	}
 
 	/**
-	 * Try an alternative authentication approach
-	 * VLC can be picky about auth formats
+	 * Get what changed in the last status read
 	 */
-	private async retryWithAlternativeAuth(statusUrl: string): Promise<VlcStatus | null> {
-		try {
-			logger.info("Trying alternative authentication method...")
-			const vlcConfig = configService.get<VlcConfig>("vlc")
-
-			const urlWithAuth = new URL(statusUrl)
-			urlWithAuth.username = ""
-			urlWithAuth.password = vlcConfig.httpPassword || ""
-
-			logger.info(
-				`Retrying with URL-based auth: ${urlWithAuth.toString().replace(/\/\/.+?@/, "//<redacted>@")}`,
-			)
-
-			const controller = new AbortController()
-			const timeoutId = setTimeout(() => controller.abort(), 2000)
-
-			const response = await fetch(urlWithAuth.toString(), {
-				signal: controller.signal,
-				headers: { Accept: "application/json" },
-			})
-
-			clearTimeout(timeoutId)
-
-			if (response.status === 200) {
-				logger.info("Alternative authentication method successful")
-				const content = await response.text()
-				const vlcStatus: VlcRawStatus = JSON.parse(content)
-
-				const status = this.convertVlcStatus(vlcStatus)
-				this.lastStatus = status
-				this.lastStatusHash = createHash("md5").update(content).digest("hex")
-
-				this.updateAuthStrategy(vlcConfig.httpPassword)
+	public getLastChange(): VlcStatusChange {
+		return this.lastChange
+	}
 
-				return status
+	/**
+	 * Turn a raw status into our internal format, skipping the full conversion
+	 * when nothing relevant to presence changed since the previous read
+	 *
+	 * @param forceUpdate Whether to always run the full conversion
+	 */
+	private processStatus(vlcStatus: VlcRawStatus, forceUpdate: boolean): VlcStatus {
+		const now = Date.now()
+		const fingerprint = this.computeFingerprint(vlcStatus)
+		const previous = this.lastStatus
+
+		if (fingerprint === this.lastFingerprint && previous && !forceUpdate) {
+			const time = Number.parseInt(String(vlcStatus.time || 0), 10)
+			const elapsed = (now - this.lastReadAt) / 1000
+			const rate = previous.status === "playing" ? vlcStatus.rate || 1 : 0
+			const expectedTime = previous.playback.time + elapsed * rate
+
+			this.lastChange = Math.abs(time - expectedTime) > SEEK_TOLERANCE ? "seek" : "none"
+			this.lastReadAt = now
+
+			const status: VlcStatus = {
+				...previous,
+				timestamp: Math.floor(now / 1000),
+				playback: {
+					...previous.playback,
+					time,
+					position: vlcStatus.position || 0,
+				},
 			}
-			logger.error(`Alternative auth failed with status: ${response.status}`)
-			return null
-		} catch (error) {
-			logger.error(`Error with alternative auth: ${error}`)
-			return null
+			this.lastStatus = status
+			return status
 		}
+
+		const status = this.convertVlcStatus(vlcStatus)
+		this.lastFingerprint = fingerprint
+		this.lastStatus = status
+		this.lastReadAt = now
+		this.lastChange = "semantic"
+		logger.debug("Successfully parsed VLC status")
+		return status
 	}
 
 	/**
-	 * Update authentication strategy based on what works
+	 * Build a fingerprint from the fields that matter for presence.
+	 * Time and position are left out on purpose, they move every second.
 	 */
-	private updateAuthStrategy(password: string): void {
-		const username = ""
-		const authString = `${username}:${password || ""}`
-		const base64Auth = Buffer.from(authString).toString("base64")
-
-		this.authHeader = {
-			Authorization: `Basic ${base64Auth}`,
-			Accept: "application/json",
+	private computeFingerprint(vlcStatus: VlcRawStatus): string {
+		const category = vlcStatus.information?.category || {}
+		const meta = (category.meta as VlcMetadata) || {}
+		const parts: unknown[] = [
+			vlcStatus.state,
+			vlcStatus.currentplid,
+			vlcStatus.length,
+			meta.title,
+			meta.artist,
+			meta.album,
+			meta.filename,
+			meta.showName,
+			meta.movie_name,
+			meta.anime_name,
+			meta.artwork_url,
+			meta["X-COVER-URL"],
+			meta["X-EXPIRY-DATE"],
+		]
+
+		for (const [key, stream] of Object.entries(category)) {
+			if (key !== "meta" && stream) {
+				const typedStream = stream as VlcStreamInfo
+				parts.push(key, typedStream.Type, typedStream.Video_resolution)
+			}
 		}
 
-		logger.info("Updated authentication strategy")
+		return JSON.stringify(parts)
 	}
 
 	/**
@@ -236,6 +230,10 @@ export class VlcStatusService {
 			media: {},
 		}
 
+		if (vlcStatus.currentplid !== undefined && vlcStatus.currentplid >= 0) {
+			status.playlistId = vlcStatus.currentplid
+		}
+
 		const information = vlcStatus.information || {}
 		const category = information.category || {}
 
@@ -248,14 +246,14 @@ export class VlcStatusService {
 				const typedStream = stream as VlcStreamInfo
 				if (typedStream.Type === "Video") {
 					isVideo = true
-					logger.info(`Found video stream: ${typedStream.Codec}`)
+					logger.debug(() => `Found video stream: ${typedStream.Codec}`)
 					break // If we find a video stream, it's definitely video content
 				}
 			}
 		}
 
 		status.mediaType = isVideo ? "video" : "audio"
-		logger.info(`Media type detected: ${status.mediaType}`)
+		logger.debug(() => `Media type detected: ${status.mediaType}`)
 
 		// Get metadata from VLC
 		const meta = (category.meta as VlcMetadata) || {}
@@ -291,7 +289,7 @@ export class VlcStatusService {
 
 				if (!isExpired) {
 					status.media.artworkUrl = meta["X-COVER-URL"]
-					logger.info(`Using uploaded cover image: ${meta["X-COVER-URL"]}`)
+					logger.debug(() => `Using uploaded cover image: ${meta["X-COVER-URL"]}`)
 				} else {
 					logger.info("Uploaded cover image has expired, will use local artwork")
 					status.media.artworkUrl = meta.artwork_url
@@ -317,12 +315,13 @@ export class VlcStatusService {
 			}
 		}
 
-		logger.info(`Final media type: ${status.mediaType} for "${status.media.title}"`)
+		logger.debug(() => `Final media type: ${status.mediaType} for "${status.media.title}"`)
 
 		// Log metadata for debugging
 		if (meta["X-COVER-URL"]) {
-			logger.info(
-				`Custom metadata found - App: ${meta["X-PROCESSED-BY"]}, Version: ${meta["X-APP-VERSION"]}`,
+			logger.debug(
+				() =>
+					`Custom metadata found - App: ${meta["X-PROCESSED-BY"]}, Version: ${meta["X-APP-VERSION"]}`,
 			)
 		}
 
@@ -331,6 +330,11 @@ export class VlcStatusService {
 
 	/**
 	 * Get the current playing file URI from VLC playlist
+	 *
+	 * Looks the `currentplid` from the last status up in a cached playlist
+	 * index. The playlist is only downloaded again when that id is unknown,
+	 * i.e. when items were added or VLC was restarted.
+	 *
 	 * @returns The file URI of the currently playing item or null
 	 */
 	public async getCurrentFileUri(): Promise<string | null> {
@@ -341,36 +345,31 @@ export class VlcStatusService {
 			return null
 		}
 
-		try {
-			const playlistUrl = new URL("playlist.json", this.baseUrl).toString()
-			logger.info(`Fetching VLC playlist from: ${playlistUrl}`)
-
-			const controller = new AbortController()
-			const timeoutId = setTimeout(() => controller.abort(), 2000)
-
-			const response = await fetch(playlistUrl, {
-				headers: this.authHeader,
-				signal: controller.signal,
-			})
-
-			clearTimeout(timeoutId)
+		const playlistId = this.lastStatus?.playlistId
+		if (playlistId !== undefined) {
+			const cached = this.playlistIndex.get(String(playlistId))
+			if (cached) {
+				return cached.uri || null
+			}
 
-			if (response.status !== 200) {
-				logger.error(`Failed to get VLC playlist: HTTP ${response.status}`)
+			// Already refreshed for this id without finding it, don't download again
+			if (playlistId === this.unindexedPlaylistId) {
 				return null
 			}
+		}
 
-			const content = await response.text()
-			const playlist: VlcPlaylistResponse = JSON.parse(content)
+		try {
+			const currentId = await this.refreshPlaylistIndex()
+			const lookupId = playlistId !== undefined ? String(playlistId) : currentId
+			const currentItem = lookupId !== null ? this.playlistIndex.get(lookupId) : undefined
 
-			// Find the current playing item
-			const currentItem = this.findCurrentPlayingItem(playlist)
 			if (currentItem?.uri) {
-				logger.info(`Current playing file: ${currentItem.uri}`)
+				logger.debug(() => `Current playing file: ${currentItem.uri}`)
 				return currentItem.uri
 			}
 
-			logger.info("No current playing item found in playlist")
+			this.unindexedPlaylistId = playlistId ?? null
+			logger.debug("No current playing item found in playlist")
 			return null
 		} catch (error) {
 			logger.error(`Error getting current file URI: ${error}`)
@@ -379,28 +378,58 @@ export class VlcStatusService {
 	}
 
 	/**
-	 * Recursively search for the current playing item in the playlist
-	 * @param item - Playlist item to search
-	 * @returns The current playing item or null
+	 * Download the playlist and rebuild the id → item index
+	 * @returns The id of the item VLC marks as current, if any
 	 */
-	private findCurrentPlayingItem(item: VlcPlaylistResponse): VlcPlaylistItem | null {
-		// Check if this item is marked as current
-		if ("current" in item && (item as VlcPlaylistItem).current === "current") {
-			return item as VlcPlaylistItem
+	private async refreshPlaylistIndex(): Promise<string | null> {
+		logger.debug(() => `Fetching VLC playlist from: ${this.baseUrl}playlist.json`)
+
+		const response = await vlcHttpClient.get("playlist.json")
+
+		if (response.status !== 200) {
+			logger.error(`Failed to get VLC playlist: HTTP ${response.status}`)
+			return null
 		}
 
-		// Search in children
-		if (item.children) {
-			for (const child of item.children) {
-				const found = this.findCurrentPlayingItem(child as VlcPlaylistResponse)
-				if (found) {
-					return found
-				}
+		const playlist: VlcPlaylistResponse = JSON.parse(response.body)
+
+		this.playlistIndex.clear()
+		this.unindexedPlaylistId = null
+		let currentId: string | null = null
+
+		// Iterative walk, deeply nested playlists shouldn't grow the call stack
+		const stack: VlcPlaylistItem[] = [...(playlist.children || [])]
+		while (stack.length > 0) {
+			const item = stack.pop() as VlcPlaylistItem
+
+			if (item.uri) {
+				this.playlistIndex.set(item.id, { uri: item.uri, name: item.name })
+			}
+
+			if (item.current === "current") {
+				currentId = item.id
+			}
+
+			if (item.children) {
+				stack.push(...item.children)
 			}
 		}
 
-		return null
+		logger.debug(
+			() =>
+				`Indexed ${this.playlistIndex.size} playlist items from ${playlist.children?.length || 0} root nodes`,
+		)
+		return currentId
+	}
+
+	/**
+	 * Drop the cached playlist index, ids are only valid within one VLC session
+	 */
+	private clearPlaylistIndex(): void {
+		this.playlistIndex.clear()
+		this.unindexedPlaylistId = null
 	}
+
 	public async checkVlcStatus(): Promise<VlcConnectionStatus> {
 		const vlcConfig = configService.get<VlcConfig>("vlc")
 
@@ -409,17 +438,7 @@ export class VlcStatusService {
 		}
 
 		try {
-			const statusUrl = new URL("status.json", this.baseUrl).toString()
-
-			const controller = new AbortController()
-			const timeoutId = setTimeout(() => controller.abort(), 2000)
-
-			const response = await fetch(statusUrl, {
-				headers: this.authHeader,
-				signal: controller.signal,
-			})
-
-			clearTimeout(timeoutId)
+			const response = await vlcHttpClient.get("status.json")
 
 			switch (response.status) {
 				case 200:
@@ -4,6 +4,7 @@ import { BrowserWindow, app, ipcMain, session, shell } from "electron"
 import { configService } from "./config"
 import { discordRpcService } from "./discord-rpc"
 import { logger } from "./logger"
+import { metricsService } from "./metrics"
 import { trayService } from "./tray"
 
 /**
@@ -31,11 +32,11 @@ export class WindowService {
 	 * Register IPC handlers for window controls
 	 */
 	private registerIpcHandlers(): void {
-		ipcMain.handle("window:minimize", () => {
+		metricsService.handle("window:minimize", () => {
 			this.mainWindow?.minimize()
 		})
 
-		ipcMain.handle("window:maximize", () => {
+		metricsService.handle("window:maximize", () => {
 			if (this.mainWindow?.isMaximized()) {
 				this.mainWindow.unmaximize()
 			} else {
@@ -43,15 +44,15 @@ export class WindowService {
 			}
 		})
 
-		ipcMain.handle("window:close", () => {
+		metricsService.handle("window:close", () => {
 			this.mainWindow?.close()
 		})
 
-		ipcMain.handle("window:isMaximized", () => {
+		metricsService.handle("window:isMaximized", () => {
 			return this.mainWindow?.isMaximized() || false
 		})
 
-		ipcMain.handle("system:platform", () => {
+		metricsService.handle("system:platform", () => {
 			return process.platform
 		})
 
@@ -91,7 +92,7 @@ export class WindowService {
 				responseHeaders: {
 					...details.responseHeaders,
 					"Content-Security-Policy": [
-						`default-src 'self'; script-src 'self' 'unsafe-inline' 'unsafe-eval'; img-src 'self' data: blob:; style-src 'self' 'unsafe-inline'; connect-src 'self' ws: wss:;`,
+						`default-src 'self'; script-src 'self' 'unsafe-inline' 'unsafe-eval'; img-src 'self' data: blob: vlcrpc-art:; style-src 'self' 'unsafe-inline'; connect-src 'self' ws: wss:;`,
 					],
 				},
 			})
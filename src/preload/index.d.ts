@@ -1,7 +1,17 @@
 import type { ElectronAPI } from "@electron-toolkit/preload"
-import type { AppConfig, VlcConfig } from "@shared/types"
-import type { DetectedMediaInfo } from "@shared/types/media"
-import type { VlcConnectionStatus, VlcStatus } from "@shared/types/vlc"
+import type {
+	AppConfig,
+	DiagnosticsSnapshot,
+	StartupTimelineEntry,
+	VlcConfig,
+} from "@shared/types"
+import type { ActivityUpdateStats, DetectedMediaInfo, ImageCacheStats } from "@shared/types/media"
+import type {
+	PollCadence,
+	VlcConnectionStatus,
+	VlcHttpStats,
+	VlcStatus,
+} from "@shared/types/vlc"
 
 declare global {
 	interface Window {
@@ -19,11 +29,19 @@ declare global {
 				setupConfig: (config: VlcConfig) => Promise<boolean>
 				getStatus: (forceUpdate?: boolean) => Promise<VlcStatus | null>
 				checkStatus: () => Promise<VlcConnectionStatus>
+				getPollCadence: () => Promise<PollCadence>
+				getHttpStats: () => Promise<VlcHttpStats>
+				onStatus: (callback: (status: VlcStatus | null) => void) => () => void
+				onMediaInfo: (
+					callback: (mediaInfo: (VlcStatus & DetectedMediaInfo) | null) => void,
+				) => () => void
+				onDiscordStatus: (callback: (isConnected: boolean) => void) => () => void
 			}
 			discord: {
 				connect: () => Promise<boolean>
 				disconnect: () => Promise<boolean>
 				getStatus: () => Promise<boolean>
+				getActivityStats: () => Promise<ActivityUpdateStats>
 				updatePresence: () => Promise<boolean>
 				startUpdateLoop: () => Promise<boolean>
 				stopUpdateLoop: () => Promise<boolean>
@@ -33,7 +51,12 @@ declare global {
 				getMediaInfo: () => Promise<(VlcStatus & DetectedMediaInfo) | null>
 			}
 			image: {
-				getAsDataUrl: (url: string) => Promise<string | null>
+				getArtworkUrl: (url: string) => Promise<string | null>
+				getCacheStats: () => Promise<ImageCacheStats>
+			}
+			diagnostics: {
+				getSnapshot: () => Promise<DiagnosticsSnapshot>
+				exportSnapshot: () => Promise<string | null>
 			}
 			app: {
 				minimize: () => Promise<void>
@@ -42,6 +65,7 @@ declare global {
 				isMaximized: () => Promise<boolean>
 				getPlatform: () => Promise<string>
 				isPortable: () => Promise<boolean>
+				getStartupTimeline: () => Promise<StartupTimelineEntry[]>
 				onMaximizedChange: (callback: (isMaximized: boolean) => void) => () => void
 			}
 			update: {
@@ -10,6 +10,19 @@ exposeConf()
 // Expose electron-winston to renderer
 exposeLogger()
 
+/**
+ * Listen to a main-to-renderer push channel
+ * @returns Cleanup function that removes the listener
+ */
+function subscribe<T>(channel: string, callback: (payload: T) => void): () => void {
+	const handler = (_: unknown, payload: T) => callback(payload)
+	ipcRenderer.on(channel, handler)
+
+	return () => {
+		ipcRenderer.removeListener(channel, handler)
+	}
+}
+
 // Custom APIs for renderer
 const api = {
 	config: {
@@ -28,11 +41,20 @@ const api = {
 		getStatus: (forceUpdate = false) =>
 			ipcRenderer.invoke(`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_GET}`, forceUpdate),
 		checkStatus: () => ipcRenderer.invoke(`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_CHECK}`),
+		getPollCadence: () => ipcRenderer.invoke(`${IpcChannels.VLC}:${IpcEvents.VLC_POLL_CADENCE}`),
+		getHttpStats: () => ipcRenderer.invoke(`${IpcChannels.VLC}:${IpcEvents.VLC_HTTP_STATS}`),
+		onStatus: (callback: (status: unknown) => void) =>
+			subscribe(`${IpcChannels.VLC}:${IpcEvents.VLC_STATUS_UPDATE}`, callback),
+		onMediaInfo: (callback: (mediaInfo: unknown) => void) =>
+			subscribe(`${IpcChannels.MEDIA}:${IpcEvents.MEDIA_INFO_UPDATE}`, callback),
+		onDiscordStatus: (callback: (isConnected: boolean) => void) =>
+			subscribe(`${IpcChannels.DISCORD}:${IpcEvents.DISCORD_STATUS_UPDATE}`, callback),
 	},
 	discord: {
 		connect: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:connect`),
 		disconnect: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:disconnect`),
 		getStatus: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:status`),
+		getActivityStats: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:activity-stats`),
 		updatePresence: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:update`),
 		startUpdateLoop: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:start-loop`),
 		stopUpdateLoop: () => ipcRenderer.invoke(`${IpcChannels.DISCORD}:stop-loop`),
@@ -42,8 +64,16 @@ const api = {
 		getMediaInfo: () => ipcRenderer.invoke(`${IpcChannels.MEDIA}:get-media-info`),
 	},
 	image: {
-		getAsDataUrl: (url: string) =>
+		getArtworkUrl: (url: string) =>
 			ipcRenderer.invoke(`${IpcChannels.IMAGE}:${IpcEvents.IMAGE_PROXY}`, url),
+		getCacheStats: () =>
+			ipcRenderer.invoke(`${IpcChannels.IMAGE}:${IpcEvents.IMAGE_CACHE_STATS}`),
+	},
+	diagnostics: {
+		getSnapshot: () =>
+			ipcRenderer.invoke(`${IpcChannels.DIAGNOSTICS}:${IpcEvents.DIAGNOSTICS_SNAPSHOT}`),
+		exportSnapshot: () =>
+			ipcRenderer.invoke(`${IpcChannels.DIAGNOSTICS}:${IpcEvents.DIAGNOSTICS_EXPORT}`),
 	},
 	app: {
 		minimize: () => ipcRenderer.invoke("window:minimize"),
@@ -52,6 +82,7 @@ const api = {
 		isMaximized: () => ipcRenderer.invoke("window:isMaximized"),
 		getPlatform: () => ipcRenderer.invoke("system:platform"),
 		isPortable: () => ipcRenderer.invoke("app:isPortable"),
+		getStartupTimeline: () => ipcRenderer.invoke("app:startupTimeline"),
 		onMaximizedChange: (callback: (isMaximized: boolean) => void) => {
 			const handler = (_: unknown, isMaximized: boolean) => callback(isMaximized)
 			ipcRenderer.on("window:maximized-change", handler)
@@ -0,0 +1,254 @@
+import { Button } from "@renderer/components/ui/button"
+import { cn, logger } from "@renderer/lib/utils"
+import type { DiagnosticsSnapshot } from "@shared/types"
+import { useEffect, useState } from "react"
+
+/** How often the panel refreshes while it's open */
+const REFRESH_INTERVAL = 2000
+
+function formatMs(ms: number): string {
+	return ms >= 1000 ? `${(ms / 1000).toFixed(2)} s` : `${ms.toFixed(1)} ms`
+}
+
+function formatBytes(bytes: number): string {
+	if (bytes >= 1024 * 1024) return `${(bytes / 1024 / 1024).toFixed(1)} MB`
+	if (bytes >= 1024) return `${(bytes / 1024).toFixed(1)} KB`
+	return `${bytes} B`
+}
+
+function formatRatio(hits: number, total: number): string {
+	return total > 0 ? `${Math.round((hits / total) * 100)}%` : "–"
+}
+
+function Section({ title, children }: { title: string; children: React.ReactNode }): JSX.Element {
+	return (
+		<section className="bg-card text-card-foreground rounded-md overflow-hidden border border-border">
+			<div className="border-b border-border px-4 py-3">
+				<h2 className="font-semibold">{title}</h2>
+			</div>
+			<div className="p-4">{children}</div>
+		</section>
+	)
+}
+
+function Table({ headers, rows }: { headers: string[]; rows: (string | number)[][] }): JSX.Element {
+	if (rows.length === 0) {
+		return <p className="text-sm text-muted-foreground">Nothing recorded yet</p>
+	}
+
+	return (
+		<table className="w-full text-sm">
+			<thead>
+				<tr className="text-left text-muted-foreground">
+					{headers.map((header, index) => (
+						<th key={header} className={cn("font-medium pb-2", index > 0 && "text-right")}>
+							{header}
+						</th>
+					))}
+				</tr>
+			</thead>
+			<tbody>
+				{rows.map((row) => (
+					<tr key={String(row[0])} className="border-t border-border">
+						{row.map((cell, index) => (
+							<td
+								// biome-ignore lint/suspicious/noArrayIndexKey: cells are positional
+								key={index}
+								className={cn(
+									"py-1.5",
+									index === 0 ? "font-mono text-xs" : "text-right tabular-nums",
+								)}
+							>
+								{cell}
+							</td>
+						))}
+					</tr>
+				))}
+			</tbody>
+		</table>
+	)
+}
+
+/**
+ * Live view of the main process metrics and service stats
+ */
+export function DiagnosticsPanel(): JSX.Element {
+	const [snapshot, setSnapshot] = useState<DiagnosticsSnapshot | null>(null)
+	const [isExporting, setIsExporting] = useState(false)
+	const [exportedPath, setExportedPath] = useState<string | null>(null)
+
+	useEffect(() => {
+		let cancelled = false
+
+		const refresh = async () => {
+			try {
+				const next = await window.api.diagnostics.getSnapshot()
+				if (!cancelled) {
+					setSnapshot(next)
+				}
+			} catch (error) {
+				logger.error(`Failed to load diagnostics: ${error}`)
+			}
+		}
+
+		refresh()
+		const timer = setInterval(refresh, REFRESH_INTERVAL)
+		return () => {
+			cancelled = true
+			clearInterval(timer)
+		}
+	}, [])
+
+	async function handleExport() {
+		setIsExporting(true)
+		try {
+			setExportedPath(await window.api.diagnostics.exportSnapshot())
+		} catch (error) {
+			logger.error(`Failed to export diagnostics: ${error}`)
+		} finally {
+			setIsExporting(false)
+		}
+	}
+
+	if (!snapshot) {
+		return <div className="p-6 text-center text-foreground">Loading diagnostics...</div>
+	}
+
+	const { metrics, imageCache, videoAnalysisCache, activity, uploads, configWrites } = snapshot
+	const counter = (name: string) => metrics.counters[name] ?? 0
+	const artworkHits = counter("artwork_cache.hits")
+
+	const latencyRows = Object.entries(metrics.histograms)
+		.sort(([a], [b]) => a.localeCompare(b))
+		.map(([name, h]) => [name, h.count, formatMs(h.p50), formatMs(h.p95), formatMs(h.max)])
+
+	const cacheRows = [
+		[
+			"Image cache",
+			imageCache.hits + imageCache.diskHits,
+			imageCache.misses,
+			formatRatio(
+				imageCache.hits + imageCache.diskHits,
+				imageCache.hits + imageCache.diskHits + imageCache.misses,
+			),
+		],
+		[
+			"Artwork lookups",
+			artworkHits,
+			counter("artwork_cache.misses"),
+			formatRatio(artworkHits, artworkHits + counter("artwork_cache.misses")),
+		],
+		[
+			"Video analysis",
+			videoAnalysisCache.hits,
+			videoAnalysisCache.misses,
+			formatRatio(videoAnalysisCache.hits, videoAnalysisCache.hits + videoAnalysisCache.misses),
+		],
+		[
+			"VLC sockets reused",
+			snapshot.vlcHttp.reusedSockets,
+			snapshot.vlcHttp.requests - snapshot.vlcHttp.reusedSockets,
+			formatRatio(snapshot.vlcHttp.reusedSockets, snapshot.vlcHttp.requests),
+		],
+	]
+
+	const providerRows = Object.entries(snapshot.artworkProviders).map(([name, stats]) => [
+		name,
+		stats.lookups,
+		formatRatio(stats.hits, stats.lookups),
+		stats.wins,
+		stats.timeouts,
+		stats.lookups > 0 ? formatMs(stats.totalLatencyMs / stats.lookups) : "–",
+	])
+
+	const hostRows = Object.entries(snapshot.uploadHosts).map(([name, health]) => [
+		name,
+		health.latencyEwma !== null ? formatMs(health.latencyEwma) : "–",
+		`${Math.round(health.successRate * 100)}%`,
+		health.consecutiveFailures,
+	])
+
+	const ipcRows = Object.entries(metrics.counters)
+		.filter(([name]) => name.startsWith("ipc."))
+		.sort(([, a], [, b]) => b - a)
+		.map(([name, count]) => [name.slice("ipc.".length), count])
+
+	const otherCounterRows = Object.entries(metrics.counters)
+		.filter(([name]) => !name.startsWith("ipc.") && !name.startsWith("artwork_cache."))
+		.sort(([a], [b]) => a.localeCompare(b))
+		.map(([name, count]) => [name, count])
+
+	return (
+		<div className="space-y-6">
+			<div className="flex flex-wrap items-center justify-between gap-3 bg-card border border-border rounded-md p-4">
+				<div className="text-sm text-muted-foreground space-y-0.5">
+					<p>
+						Version {snapshot.version} ({snapshot.platform}), up{" "}
+						{formatMs(metrics.uptimeMs)}, memory{" "}
+						{formatBytes(metrics.gauges["process.rss_bytes"] ?? 0)}
+					</p>
+					<p>
+						VLC polled every {snapshot.pollCadence.intervalMs} ms ({snapshot.pollCadence.reason}),
+						Discord updates {activity.sent} sent / {activity.skipped} skipped /{" "}
+						{activity.throttled} throttled
+					</p>
+					{exportedPath && <p>Saved to {exportedPath}</p>}
+				</div>
+				<Button variant="outline" size="sm" onClick={handleExport} disabled={isExporting}>
+					{isExporting ? "Exporting..." : "Export JSON"}
+				</Button>
+			</div>
+
+			<Section title="Latency">
+				<Table headers={["Metric", "Count", "p50", "p95", "Max"]} rows={latencyRows} />
+			</Section>
+
+			<div className="grid grid-cols-1 md:grid-cols-2 gap-6">
+				<Section title="Caches">
+					<Table headers={["Cache", "Hits", "Misses", "Hit rate"]} rows={cacheRows} />
+				</Section>
+
+				<Section title="Artwork providers">
+					<Table
+						headers={["Provider", "Lookups", "Hit rate", "Picked", "Timeouts", "Avg"]}
+						rows={providerRows}
+					/>
+				</Section>
+
+				<Section title="Upload hosts">
+					<Table headers={["Host", "Latency", "Success", "Failures"]} rows={hostRows} />
+					<p className="text-xs text-muted-foreground mt-3">
+						{uploads.uploads} uploads, {uploads.failures} failed,{" "}
+						{formatBytes(uploads.bytesBefore)} shrunk to {formatBytes(uploads.bytesAfter)}
+					</p>
+				</Section>
+
+				<Section title="Storage">
+					<Table
+						headers={["Store", "Entries", "Size"]}
+						rows={[
+							["Image cache (memory)", imageCache.entries, formatBytes(imageCache.memoryBytes)],
+							[
+								"File metadata",
+								snapshot.metadata.totalFiles,
+								formatBytes(snapshot.metadata.sizeBytes),
+							],
+						]}
+					/>
+					<p className="text-xs text-muted-foreground mt-3">
+						Config: {configWrites.changes} changes in {configWrites.writes} writes (
+						{formatBytes(configWrites.bytesWritten)}), {configWrites.failures} failed
+					</p>
+				</Section>
+
+				<Section title="IPC calls">
+					<Table headers={["Channel", "Calls"]} rows={ipcRows} />
+				</Section>
+
+				<Section title="Counters">
+					<Table headers={["Counter", "Value"]} rows={otherCounterRows} />
+				</Section>
+			</div>
+		</div>
+	)
+}
@@ -35,9 +35,8 @@ export function Home(): JSX.Element {
 			}
 		}
 
+		// Further updates are pushed from the main process
 		checkStatus()
-		const intervalId = setInterval(checkStatus, 5000)
-		return () => clearInterval(intervalId)
 	}, [])
 
 	useEffect(() => {
@@ -8,6 +8,29 @@ export const lastReconnectAttemptStore = atom<number>(0)
 
 const RECONNECT_COOLDOWN = 30000
 
+let unsubscribeDiscordStatusStream: (() => void) | null = null
+
+/**
+ * Listen for Discord connection changes pushed from the main process
+ */
+export function startDiscordStatusStream(): void {
+	if (unsubscribeDiscordStatusStream) {
+		return
+	}
+
+	unsubscribeDiscordStatusStream = window.api.vlc.onDiscordStatus((isConnected) => {
+		const wasConnected = discordStatusStore.get() === "connected"
+		discordStatusStore.set(isConnected ? "connected" : "disconnected")
+
+		if (isConnected) {
+			discordErrorStore.set(null)
+		} else if (wasConnected) {
+			logger.info("Discord disconnected - will try to reconnect")
+			tryReconnect()
+		}
+	})
+}
+
 export async function checkDiscordStatus(): Promise<boolean> {
 	try {
 		const isConnected = await window.api.discord.getStatus()
@@ -153,6 +176,7 @@ export async function updateDiscordPresence(): Promise<boolean> {
 }
 
 export async function initializeDiscordStore(): Promise<void> {
+	startDiscordStatusStream()
 	const isConnected = await checkDiscordStatus()
 
 	if (isConnected) {
@@ -1,5 +1,7 @@
 import { logger } from "@renderer/lib/utils"
-import type { ContentType } from "@shared/types/media"
+import { ARTWORK_PROTOCOL } from "@shared/constants"
+import type { ContentType, DetectedMediaInfo } from "@shared/types/media"
+import type { VlcStatus } from "@shared/types/vlc"
 import { atom } from "nanostores"
 import { vlcStatusStore } from "./vlc"
 
@@ -29,51 +31,66 @@ export async function refreshMediaInfo(): Promise<void> {
 		}
 
 		const mediaInfo = await window.api.media.getMediaInfo()
+		applyMediaInfo(mediaInfo)
+	} catch (error) {
+		logger.error(`Error fetching media info: ${error}`)
+	}
+}
 
-		if (!mediaInfo || !mediaInfo.active) {
-			mediaStore.set({
-				contentType: null,
-				contentImageUrl: null,
-				title: null,
-				artist: null,
-				season: null,
-				episode: null,
-				year: null,
-			})
-			return
-		}
+let unsubscribeMediaInfoStream: (() => void) | null = null
+
+// Listen for media information pushed from the main process
+export function startMediaInfoStream(): void {
+	if (unsubscribeMediaInfoStream) {
+		return
+	}
 
+	unsubscribeMediaInfoStream = window.api.vlc.onMediaInfo(applyMediaInfo)
+}
+
+// Update the media store from a media info payload
+function applyMediaInfo(mediaInfo: (VlcStatus & DetectedMediaInfo) | null): void {
+	if (!mediaInfo || !mediaInfo.active) {
 		mediaStore.set({
-			contentType: mediaInfo.content_type || null,
-			contentImageUrl: mediaInfo.content_image_url || null,
-			title:
-				mediaInfo.content_metadata?.clean_title ||
-				mediaInfo.content_metadata?.title ||
-				mediaInfo.content_metadata?.movie_name ||
-				mediaInfo.content_metadata?.show_name ||
-				mediaInfo.content_metadata?.anime_name ||
-				null,
-			artist: mediaInfo.media?.artist || null,
-			season: mediaInfo.content_metadata?.season || null,
-			episode: mediaInfo.content_metadata?.episode || null,
-			year: mediaInfo.content_metadata?.year || null,
+			contentType: null,
+			contentImageUrl: null,
+			title: null,
+			artist: null,
+			season: null,
+			episode: null,
+			year: null,
 		})
-
-		logger.info("Media information updated")
-	} catch (error) {
-		logger.error(`Error fetching media info: ${error}`)
+		return
 	}
+
+	mediaStore.set({
+		contentType: mediaInfo.content_type || null,
+		contentImageUrl: mediaInfo.content_image_url || null,
+		title:
+			mediaInfo.content_metadata?.clean_title ||
+			mediaInfo.content_metadata?.title ||
+			mediaInfo.content_metadata?.movie_name ||
+			mediaInfo.content_metadata?.show_name ||
+			mediaInfo.content_metadata?.anime_name ||
+			null,
+		artist: mediaInfo.media?.artist || null,
+		season: mediaInfo.content_metadata?.season || null,
+		episode: mediaInfo.content_metadata?.episode || null,
+		year: mediaInfo.content_metadata?.year || null,
+	})
+
+	logger.info("Media information updated")
 }
 
 // Get image from proxy if needed
 export async function getProxiedImage(url: string | null): Promise<string | null> {
 	if (!url) return null
 
-	// If it's already a data URL, no need to proxy
-	if (url.startsWith("data:")) return url
+	// Data and artwork protocol URLs load directly
+	if (url.startsWith("data:") || url.startsWith(`${ARTWORK_PROTOCOL}:`)) return url
 
 	try {
-		return await window.api.image.getAsDataUrl(url)
+		return await window.api.image.getArtworkUrl(url)
 	} catch (error) {
 		logger.error(`Error proxying image: ${error}`)
 		return null
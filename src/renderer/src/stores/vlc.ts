@@ -1,6 +1,6 @@
 import { logger } from "@renderer/lib/utils"
 import { mediaInfoStore, mediaStatusStore } from "@renderer/stores/app-status"
-import { refreshMediaInfo } from "@renderer/stores/media"
+import { refreshMediaInfo, startMediaInfoStream } from "@renderer/stores/media"
 import type { ConnectionStatus, VlcConfig } from "@shared/types"
 import type { VlcStatus } from "@shared/types/vlc"
 import { atom } from "nanostores"
@@ -9,7 +9,7 @@ export const vlcConfigStore = atom<VlcConfig | null>(null)
 export const vlcStatusStore = atom<ConnectionStatus>("disconnected")
 export const vlcErrorStore = atom<string | null>(null)
 
-let statusPollingInterval: NodeJS.Timeout | null = null
+let unsubscribeStatusStream: (() => void) | null = null
 
 /**
  * Load VLC configuration from the main process
@@ -44,7 +44,7 @@ export async function saveVlcConfig(config: VlcConfig): Promise<VlcConfig | null
 			vlcErrorStore.set(null)
 			logger.info("VLC configuration saved and connected")
 
-			startStatusPolling()
+			startStatusStream()
 			return updatedConfig
 		}
 		vlcStatusStore.set("error")
@@ -69,7 +69,7 @@ export async function checkVlcConnection(): Promise<boolean> {
 		if (status.isRunning) {
 			vlcStatusStore.set("connected")
 			vlcErrorStore.set(null)
-			startStatusPolling()
+			startStatusStream()
 			return true
 		}
 		vlcStatusStore.set("disconnected")
@@ -95,26 +95,43 @@ export async function checkVlcConnection(): Promise<boolean> {
 }
 
 /**
- * Start polling for VLC status updates
+ * Start listening for VLC status updates pushed from the main process
  */
-export function startStatusPolling(interval = 2000): void {
-	if (statusPollingInterval) {
-		clearInterval(statusPollingInterval)
+export function startStatusStream(): void {
+	if (unsubscribeStatusStream) {
+		return
 	}
 
-	refreshVlcStatus()
-	statusPollingInterval = setInterval(refreshVlcStatus, interval)
-	logger.info(`VLC status polling started (${interval}ms)`)
+	unsubscribeStatusStream = window.api.vlc.onStatus(handleStatusUpdate)
+	startMediaInfoStream()
+	logger.info("VLC status stream started")
+}
+
+/**
+ * Stop listening for status updates
+ */
+export function stopStatusStream(): void {
+	if (unsubscribeStatusStream) {
+		unsubscribeStatusStream()
+		unsubscribeStatusStream = null
+		logger.info("VLC status stream stopped")
+	}
 }
 
 /**
- * Stop polling for status updates
+ * Apply a status pushed from the main process
  */
-export function stopStatusPolling(): void {
-	if (statusPollingInterval) {
-		clearInterval(statusPollingInterval)
-		statusPollingInterval = null
-		logger.info("VLC status polling stopped")
+function handleStatusUpdate(status: VlcStatus | null): void {
+	if (status) {
+		vlcStatusStore.set("connected")
+		vlcErrorStore.set(null)
+		updateMediaInfo(status)
+		return
+	}
+
+	// Only ask for the reason once, when the connection is lost
+	if (vlcStatusStore.get() === "connected") {
+		checkVlcConnection()
 	}
 }
 
@@ -175,9 +192,8 @@ function updateMediaInfo(status: VlcStatus): void {
  */
 export async function initializeVlcStore(): Promise<void> {
 	await loadVlcConfig()
-	const isConnected = await checkVlcConnection()
+	await checkVlcConnection()
 
-	if (isConnected) {
-		startStatusPolling()
-	}
+	// Updates for VLC coming back are pushed too, so listen even while disconnected
+	startStatusStream()
 }
@@ -20,11 +20,26 @@ export const DEFAULT_CONFIG: AppConfig = {
 	minimizeToTray: true,
 	startWithSystem: true,
 	version: "3.0.0", // Default version, will be overridden at runtime
-	fileMetadata: {}, // Empty object for file metadata storage
+	artworkUploads: {}, // Uploaded artwork indexed by content hash
+	uploadHostHealth: {}, // Image host latency and failure history
+	artworkUpload: {
+		maxDimension: 512,
+		jpegQuality: 85,
+	},
+	artworkCache: {
+		ttlHours: 6,
+		negativeTtlMinutes: 10,
+		maxEntries: 500,
+	},
 	presenceLayout: getDefaultLayout(),
 	layoutPreset: "default",
 }
 
+/**
+ * Scheme serving proxied artwork to the renderer
+ */
+export const ARTWORK_PROTOCOL = "vlcrpc-art"
+
 /**
  * Configuration file name
  */
@@ -1,3 +1,12 @@
+import type {
+	ActivityUpdateStats,
+	ArtworkProviderStats,
+	ImageCacheStats,
+	ImageUploadStats,
+	VideoAnalysisCacheStats,
+} from "./media"
+import type { PollCadence, VlcHttpStats } from "./vlc"
+
 /**
  * IPC Channels for communication between main and renderer processes
  */
@@ -10,6 +19,7 @@ export enum IpcChannels {
 	IMAGE = "image",
 	UPDATE = "update",
 	METADATA = "metadata",
+	DIAGNOSTICS = "diagnostics",
 }
 
 /**
@@ -24,11 +34,21 @@ export enum IpcEvents {
 	VLC_CONFIG_SET = "vlc:config:set",
 	VLC_STATUS_GET = "vlc:status:get",
 	VLC_STATUS_CHECK = "vlc:status:check",
+	VLC_POLL_CADENCE = "vlc:poll:cadence",
+	VLC_HTTP_STATS = "vlc:http:stats",
+	// Push events sent from main to renderer
+	VLC_STATUS_UPDATE = "vlc:status:update",
+	MEDIA_INFO_UPDATE = "media:info:update",
+	DISCORD_STATUS_UPDATE = "discord:status:update",
 	IMAGE_PROXY = "image:proxy",
+	IMAGE_CACHE_STATS = "image:cache:stats",
 	// Metadata management events
 	METADATA_CLEAR_CACHE = "clear:cache",
 	METADATA_GET_STATS = "get:stats",
 	METADATA_CLEANUP_EXPIRED = "cleanup:expired",
+	// Diagnostics events
+	DIAGNOSTICS_SNAPSHOT = "diagnostics:snapshot",
+	DIAGNOSTICS_EXPORT = "diagnostics:export",
 	// RPC control events
 	RPC_ENABLE = "rpc:enable",
 	RPC_DISABLE = "rpc:disable",
@@ -55,6 +75,42 @@ export interface FileMetadata {
 	"X-EXPIRY-DATE": string
 }
 
+/**
+ * Artwork upload shared by every file with identical image bytes
+ */
+export interface ArtworkUpload {
+	url: string
+	expiresAt: string // ISO date after which the upload is gone
+}
+
+/**
+ * Health record of an image upload host, used to rank and hedge uploads
+ */
+export interface UploadHostHealth {
+	latencyEwma: number | null // Smoothed upload latency in ms, null until the first success
+	recentLatencies: number[] // Last successful latencies in ms, used for the hedge delay
+	successRate: number // Smoothed success ratio between 0 and 1
+	consecutiveFailures: number
+	circuitOpenUntil: number // Epoch ms until which the host is skipped, 0 when closed
+}
+
+/**
+ * How artwork is shrunk before it is uploaded
+ */
+export interface ArtworkUploadConfig {
+	maxDimension: number // Longest side in pixels, Discord shows large images at 512px at most
+	jpegQuality: number // JPEG quality between 1 and 100
+}
+
+/**
+ * Resolved artwork cache settings
+ */
+export interface ArtworkCacheConfig {
+	ttlHours: number // How long a found artwork URL is reused
+	negativeTtlMinutes: number // How long "nothing found" is remembered
+	maxEntries: number // LRU bound for cached lookups
+}
+
 /**
  * Discord Rich Presence Layout configuration
  * Allows customization of how media information is displayed
@@ -90,13 +146,81 @@ export interface AppConfig {
 	minimizeToTray: boolean
 	startWithSystem: boolean
 	version: string
-	// File metadata storage
-	fileMetadata: Record<string, FileMetadata> // key = file path, value = metadata
+	// Artwork upload storage, per-file metadata lives in the metadata store
+	artworkUploads: Record<string, ArtworkUpload> // key = SHA-256 of the image bytes
+	uploadHostHealth: Record<string, UploadHostHealth> // key = upload host name
+	artworkUpload: ArtworkUploadConfig
+	// Resolved cover art cache
+	artworkCache: ArtworkCacheConfig
 	// Discord Rich Presence layout configuration
 	presenceLayout?: PresenceLayout
 	layoutPreset?: LayoutPreset
 }
 
+/**
+ * Config persistence counters
+ */
+export interface ConfigWriteStats {
+	writes: number // Files written to disk
+	bytesWritten: number
+	changes: number // set/delete calls, coalesced into the writes
+	failures: number
+}
+
+/**
+ * Latency histogram with fixed buckets, times in ms
+ */
+export interface HistogramSnapshot {
+	buckets: number[] // Upper bounds, counts has one more entry for larger values
+	counts: number[]
+	count: number
+	sum: number
+	min: number
+	max: number
+	p50: number // Upper bound of the bucket holding the median
+	p95: number
+}
+
+/**
+ * Values of the main process metrics registry at one point in time
+ */
+export interface MetricsSnapshot {
+	takenAt: string
+	uptimeMs: number
+	counters: Record<string, number>
+	gauges: Record<string, number>
+	histograms: Record<string, HistogramSnapshot>
+}
+
+/**
+ * Metrics and the stats services keep themselves, shown on the Diagnostics tab
+ */
+export interface DiagnosticsSnapshot {
+	version: string
+	platform: string
+	metrics: MetricsSnapshot
+	vlcHttp: VlcHttpStats
+	pollCadence: PollCadence
+	activity: ActivityUpdateStats
+	uploads: ImageUploadStats
+	uploadHosts: Record<string, UploadHostHealth>
+	imageCache: ImageCacheStats
+	artworkProviders: Record<string, ArtworkProviderStats>
+	videoAnalysisCache: VideoAnalysisCacheStats
+	configWrites: ConfigWriteStats
+	metadata: { totalFiles: number; expiredFiles: number; sizeBytes: number }
+	startup: StartupTimelineEntry[]
+}
+
+/**
+ * Point on the main process startup timeline
+ */
+export interface StartupTimelineEntry {
+	label: string
+	at: number // ms since process start
+	duration?: number // ms, for measured steps
+}
+
 /**
  * Log levels
  */
@@ -42,6 +42,28 @@ export interface DetectedMediaInfo {
  */
 export type MediaStatus = "stopped" | "playing" | "paused"
 
+/**
+ * Transitions of the media state machine
+ * - `trackChanged`: other media started, or playback started from stopped
+ * - `paused` / `resumed`: same media, the playback state flipped
+ * - `seeked`: same media and state, but the position jumped
+ * - `stopped`: playback ended or VLC went away
+ */
+export type MediaTransitionType = "trackChanged" | "paused" | "resumed" | "seeked" | "stopped"
+
+/**
+ * A transition of the media state machine
+ */
+export interface MediaTransition {
+	type: MediaTransitionType
+	from: MediaStatus
+	to: MediaStatus
+	/** Identity of the media after the transition, null once stopped */
+	mediaKey: string | null
+	/** Playback position in seconds */
+	position: number
+}
+
 /**
  * Current media information
  */
@@ -76,3 +98,56 @@ export interface DiscordPresenceData {
 	activity_type?: ActivityType
 	name?: string
 }
+
+/**
+ * Counters for Discord activity updates
+ */
+export interface ActivityUpdateStats {
+	sent: number
+	skipped: number
+	throttled: number
+}
+
+/**
+ * Image upload counters, with byte counts before and after re-encoding
+ */
+export interface ImageUploadStats {
+	uploads: number
+	failures: number
+	bytesBefore: number
+	bytesAfter: number
+}
+
+/**
+ * Image proxy cache counters
+ */
+export interface ImageCacheStats {
+	hits: number
+	diskHits: number
+	misses: number
+	evictions: number
+	entries: number
+	memoryBytes: number
+	maxMemoryBytes: number
+}
+
+/**
+ * Video analysis memo cache counters
+ */
+export interface VideoAnalysisCacheStats {
+	hits: number
+	misses: number
+	entries: number
+}
+
+/**
+ * Lookup counters of an artwork provider
+ */
+export interface ArtworkProviderStats {
+	lookups: number
+	hits: number // Lookups that returned a candidate in time
+	wins: number // Candidates picked by the scorer
+	timeouts: number
+	errors: number
+	totalLatencyMs: number // Timeouts count as the full deadline
+}
@@ -7,6 +7,7 @@ export interface VlcRawStatus {
 	length?: number
 	position?: number
 	currentplid?: number
+	rate?: number
 	volume?: number
 	random?: boolean
 	loop?: boolean
@@ -130,6 +131,8 @@ export interface VlcStatus {
 		duration: number
 	}
 	mediaType: "video" | "audio"
+	/** Id of the current item in VLC's playlist (`currentplid`) */
+	playlistId?: number
 	media: {
 		title?: string
 		artist?: string
@@ -142,6 +145,14 @@ export interface VlcStatus {
 	}
 }
 
+/**
+ * What changed between two consecutive status reads
+ * - `none`: only playback time moved, in line with wall-clock progress
+ * - `seek`: same media and state, but the time jumped
+ * - `semantic`: state, track or presence-relevant metadata changed
+ */
+export type VlcStatusChange = "none" | "seek" | "semantic"
+
 /**
  * VLC connection check result
  */
@@ -149,3 +160,39 @@ export interface VlcConnectionStatus {
 	isRunning: boolean
 	message: string
 }
+
+/**
+ * Reason the VLC poller picked its current cadence
+ */
+export type PollCadenceReason =
+	| "change"
+	| "playing"
+	| "track-ending"
+	| "paused"
+	| "stopped"
+	| "idle"
+	| "unreachable"
+
+/**
+ * Current VLC poll cadence
+ */
+export interface PollCadence {
+	intervalMs: number
+	reason: PollCadenceReason
+}
+
+/**
+ * Connection statistics for the VLC HTTP client
+ */
+export interface VlcHttpStats {
+	requests: number
+	reusedSockets: number
+	reuseRate: number
+	failures: number
+	timeouts: number
+	latency: {
+		/** Upper bound of each bucket, the extra last count is for slower requests */
+		bucketsMs: number[]
+		counts: number[]
+	}
+}